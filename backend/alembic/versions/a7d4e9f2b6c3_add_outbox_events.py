@@ -0,0 +1,46 @@
+"""Add outbox_events table
+
+Revision ID: a7d4e9f2b6c3
+Revises: f5a1c8e3d7b2
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e9f2b6c3'
+down_revision: Union[str, Sequence[str], None] = 'f5a1c8e3d7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the transactional outbox."""
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('available_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('processed_at', sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'idx_outbox_events_pending', 'outbox_events', ['available_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+
+def downgrade() -> None:
+    """Drop the transactional outbox."""
+    op.drop_index('idx_outbox_events_pending', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,75 @@
+"""Add maintenance_schedules and schedule occurrence columns
+
+Revision ID: b3e8f1c6a9d4
+Revises: a7d4e9f2b6c3
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8f1c6a9d4'
+down_revision: Union[str, Sequence[str], None] = 'a7d4e9f2b6c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create recurring schedules and link generated requests to their occurrence."""
+    op.create_table(
+        'maintenance_schedules',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('instructions', sa.Text(), nullable=True),
+        sa.Column('priority', sa.Integer(), nullable=True),
+        sa.Column('equipment_id', sa.UUID(), nullable=True),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('maintenance_team_id', sa.UUID(), nullable=True),
+        sa.Column('recurrence', sa.String(length=20), nullable=False),
+        sa.Column('recurrence_interval', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('lead_days', sa.Integer(), nullable=False),
+        sa.Column('generated_until', sa.Date(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_by', sa.UUID(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.CheckConstraint('(equipment_id IS NULL) <> (category IS NULL)', name='ck_maintenance_schedules_target'),
+        sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['maintenance_team_id'], ['maintenance_teams.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_maintenance_schedules_equipment_id'), 'maintenance_schedules', ['equipment_id'], unique=False)
+    op.create_index(op.f('ix_maintenance_schedules_category'), 'maintenance_schedules', ['category'], unique=False)
+
+    op.add_column('maintenance_requests', sa.Column('schedule_id', sa.UUID(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('occurrence_date', sa.Date(), nullable=True))
+    op.create_foreign_key(
+        'maintenance_requests_schedule_id_fkey', 'maintenance_requests', 'maintenance_schedules',
+        ['schedule_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(
+        'uq_maintenance_requests_schedule_occurrence', 'maintenance_requests',
+        ['schedule_id', 'equipment_id', 'occurrence_date'], unique=True
+    )
+
+    # Block-allocated reference numbers for bulk-generated requests
+    op.execute("CREATE SEQUENCE IF NOT EXISTS maintenance_request_reference_seq")
+
+
+def downgrade() -> None:
+    """Drop recurring schedules."""
+    op.execute("DROP SEQUENCE IF EXISTS maintenance_request_reference_seq")
+    op.drop_index('uq_maintenance_requests_schedule_occurrence', table_name='maintenance_requests')
+    op.drop_constraint('maintenance_requests_schedule_id_fkey', 'maintenance_requests', type_='foreignkey')
+    op.drop_column('maintenance_requests', 'occurrence_date')
+    op.drop_column('maintenance_requests', 'schedule_id')
+    op.drop_index(op.f('ix_maintenance_schedules_category'), table_name='maintenance_schedules')
+    op.drop_index(op.f('ix_maintenance_schedules_equipment_id'), table_name='maintenance_schedules')
+    op.drop_table('maintenance_schedules')
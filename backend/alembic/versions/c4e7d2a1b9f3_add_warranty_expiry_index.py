@@ -0,0 +1,28 @@
+"""Add index on equipment.warranty_expiry
+
+Revision ID: c4e7d2a1b9f3
+Revises: a9664658eb82
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7d2a1b9f3'
+down_revision: Union[str, Sequence[str], None] = 'a9664658eb82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index warranty_expiry for the expiry scan range queries."""
+    op.create_index('idx_equipment_warranty_expiry', 'equipment', ['warranty_expiry'])
+
+
+def downgrade() -> None:
+    """Drop the warranty_expiry index."""
+    op.drop_index('idx_equipment_warranty_expiry', table_name='equipment')
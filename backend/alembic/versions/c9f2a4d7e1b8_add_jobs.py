@@ -0,0 +1,62 @@
+"""Add jobs table
+
+Revision ID: c9f2a4d7e1b8
+Revises: b3e8f1c6a9d4
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f2a4d7e1b8'
+down_revision: Union[str, Sequence[str], None] = 'b3e8f1c6a9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the background job queue."""
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('job_type', sa.String(length=100), nullable=False),
+        sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('priority', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('status', sa.String(length=20), server_default='queued', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('max_attempts', sa.Integer(), server_default='3', nullable=False),
+        sa.Column('run_after', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('cancel_requested', sa.Boolean(), server_default='false', nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('heartbeat_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('progress', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('progress_message', sa.String(length=255), nullable=True),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.UUID(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('finished_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('expires_at', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_jobs_job_type'), 'jobs', ['job_type'], unique=False)
+    op.create_index(op.f('ix_jobs_expires_at'), 'jobs', ['expires_at'], unique=False)
+    op.create_index(
+        'idx_jobs_queued', 'jobs', [sa.text('priority DESC'), 'run_after'],
+        postgresql_where=sa.text("status = 'queued'")
+    )
+
+
+def downgrade() -> None:
+    """Drop the background job queue."""
+    op.drop_index('idx_jobs_queued', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_expires_at'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_job_type'), table_name='jobs')
+    op.drop_table('jobs')
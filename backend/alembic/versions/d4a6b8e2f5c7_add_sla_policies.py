@@ -0,0 +1,77 @@
+"""Add sla_policies and request SLA deadlines
+
+Revision ID: d4a6b8e2f5c7
+Revises: c9f2a4d7e1b8
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a6b8e2f5c7'
+down_revision: Union[str, Sequence[str], None] = 'c9f2a4d7e1b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Default (all teams) targets per priority: (response, resolution) in minutes
+DEFAULT_POLICIES = {
+    1: (24 * 60, 7 * 24 * 60),  # Low
+    2: (8 * 60, 3 * 24 * 60),   # Normal
+    3: (4 * 60, 24 * 60),       # High
+    4: (60, 8 * 60),            # Urgent
+    5: (15, 4 * 60),            # Critical
+}
+
+
+def upgrade() -> None:
+    """Create SLA policies with defaults and add deadlines to requests."""
+    op.create_table(
+        'sla_policies',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('maintenance_team_id', sa.UUID(), nullable=True),
+        sa.Column('response_minutes', sa.Integer(), nullable=False),
+        sa.Column('resolution_minutes', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['maintenance_team_id'], ['maintenance_teams.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_sla_policies_team_priority', 'sla_policies', ['maintenance_team_id', 'priority'],
+        unique=True, postgresql_where=sa.text('maintenance_team_id IS NOT NULL')
+    )
+    op.create_index(
+        'uq_sla_policies_default_priority', 'sla_policies', ['priority'],
+        unique=True, postgresql_where=sa.text('maintenance_team_id IS NULL')
+    )
+    for priority, (response, resolution) in DEFAULT_POLICIES.items():
+        op.execute(
+            "INSERT INTO sla_policies (id, priority, response_minutes, resolution_minutes) "
+            f"VALUES (gen_random_uuid(), {priority}, {response}, {resolution})"
+        )
+
+    op.add_column('maintenance_requests', sa.Column('response_due_at', sa.TIMESTAMP(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('resolution_due_at', sa.TIMESTAMP(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('response_breached_at', sa.TIMESTAMP(), nullable=True))
+    op.add_column('maintenance_requests', sa.Column('resolution_breached_at', sa.TIMESTAMP(), nullable=True))
+    op.create_index(
+        'idx_maintenance_requests_open_resolution_due', 'maintenance_requests', ['resolution_due_at'],
+        postgresql_where=sa.text("status IN ('new', 'in_progress')")
+    )
+
+
+def downgrade() -> None:
+    """Drop SLA deadlines and policies."""
+    op.drop_index('idx_maintenance_requests_open_resolution_due', table_name='maintenance_requests')
+    op.drop_column('maintenance_requests', 'resolution_breached_at')
+    op.drop_column('maintenance_requests', 'response_breached_at')
+    op.drop_column('maintenance_requests', 'resolution_due_at')
+    op.drop_column('maintenance_requests', 'response_due_at')
+    op.drop_index('uq_sla_policies_default_priority', table_name='sla_policies')
+    op.drop_index('uq_sla_policies_team_priority', table_name='sla_policies')
+    op.drop_table('sla_policies')
@@ -0,0 +1,28 @@
+"""Add token_version to users
+
+Revision ID: d8f3a6b2c5e1
+Revises: c4e7d2a1b9f3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3a6b2c5e1'
+down_revision: Union[str, Sequence[str], None] = 'c4e7d2a1b9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add users.token_version, bumped when access-token claims go stale."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Drop users.token_version."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,41 @@
+"""Add revoked_tokens table
+
+Revision ID: e2b7c9d4f1a6
+Revises: d8f3a6b2c5e1
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c9d4f1a6'
+down_revision: Union[str, Sequence[str], None] = 'd8f3a6b2c5e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the token revocation list."""
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('not_before', sa.TIMESTAMP(), nullable=True),
+        sa.Column('expires_at', sa.TIMESTAMP(), nullable=False),
+        sa.Column('revoked_at', sa.TIMESTAMP(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+    op.create_index('ix_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'])
+
+
+def downgrade() -> None:
+    """Drop the token revocation list."""
+    op.drop_index('ix_revoked_tokens_revoked_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
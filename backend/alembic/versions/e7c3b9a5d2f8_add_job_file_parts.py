@@ -0,0 +1,50 @@
+"""Add job_file_parts
+
+Revision ID: e7c3b9a5d2f8
+Revises: d4a6b8e2f5c7
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3b9a5d2f8'
+down_revision: Union[str, Sequence[str], None] = 'd4a6b8e2f5c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store job files in parts outside jobs.result."""
+    op.create_table(
+        'job_file_parts',
+        sa.Column('job_id', sa.UUID(), nullable=False),
+        sa.Column('part', sa.Integer(), nullable=False),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id', 'part')
+    )
+    # Move files of finished exports out of the result column
+    op.execute(
+        "INSERT INTO job_file_parts (job_id, part, content) "
+        "SELECT id, 0, convert_to(result->>'content', 'UTF8') FROM jobs WHERE result ? 'content'"
+    )
+    op.execute(
+        "UPDATE jobs SET result = (result - 'content') "
+        "|| jsonb_build_object('size_bytes', octet_length(convert_to(result->>'content', 'UTF8'))) "
+        "WHERE result ? 'content'"
+    )
+
+
+def downgrade() -> None:
+    """Move job files back into jobs.result."""
+    op.execute(
+        "UPDATE jobs SET result = (result - 'size_bytes') || jsonb_build_object('content', files.content) "
+        "FROM (SELECT job_id, convert_from(string_agg(content, ''::bytea ORDER BY part), 'UTF8') AS content "
+        "FROM job_file_parts GROUP BY job_id) AS files WHERE files.job_id = jobs.id"
+    )
+    op.drop_table('job_file_parts')
@@ -0,0 +1,30 @@
+"""Add version columns to maintenance_requests and equipment
+
+Revision ID: f5a1c8e3d7b2
+Revises: e2b7c9d4f1a6
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a1c8e3d7b2'
+down_revision: Union[str, Sequence[str], None] = 'e2b7c9d4f1a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add row versions used for optimistic concurrency on PATCH."""
+    op.add_column('maintenance_requests', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('equipment', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Drop the row versions."""
+    op.drop_column('equipment', 'version')
+    op.drop_column('maintenance_requests', 'version')
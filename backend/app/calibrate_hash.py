@@ -0,0 +1,89 @@
+"""
+Pick the bcrypt cost factor for this machine.
+Run with: python -m app.calibrate_hash [--target-ms 250]
+
+Times hashing at each cost factor in range and recommends the highest one
+whose median hash time stays within the target latency budget. Set the
+result as PASSWORD_HASH_ROUNDS; existing hashes are migrated to it on each
+user's next successful login.
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, Optional
+
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+
+# Below this bcrypt no longer offers meaningful protection
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+PASSWORD = "Calibration!Pass1"
+
+
+def time_rounds(rounds: int, samples: int) -> float:
+    """Median time in milliseconds to hash one password at the given cost."""
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash(PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target_ms: float,
+    samples: int = 5,
+    min_rounds: int = MIN_ROUNDS,
+    max_rounds: int = MAX_ROUNDS,
+) -> tuple[Optional[int], Dict[int, float]]:
+    """
+    Benchmark cost factors from min_rounds upwards.
+
+    Each extra round doubles the cost, so timing stops at the first cost
+    over budget.
+
+    Returns:
+        (recommended rounds or None if even min_rounds is over budget,
+         median milliseconds per measured cost)
+    """
+    timings: Dict[int, float] = {}
+    best = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        timings[rounds] = time_rounds(rounds, samples)
+        if timings[rounds] > target_ms:
+            break
+        best = rounds
+    return best, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--target-ms", type=float, default=250.0,
+                        help="latency budget for one hash, in milliseconds")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=MAX_ROUNDS)
+    args = parser.parse_args()
+
+    best, timings = calibrate(args.target_ms, args.samples, args.min_rounds, args.max_rounds)
+
+    print(f"bcrypt cost calibration (target {args.target_ms:.0f} ms, median of {args.samples})")
+    for rounds, ms in timings.items():
+        marker = " <- recommended" if rounds == best else ""
+        current = " (current)" if rounds == settings.PASSWORD_HASH_ROUNDS else ""
+        print(f"  rounds={rounds:<3} {ms:8.1f} ms{current}{marker}")
+
+    if best is None:
+        print(f"\nEven rounds={args.min_rounds} exceeds the budget; "
+              f"keeping the minimum is recommended.")
+        best = args.min_rounds
+    print(f"\nSet in .env:\nPASSWORD_HASH_ROUNDS={best}")
+    if best != settings.PASSWORD_HASH_ROUNDS:
+        print("Existing hashes are rehashed at the new cost on next successful login.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 from .security import (
     verify_password,
     get_password_hash,
+)
+from .tokens import (
     create_access_token,
     decode_access_token,
 )
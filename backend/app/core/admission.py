@@ -0,0 +1,192 @@
+"""
+Admission control.
+
+Under bursty load a few slow endpoints (dashboard, kanban, exports) can
+hold every pooled connection, and cheap requests then time out waiting
+behind them. AdmissionControlMiddleware puts each request in a route
+class and only lets a bounded number of each class run at once:
+
+- cheap:       single-item reads, /auth/me, metrics (the default class)
+- read_heavy:  dashboards, kanban/calendar, listings, batch reads
+- write:       POST/PUT/PATCH/DELETE
+- export:      downloads and bulk operations
+- auth:        login, refresh, register and logout (password hashing)
+
+Each class has its own concurrency limit and a bounded wait queue. A
+request that finds the queue full, or waits longer than
+ADMISSION_QUEUE_TIMEOUT_SECONDS, is rejected at once with 503 and a
+Retry-After header instead of piling up on the pool. Keeping
+read_heavy + write + export + auth below the pool size (DB_POOL_SIZE +
+DB_MAX_OVERFLOW) leaves connections for cheap requests. Background work
+(job workers, heartbeats, the scheduler, the outbox consumer and the SLA
+monitor) uses its own pool (DB_BACKGROUND_POOL_SIZE), so it is outside
+this budget. The health checks (/, /health) and CORS preflights bypass
+admission.
+
+Limits are per worker process. Queue depths and rejections are exposed
+at /api/internal/admission.
+"""
+import asyncio
+import re
+import time
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+CHEAP = "cheap"
+READ_HEAVY = "read_heavy"
+WRITE = "write"
+EXPORT = "export"
+AUTH = "auth"
+
+BYPASS_PATHS = frozenset({"/", "/health"})
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# First match wins; anything unmatched is cheap
+ROUTE_CLASSES: List[Tuple[Optional[frozenset], Pattern, str]] = [
+    (READ_METHODS, re.compile(r"^/api/jobs/[^/]+/download$"), EXPORT),
+    (WRITE_METHODS, re.compile(r"^/api/(schedules/generate|equipment/expiring/inspections)$"), EXPORT),
+    (frozenset({"POST"}), re.compile(r"^/api/batch$"), READ_HEAVY),
+    (WRITE_METHODS, re.compile(r"^/api/auth/"), AUTH),
+    (WRITE_METHODS, re.compile(r""), WRITE),
+    (READ_METHODS, re.compile(r"^/api/dashboard/"), READ_HEAVY),
+    (READ_METHODS, re.compile(
+        r"^/api/(requests/(kanban|calendar)|teams/workload|equipment/(health-summary|expiring))$"
+    ), READ_HEAVY),
+    (READ_METHODS, re.compile(r"^/api/[a-z-]+/(batch)?$"), READ_HEAVY),  # Listings and batch GETs
+]
+
+
+def classify(method: str, path: str, rules: Sequence = ROUTE_CLASSES) -> str:
+    """Route class of a request."""
+    for methods, pattern, route_class in rules:
+        if (methods is None or method in methods) and pattern.match(path):
+            return route_class
+    return CHEAP
+
+
+class AdmissionGate:
+    """Concurrency limit with a bounded FIFO wait queue for one route class."""
+
+    def __init__(self, name: str, limit: int, queue_limit: int):
+        self.name = name
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self.active = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.wait_ms = 0.0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Created on first use so it belongs to the serving event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.limit)
+        return self._slots
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting at most `timeout` seconds; False if rejected."""
+        slots = self._semaphore()
+        if not slots.locked() and self.waiting == 0:
+            await slots.acquire()  # Free slot: does not block
+        else:
+            if self.waiting >= self.queue_limit:
+                self.rejected_full += 1
+                return False
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(slots.acquire(), timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                return False
+            finally:
+                self.waiting -= 1
+                self.wait_ms += (time.perf_counter() - started) * 1000
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore().release()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "limit": self.limit,
+            "queue_limit": self.queue_limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_wait_ms": round(self.wait_ms / self.admitted, 3) if self.admitted else 0.0,
+        }
+
+
+class AdmissionController:
+    """The gates of all route classes."""
+
+    def __init__(self):
+        self.gates = {
+            CHEAP: AdmissionGate(CHEAP, settings.ADMISSION_CHEAP_CONCURRENCY, settings.ADMISSION_CHEAP_QUEUE),
+            READ_HEAVY: AdmissionGate(
+                READ_HEAVY, settings.ADMISSION_READ_HEAVY_CONCURRENCY, settings.ADMISSION_READ_HEAVY_QUEUE
+            ),
+            WRITE: AdmissionGate(WRITE, settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_WRITE_QUEUE),
+            EXPORT: AdmissionGate(EXPORT, settings.ADMISSION_EXPORT_CONCURRENCY, settings.ADMISSION_EXPORT_QUEUE),
+            AUTH: AdmissionGate(AUTH, settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_AUTH_QUEUE),
+        }
+        self.bypassed = 0
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": settings.ADMISSION_CONTROL_ENABLED,
+            "bypassed": self.bypassed,
+            "classes": {name: gate.stats() for name, gate in self.gates.items()},
+        }
+
+
+# Process-wide controller used by the middleware
+admission_controller = AdmissionController()
+
+
+class AdmissionControlMiddleware:
+    """Per-route-class concurrency limits; rejects with 503 when saturated (pure ASGI)."""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_CONTROL_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] in BYPASS_PATHS or scope["method"] == "OPTIONS":
+            self.controller.bypassed += 1
+            await self.app(scope, receive, send)
+            return
+
+        gate = self.controller.gates[classify(scope["method"], scope["path"])]
+        if not await gate.acquire(settings.ADMISSION_QUEUE_TIMEOUT_SECONDS):
+            response = JSONResponse(
+                {"detail": "Server busy, please retry", "route_class": gate.name},
+                status_code=503,
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            # Held until the response is fully sent, streaming bodies included
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
@@ -0,0 +1,202 @@
+"""
+Load-aware automatic technician assignment.
+
+Keeps an in-memory load index: the priority-weighted count of open
+requests per technician, and one min-heap per team ordered by member
+load. Picking the least-loaded member of a team is a heap peek, so
+assignment needs no queries. Only active technicians are indexed. The
+index is rebuilt from the database at startup (and periodically, to
+absorb changes made by other workers) and kept current by the request
+and team routes in between.
+"""
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import MaintenanceRequest, TeamMember, User
+
+# Statuses that count towards a technician's load
+OPEN_STATUSES = ("new", "in_progress")
+
+# Weight of one open request by priority (1=Low ... 5=Critical)
+PRIORITY_WEIGHTS = {1: 1, 2: 2, 3: 3, 4: 5, 5: 8}
+
+
+def request_weight(priority: Optional[int]) -> int:
+    return PRIORITY_WEIGHTS.get(priority or 2, PRIORITY_WEIGHTS[2])
+
+
+def is_assignable(user: User) -> bool:
+    """Whether requests may be auto-assigned to the user."""
+    return bool(user.is_active and user.is_technician)
+
+
+@dataclass(frozen=True)
+class RequestLoad:
+    """The parts of a request that determine its contribution to load."""
+    assigned_to: Optional[UUID]
+    priority: Optional[int]
+    status: str
+
+    @classmethod
+    def of(cls, request: MaintenanceRequest) -> "RequestLoad":
+        return cls(
+            assigned_to=request.assigned_to, priority=request.priority, status=request.status
+        )
+
+    @property
+    def weight(self) -> int:
+        if self.assigned_to is None or self.status not in OPEN_STATUSES:
+            return 0
+        return request_weight(self.priority)
+
+
+class _TeamHeap:
+    """Min-heap of (load, seq, user_id) with lazy deletion of stale entries."""
+
+    def __init__(self):
+        self.members: Set[UUID] = set()
+        self.heap: List[Tuple[int, int, UUID]] = []
+
+
+class AssignmentEngine:
+    """In-memory technician load index with per-team priority queues."""
+
+    def __init__(self):
+        self._loads: Dict[UUID, int] = {}
+        self._teams: Dict[UUID, _TeamHeap] = {}
+        self._user_teams: Dict[UUID, Set[UUID]] = {}
+        self._seq = itertools.count()
+        self.ready = False
+
+    # --- Queries -------------------------------------------------------
+
+    def pick(self, team_id: Optional[UUID]) -> Optional[UUID]:
+        """Least-loaded member of the team, or None if the team has no members."""
+        team = self._teams.get(team_id) if team_id else None
+        if team is None:
+            return None
+        heap = team.heap
+        while heap:
+            load, _, user_id = heap[0]
+            if user_id in team.members and self._loads.get(user_id, 0) == load:
+                return user_id
+            heapq.heappop(heap)  # Stale entry
+        return None
+
+    def load_of(self, user_id: UUID) -> int:
+        return self._loads.get(user_id, 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Current load of every member, grouped by team."""
+        return {
+            str(team_id): {str(user_id): self._loads.get(user_id, 0) for user_id in team.members}
+            for team_id, team in self._teams.items()
+        }
+
+    # --- Load updates --------------------------------------------------
+
+    def request_changed(self, old: Optional[RequestLoad], new: Optional[RequestLoad]) -> None:
+        """Apply a request create/update/stage change/delete (None = absent)."""
+        if old is not None and old.weight:
+            self._add_load(old.assigned_to, -old.weight)
+        if new is not None and new.weight:
+            self._add_load(new.assigned_to, new.weight)
+
+    def requests_created(self, loads: Iterable[RequestLoad]) -> None:
+        """Apply committed bulk inserts (warranty inspections, schedule occurrences)."""
+        for load in loads:
+            self.request_changed(None, load)
+
+    def _add_load(self, user_id: UUID, delta: int) -> None:
+        load = max(0, self._loads.get(user_id, 0) + delta)
+        self._loads[user_id] = load
+        for team_id in self._user_teams.get(user_id, ()):
+            self._push(self._teams[team_id], user_id, load)
+
+    def _push(self, team: _TeamHeap, user_id: UUID, load: int) -> None:
+        heapq.heappush(team.heap, (load, next(self._seq), user_id))
+        # Compact when stale entries dominate
+        if len(team.heap) > 4 * len(team.members) + 16:
+            team.heap = [
+                (self._loads.get(member, 0), next(self._seq), member) for member in team.members
+            ]
+            heapq.heapify(team.heap)
+
+    # --- Membership updates --------------------------------------------
+
+    def add_member(self, team_id: UUID, user_id: UUID) -> None:
+        """Index a team member; callers only add assignable users (see is_assignable)."""
+        team = self._teams.setdefault(team_id, _TeamHeap())
+        team.members.add(user_id)
+        self._user_teams.setdefault(user_id, set()).add(team_id)
+        self._push(team, user_id, self._loads.get(user_id, 0))
+
+    def remove_member(self, team_id: UUID, user_id: UUID) -> None:
+        team = self._teams.get(team_id)
+        if team is not None:
+            team.members.discard(user_id)
+        self._user_teams.get(user_id, set()).discard(team_id)
+
+    def remove_team(self, team_id: UUID) -> None:
+        team = self._teams.pop(team_id, None)
+        if team is not None:
+            for user_id in team.members:
+                self._user_teams.get(user_id, set()).discard(team_id)
+
+    def add_user(self, user_id: UUID, team_ids: Iterable[UUID]) -> None:
+        """Index a user in all their teams (e.g. on reactivation)."""
+        for team_id in team_ids:
+            self.add_member(team_id, user_id)
+
+    def remove_user(self, user_id: UUID) -> None:
+        """Drop a user from every team (e.g. on deactivation)."""
+        for team_id in list(self._user_teams.get(user_id, ())):
+            self.remove_member(team_id, user_id)
+
+    # --- Rebuild -------------------------------------------------------
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Rebuild the whole index from the database (two queries)."""
+        weight = case(
+            *[(MaintenanceRequest.priority == p, w) for p, w in PRIORITY_WEIGHTS.items()],
+            else_=PRIORITY_WEIGHTS[2]
+        )
+        load_rows = await db.execute(
+            select(MaintenanceRequest.assigned_to, func.sum(weight)).where(
+                MaintenanceRequest.assigned_to.isnot(None),
+                MaintenanceRequest.status.in_(OPEN_STATUSES)
+            ).group_by(MaintenanceRequest.assigned_to)
+        )
+        member_rows = await db.execute(
+            select(TeamMember.team_id, TeamMember.user_id).join(
+                User, User.id == TeamMember.user_id
+            ).where(User.is_active == True, User.is_technician == True)
+        )
+
+        self._loads = {user_id: int(load) for user_id, load in load_rows.all()}
+        self._teams = {}
+        self._user_teams = {}
+        for team_id, user_id in member_rows.all():
+            self._teams.setdefault(team_id, _TeamHeap()).members.add(user_id)
+            self._user_teams.setdefault(user_id, set()).add(team_id)
+        for team in self._teams.values():
+            team.heap = [
+                (self._loads.get(user_id, 0), next(self._seq), user_id) for user_id in team.members
+            ]
+            heapq.heapify(team.heap)
+        self.ready = True
+
+
+# Process-wide engine used by the request and team routes
+assignment_engine = AssignmentEngine()
+
+
+async def assignment_rebuild_job(db: AsyncSession) -> None:
+    """Scheduled job: resync the load index with the database."""
+    await assignment_engine.rebuild(db)
@@ -0,0 +1,148 @@
+"""
+Background task wiring for the application lifespan.
+
+Both entry points (main.py and app/main.py) call start/stop from their
+lifespan handlers so background work is set up in one place.
+"""
+from app.core.config import settings
+from app.core.scheduler import scheduler
+from app.core.warranty import warranty_scan_job
+from app.core.schedules import schedule_generation_job
+from app.core.assignment import assignment_engine, assignment_rebuild_job
+from app.core.security import password_hasher
+from app.core.revocation import revocation_list, revocation_sync_job, revocation_prune_job
+from app.core.tokens import token_version_sync, token_version_sync_job
+from app.core.outbox import outbox_consumer, outbox_prune_job
+from app.core import outbox_handlers  # noqa: F401  (registers handlers)
+from app.core.sla import sla_monitor, sla_sync_job
+from app.core.jobs import job_worker_pool, job_reaper_job, job_prune_job
+from app.core import job_handlers  # noqa: F401  (registers job types)
+from app.db.session import AsyncBackgroundSessionLocal, background_engine, read_engine
+from app.db.replica import replica_health_job
+
+
+def register_jobs() -> None:
+    """Register all periodic jobs with the scheduler."""
+    scheduler.register(
+        "warranty_expiry_scan",
+        settings.WARRANTY_SCAN_INTERVAL_SECONDS,
+        warranty_scan_job,
+        initial_delay_seconds=30,
+    )
+    scheduler.register(
+        "maintenance_schedule_generation",
+        settings.SCHEDULE_GENERATION_INTERVAL_SECONDS,
+        schedule_generation_job,
+        initial_delay_seconds=45,
+    )
+    # Per-process state: runs in every worker, not under the advisory lock
+    scheduler.register(
+        "assignment_load_rebuild",
+        settings.ASSIGNMENT_REBUILD_INTERVAL_SECONDS,
+        assignment_rebuild_job,
+        initial_delay_seconds=settings.ASSIGNMENT_REBUILD_INTERVAL_SECONDS,
+        exclusive=False,
+    )
+    scheduler.register(
+        "token_revocation_sync",
+        settings.REVOCATION_SYNC_INTERVAL_SECONDS,
+        revocation_sync_job,
+        initial_delay_seconds=settings.REVOCATION_SYNC_INTERVAL_SECONDS,
+        exclusive=False,
+    )
+    scheduler.register(
+        "token_version_sync",
+        settings.TOKEN_VERSION_SYNC_INTERVAL_SECONDS,
+        token_version_sync_job,
+        initial_delay_seconds=settings.TOKEN_VERSION_SYNC_INTERVAL_SECONDS,
+        exclusive=False,
+    )
+    if settings.SLA_MONITOR_ENABLED:
+        scheduler.register(
+            "sla_deadline_sync",
+            settings.SLA_SYNC_INTERVAL_SECONDS,
+            sla_sync_job,
+            initial_delay_seconds=settings.SLA_SYNC_INTERVAL_SECONDS,
+            exclusive=False,
+        )
+    if read_engine is not None:
+        scheduler.register(
+            "read_replica_health",
+            settings.DB_READ_HEALTH_INTERVAL_SECONDS,
+            replica_health_job,
+            initial_delay_seconds=settings.DB_READ_HEALTH_INTERVAL_SECONDS,
+            exclusive=False,
+        )
+    scheduler.register(
+        "token_revocation_prune",
+        settings.REVOCATION_PRUNE_INTERVAL_SECONDS,
+        revocation_prune_job,
+        initial_delay_seconds=60,
+    )
+    scheduler.register(
+        "job_lease_reaper",
+        settings.JOB_HEARTBEAT_SECONDS,
+        job_reaper_job,
+        initial_delay_seconds=settings.JOB_HEARTBEAT_SECONDS,
+    )
+    scheduler.register(
+        "job_results_prune",
+        60 * 60,
+        job_prune_job,
+        initial_delay_seconds=180,
+    )
+    scheduler.register(
+        "outbox_prune",
+        60 * 60,
+        outbox_prune_job,
+        initial_delay_seconds=120,
+    )
+
+
+async def start_background_tasks() -> None:
+    """Start background tasks (called on application startup)."""
+    try:
+        async with AsyncBackgroundSessionLocal() as db:
+            await assignment_engine.rebuild(db)
+    except Exception as exc:
+        print(f"Warning: could not build technician load index: {exc!r}")
+    
+    try:
+        async with AsyncBackgroundSessionLocal() as db:
+            await revocation_list.load(db)
+    except Exception as exc:
+        print(f"Warning: could not load token revocation list: {exc!r}")
+    
+    try:
+        async with AsyncBackgroundSessionLocal() as db:
+            await token_version_sync.sync(db)
+    except Exception as exc:
+        print(f"Warning: could not load token versions: {exc!r}")
+    
+    if settings.SLA_MONITOR_ENABLED:
+        try:
+            async with AsyncBackgroundSessionLocal() as db:
+                await sla_monitor.load(db)
+        except Exception as exc:
+            print(f"Warning: could not load SLA deadlines: {exc!r}")
+        sla_monitor.start()
+    
+    if settings.SCHEDULER_ENABLED:
+        register_jobs()
+        scheduler.start()
+    
+    if settings.OUTBOX_ENABLED:
+        outbox_consumer.start()
+    
+    if settings.JOBS_ENABLED:
+        job_worker_pool.start()
+
+
+async def stop_background_tasks() -> None:
+    """Stop background tasks (called on application shutdown)."""
+    await job_worker_pool.stop()
+    await sla_monitor.stop()
+    await outbox_consumer.stop()
+    await scheduler.stop()
+    password_hasher.shutdown()
+    await background_engine.dispose()
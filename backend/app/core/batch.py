@@ -0,0 +1,58 @@
+"""
+Batch GET-by-ids.
+
+`GET /api/<resource>/batch?ids=...` resolves many ids in one call instead
+of one GET per id. Ids may be comma-separated, repeated (`ids=a&ids=b`) or
+both; duplicates are dropped and the order is kept. The rows are fetched
+with `WHERE id = ANY(:ids)`: one array parameter, so the statement text
+(and asyncpg's prepared statement) is the same whatever the number of ids.
+Responses are keyed by id and list the ids that were not found.
+"""
+from typing import List
+from uuid import UUID
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.config import settings
+
+
+def get_batch_ids(
+    ids: List[str] = Query(..., description="Comma-separated and/or repeated ids"),
+) -> List[UUID]:
+    """Dependency: the distinct ids asked for, in order."""
+    parsed = {}
+    for value in ids:
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                parsed.setdefault(UUID(part), None)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Invalid id: {part}",
+                )
+    if not parsed:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No ids given")
+    if len(parsed) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.BATCH_MAX_IDS} ids per batch",
+        )
+    return list(parsed)
+
+
+def id_in(column, ids: List[UUID]):
+    """`column = ANY(:ids)` with the ids bound as one array parameter."""
+    return column == any_(literal(list(ids), ARRAY(column.type)))
+
+
+def keyed(ids: List[UUID], found: dict) -> dict:
+    """Batch response body: found items in request order, plus the missing ids."""
+    return {
+        "items": {id_: found[id_] for id_ in ids if id_ in found},
+        "missing": [id_ for id_ in ids if id_ not in found],
+    }
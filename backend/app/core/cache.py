@@ -0,0 +1,93 @@
+"""
+Bounded in-process LRU cache with per-entry TTL and hit/miss metrics.
+
+Caches are per process: explicit invalidation only reaches the worker that
+made the change, and the TTL bounds staleness everywhere else.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU cache whose entries expire after `ttl_seconds`."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        # Sync routes run in a threadpool, so guard the dict
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a load that raced one is not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, generation: Optional[int] = None) -> None:
+        """Store a value; skipped if an invalidation happened since `generation`."""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given keys."""
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every key for which `predicate(key)` is true (linear scan)."""
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
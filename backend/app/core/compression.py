@@ -0,0 +1,151 @@
+"""
+Gzip response compression.
+
+GzipMiddleware compresses compressible responses (JSON, text, CSV) of at
+least GZIP_MIN_SIZE bytes for clients that accept gzip. Unlike
+Starlette's GZipMiddleware it:
+
+- works chunk by chunk for streaming responses, flushing every chunk
+  (Z_SYNC_FLUSH), so a streamed export reaches the client as it is
+  produced instead of when the compressor's buffer fills up; a streaming
+  response is only held back until GZIP_MIN_SIZE bytes are known;
+- skips event streams, already-encoded bodies, 204/304 and HEAD;
+- always sends `Vary: Accept-Encoding` on compressible responses so
+  caches never hand a gzip body to a client that did not ask for it;
+- uses a moderate level (GZIP_LEVEL) that keeps most of the size win at
+  a fraction of level 9's CPU cost.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+NEVER_COMPRESS_TYPES = ("text/event-stream",)
+
+
+def accepts_gzip(scope) -> bool:
+    header = Headers(scope=scope).get("accept-encoding", "")
+    for coding in header.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").lower()
+    return (
+        content_type.startswith(COMPRESSIBLE_TYPES)
+        and not content_type.startswith(NEVER_COMPRESS_TYPES)
+        and "content-encoding" not in headers
+    )
+
+
+class CompressionStats:
+    """Bytes before and after compression (compressed responses only)."""
+
+    def __init__(self):
+        self.responses = 0
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def stats(self) -> dict:
+        return {
+            "responses": self.responses,
+            "compressed": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+        }
+
+
+compression_stats = CompressionStats()
+
+
+class _GzipResponder:
+    """Wraps `send` for one response and decides whether to compress it."""
+
+    def __init__(self, send, accepts: bool, minimum_size: int, level: int):
+        self._send = send
+        self.accepts = accepts
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start: Optional[dict] = None
+        self.mode: Optional[str] = None  # None (undecided) | 'identity' | 'gzip'
+        self.pending = bytearray()
+        self.compressor = None
+
+    async def send(self, message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message.get("headers", []))
+            if message["status"] < 200 or message["status"] in (204, 304) or not is_compressible(headers):
+                self.mode = "identity"
+                await self._send(message)
+            else:
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                if not self.accepts:
+                    self.mode = "identity"
+                    await self._send(message)
+            return
+
+        if message_type != "http.response.body" or self.mode == "identity":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            self.pending += body
+            if len(self.pending) < self.minimum_size:
+                if more_body:
+                    return  # Not enough to decide yet
+                self.mode = "identity"
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": bytes(self.pending), "more_body": False})
+                return
+            self.mode = "gzip"
+            self.compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)  # 31: gzip container
+            data = self._compress(bytes(self.pending), more_body)
+            headers = MutableHeaders(scope=self.start)
+            headers["Content-Encoding"] = "gzip"
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(data))
+            compression_stats.compressed += 1
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        await self._send({"type": "http.response.body", "body": self._compress(body, more_body), "more_body": more_body})
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self.compressor.compress(body)
+        data += self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        compression_stats.bytes_in += len(body)
+        compression_stats.bytes_out += len(data)
+        return data
+
+
+class GzipMiddleware:
+    """Compresses large compressible responses, streaming ones included (pure ASGI)."""
+
+    def __init__(self, app, minimum_size: Optional[int] = None, level: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.GZIP_MIN_SIZE
+        self.level = level if level is not None else settings.GZIP_LEVEL
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        compression_stats.responses += 1
+        responder = _GzipResponder(send, accepts_gzip(scope), self.minimum_size, self.level)
+        await self.app(scope, receive, responder.send)
@@ -0,0 +1,56 @@
+"""
+Optimistic concurrency for PATCH endpoints.
+
+Versioned rows (SQLAlchemy `version_id_col`) carry a `version` that is
+incremented on every update, and every ORM UPDATE is guarded by
+`WHERE version = <version loaded>`. A client sends the version it last
+saw either as an `If-Match` header or as the `expected_version` query
+parameter. If-Match takes the bare version (`"3"`) or the ETag of the
+single-item GET (`W/"3-<digest>"`), whose leading part is the version.
+If the row has moved on, the update is rejected with 409 and the current
+representation, so the client can merge and retry without any row locks
+being held between requests.
+"""
+from typing import Any, Optional
+
+from fastapi import Header, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+
+
+def get_expected_version(
+    if_match: Optional[str] = Header(
+        None, description='Version the client last saw, e.g. "3", or the ETag of the item\'s GET'
+    ),
+    expected_version: Optional[int] = Query(None, ge=1, description="Alternative to If-Match"),
+) -> Optional[int]:
+    """Dependency: the version the client expects to update, if it sent one."""
+    if expected_version is not None:
+        return expected_version
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    # ETags of single-item GETs are "<version>-<digest>"
+    version = value.strip('"').partition("-")[0]
+    try:
+        return int(version)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='If-Match must carry the resource version or its ETag, e.g. If-Match: "3"'
+        )
+
+
+def version_conflict(current: Any) -> HTTPException:
+    """409 carrying the current representation of the resource."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": (
+                "The resource was modified by someone else. "
+                "Review the current version and retry."
+            ),
+            "current": jsonable_encoder(current),
+        }
+    )
@@ -14,15 +14,138 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: Optional[str] = None
+    DATABASE_READ_URL: Optional[str] = None  # Optional read replica for read-heavy routes
+    
+    # Read replica routing
+    DB_READ_STICKY_SECONDS: int = 5  # After a write, the client reads from the primary this long
+    DB_READ_HEALTH_INTERVAL_SECONDS: int = 10
+    DB_READ_MAX_LAG_SECONDS: float = 10.0  # Replica treated as unhealthy beyond this replay lag
+    
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30  # Wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 60 * 30  # Replace connections older than this
+    DB_POOL_PRE_PING: bool = True
+    DB_BACKGROUND_POOL_SIZE: int = 3  # Separate pool for jobs, scheduler, outbox and SLA monitor
+    DB_BACKGROUND_MAX_OVERFLOW: int = 7
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements; 0 behind pgbouncer (transaction mode)
+    
+    # SQL logging (replaces engine echo)
+    DB_ECHO: bool = False  # Log every statement; development only
+    DB_SLOW_QUERY_MS: int = 500  # Log statements slower than this; 0 disables
+    DB_QUERY_LOG_SAMPLE_RATE: float = 0.0  # Fraction of other statements to log
+    
+    # Per-request query counting (N+1 detection)
+    QUERY_BUDGET_PER_REQUEST: int = 20  # Log requests running more statements; 0 disables
+    QUERY_STATS_HEADERS: bool = False  # X-DB-Query-Count / X-DB-Time-Ms headers (always on with DEBUG)
+    
+    # Response compression
+    GZIP_MIN_SIZE: int = 1024  # Compress responses of at least this many bytes; smaller ones are sent as is
+    GZIP_LEVEL: int = 5  # zlib level 1-9; higher is smaller and slower
+    
+    # Batch endpoints
+    BATCH_MAX_IDS: int = 200  # Ids accepted per GET /<resource>/batch call
+    BATCH_MAX_SUBREQUESTS: int = 20  # Sub-requests accepted per POST /batch call
+    BATCH_MAX_CONCURRENCY: int = 4  # Sub-requests of one batch in flight at once
+    
+    # Admission control: concurrent requests / queued requests per route class (per worker)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_CHEAP_CONCURRENCY: int = 32
+    ADMISSION_CHEAP_QUEUE: int = 128
+    # read_heavy + write + export + auth (13) stays below the request pool (15), leaving room for cheap requests
+    ADMISSION_READ_HEAVY_CONCURRENCY: int = 4
+    ADMISSION_READ_HEAVY_QUEUE: int = 24
+    ADMISSION_WRITE_CONCURRENCY: int = 4
+    ADMISSION_WRITE_QUEUE: int = 48
+    ADMISSION_EXPORT_CONCURRENCY: int = 1
+    ADMISSION_EXPORT_QUEUE: int = 4
+    # Login, refresh, register and logout: kept apart so a write burst cannot lock users out
+    ADMISSION_AUTH_CONCURRENCY: int = 4
+    ADMISSION_AUTH_QUEUE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0  # Longest wait for a slot before 503
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
     
     # JWT Settings
     SECRET_KEY: str = "your-super-secret-key-change-in-production-min-32-chars"
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    # Short-lived, since claims are trusted without a DB lookup (was 7 days). Clients renew with
+    # POST /auth/refresh; raise this while clients without refresh handling are still deployed.
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    
+    # Token revocation list (mirrored in memory, synced from the database)
+    REVOCATION_SYNC_INTERVAL_SECONDS: int = 5
+    REVOCATION_PRUNE_INTERVAL_SECONDS: int = 60 * 60
+    TOKEN_VERSION_SYNC_INTERVAL_SECONDS: int = 5  # Picks up claim invalidations from other workers
+    
+    # bcrypt cost factor; pick with `python -m app.calibrate_hash`. Hashes with
+    # a different cost are rehashed on the next successful login.
+    PASSWORD_HASH_ROUNDS: int = 12
+    
+    # Password hashing executor (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Running + queued; beyond this fail fast with 503
+    
+    # Login throttling (sliding window, checked before any DB lookup)
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5
+    LOGIN_RATE_LIMIT_PER_IP: int = 30
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # Shared backend across workers (needs redis)
+    TRUST_FORWARDED_FOR: bool = False  # Use X-Forwarded-For for client IP (behind a proxy)
     
     # CORS
     CORS_ORIGINS: str = "*"
     
+    # Team-membership cache (scoped access checks)
+    TEAM_CACHE_TTL_SECONDS: int = 300
+    TEAM_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Authenticated-principal cache (get_current_user)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Background scheduler
+    SCHEDULER_ENABLED: bool = True
+    
+    # Technician assignment load index
+    ASSIGNMENT_REBUILD_INTERVAL_SECONDS: int = 60 * 10
+    
+    # Warranty expiry scan
+    WARRANTY_SCAN_INTERVAL_SECONDS: int = 60 * 60 * 6  # 6 hours
+    WARRANTY_HORIZON_DAYS: int = 30
+    WARRANTY_AUTO_CREATE_INSPECTIONS: bool = False
+    WARRANTY_INSPECTION_LEAD_DAYS: int = 14  # Schedule inspection this long before expiry
+    
+    # Recurring maintenance schedule generation
+    SCHEDULE_GENERATION_INTERVAL_SECONDS: int = 60 * 60
+    SCHEDULE_INSERT_BATCH_SIZE: int = 5000  # Requests per INSERT round
+    
+    # SLA deadlines and breach detection
+    SLA_MONITOR_ENABLED: bool = True
+    SLA_TICK_SECONDS: float = 1.0  # Timer wheel resolution
+    SLA_SYNC_INTERVAL_SECONDS: int = 10  # Pick up deadline changes from other workers
+    SLA_AT_RISK_MINUTES: int = 60  # Dashboard: deadline within this window counts as at risk
+    
+    # Background job queue (Postgres only)
+    JOBS_ENABLED: bool = True
+    JOB_WORKERS: int = 4  # Concurrent jobs per process
+    JOB_PROCESS_WORKERS: int = 2  # Processes for CPU-bound job steps
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_HEARTBEAT_SECONDS: int = 30
+    JOB_LEASE_SECONDS: int = 5 * 60  # Requeue running jobs without a heartbeat for this long
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 10.0  # Doubles per attempt
+    JOB_RESULT_RETENTION_HOURS: int = 72
+    
+    # Transactional outbox consumer
+    OUTBOX_ENABLED: bool = True
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_MAX_ATTEMPTS: int = 8  # Then the event is marked failed
+    OUTBOX_RETRY_BASE_SECONDS: float = 2.0  # Doubles per attempt
+    OUTBOX_RETENTION_HOURS: int = 24 * 7  # Delivered events are kept this long
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
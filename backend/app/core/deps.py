@@ -4,16 +4,71 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Optional
+from sqlalchemy.orm import make_transient_to_detached
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 from app.db.session import get_db
 from app.db.models import User
-from .security import decode_access_token
+from .cache import TTLCache
+from .config import settings
+from .tokens import TokenClaims, decode_token, is_current
+from .revocation import revocation_list
 
 # HTTP Bearer token scheme
 security = HTTPBearer(auto_error=False)
 
+# Active users by (user id, token), stored as column snapshots
+principal_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidate_principal(user_id: UUID) -> None:
+    """Drop cached principals of a user (profile, role or active flag changed)."""
+    principal_cache.invalidate_matching(lambda key: key[0] == user_id)
+
+
+async def _load_principal(db: AsyncSession, subject: str, token: str) -> Optional[User]:
+    """
+    Resolve the active user for a verified token subject.
+    
+    Served from the principal cache when possible; on a hit a detached User
+    is rebuilt from the cached column values, so no query is made.
+    """
+    try:
+        user_id = UUID(subject)
+    except (TypeError, ValueError):
+        return None
+    
+    key = (user_id, token)
+    values = principal_cache.get(key)
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+    
+    generation = principal_cache.generation
+    result = await db.execute(
+        select(User).where(User.id == user_id, User.is_active == True)
+    )
+    user = result.scalar_one_or_none()
+    if user is not None:
+        values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        principal_cache.set(key, values, generation)
+    return user
+
+
+def _verify_access_token(token: str) -> Optional[TokenClaims]:
+    """Claims of a valid, current, unrevoked access token of an active user, else None."""
+    claims = decode_token(token)
+    if claims is None or not claims.is_active or not is_current(claims):
+        return None
+    if revocation_list.is_revoked(claims):
+        return None
+    return claims
+
 
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -24,16 +79,13 @@ async def get_current_user_optional(
         return None
     
     token = credentials.credentials
-    user_id = decode_access_token(token)
+    claims = _verify_access_token(token)
     
-    if not user_id:
+    if not claims:
         return None
     
     try:
-        result = await db.execute(
-            select(User).where(User.id == UUID(user_id), User.is_active == True)
-        )
-        return result.scalar_one_or_none()
+        return await _load_principal(db, claims.subject, token)
     except Exception:
         return None
 
@@ -50,16 +102,13 @@ async def get_current_user(
     )
     
     token = credentials.credentials
-    user_id = decode_access_token(token)
+    claims = _verify_access_token(token)
     
-    if not user_id:
+    if not claims:
         raise credentials_exception
     
     try:
-        result = await db.execute(
-            select(User).where(User.id == UUID(user_id), User.is_active == True)
-        )
-        user = result.scalar_one_or_none()
+        user = await _load_principal(db, claims.subject, token)
     except Exception:
         raise credentials_exception
     
@@ -69,25 +118,61 @@ async def get_current_user(
     return user
 
 
+async def get_current_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+) -> TokenClaims:
+    """
+    Get the verified access-token claims, raises 401 if not authenticated.
+    
+    No database access: role, active flag and team ids come from the token.
+    A token issued before the user's token version was bumped is rejected,
+    prompting the client to refresh.
+    """
+    claims = _verify_access_token(credentials.credentials)
+    if not claims:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+
+def ensure_team_access(claims: TokenClaims, team_id: Optional[UUID]) -> None:
+    """
+    Raise 403 unless the caller is an admin/manager or a member of the team.
+    
+    Decided from the token's team ids; a membership change bumps the
+    user's token version, so a stale token is refused and refreshed.
+    """
+    if claims.role in ("admin", "manager"):
+        return
+    if team_id is None or not claims.in_team(team_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not a member of this team"
+        )
+
+
 async def get_current_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    claims: TokenClaims = Depends(get_current_claims)
+) -> TokenClaims:
     """Require admin role."""
-    if current_user.role != "admin":
+    if claims.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return current_user
+    return claims
 
 
 async def get_current_manager_or_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    claims: TokenClaims = Depends(get_current_claims)
+) -> TokenClaims:
     """Require manager or admin role."""
-    if current_user.role not in ["admin", "manager"]:
+    if claims.role not in ["admin", "manager"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Manager access required"
         )
-    return current_user
+    return claims
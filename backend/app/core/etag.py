@@ -0,0 +1,152 @@
+"""
+Conditional GET support (ETag / Last-Modified).
+
+A validator is built from MAX(updated_at) and COUNT(*) of the tables a
+response is made of, fetched in a single query of scalar subqueries. If the
+client's If-None-Match (or If-Modified-Since) still matches, the route can
+return 304 before loading relationships or serializing anything.
+
+The count catches deletes that MAX(updated_at) alone would miss, so ETags
+are the only validator for collections: they get no Last-Modified, since
+after a delete the newest remaining timestamp does not move and an
+If-Modified-Since check would wrongly answer 304.
+
+Single items of versioned models pass their row version, which leads the
+tag (`W/"<version>-<digest>"`), so the ETag of a GET can be echoed as
+If-Match on PATCH (see app.core.concurrency). Single-item routes pass the
+version or an EXISTS test, so a missing item is never reported as not
+modified (`If-None-Match: *` included) and the route answers 404.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+Stamp = Tuple[Any, ...]
+
+
+@dataclass
+class Validator:
+    """Cache validator for a response."""
+    etag: str
+    last_modified: Optional[datetime]
+    exists: bool = True  # False for a single item that is not there
+
+
+def table_stamp(model, *criteria) -> Stamp:
+    """MAX(updated_at) and COUNT(*) of a model's rows matching the criteria."""
+    return (
+        select(func.max(model.updated_at)).where(*criteria).scalar_subquery(),
+        select(func.count()).select_from(model).where(*criteria).scalar_subquery(),
+    )
+
+
+async def compute_validator(
+    db: AsyncSession,
+    request: Request,
+    stamps: Sequence[Stamp],
+    version: Any = None,
+    exists: Any = None,
+) -> Validator:
+    """Run all stamps in one round trip and derive the ETag and Last-Modified."""
+    columns = [column for stamp in stamps for column in stamp]
+    if version is not None:
+        columns.append(version.label("row_version"))
+    if exists is not None:
+        columns.append(exists.label("row_exists"))
+    row = (await db.execute(select(*columns))).one()
+    values = tuple(row)
+    row_version = row._mapping["row_version"] if version is not None else None
+    if version is not None:
+        found = row_version is not None
+    else:
+        found = bool(row._mapping["row_exists"]) if exists is not None else True
+
+    # Only single items: a collection's newest timestamp misses deletes
+    timestamps = [v for v in values if isinstance(v, datetime)]
+    single_item = version is not None or exists is not None
+    last_modified = max(timestamps) if timestamps and single_item else None
+
+    # The URL is part of the tag so different filters/pages never share one
+    raw = f"{request.url.path}?{request.url.query}|" + "|".join(
+        v.isoformat() if isinstance(v, datetime) else str(v) for v in values
+    )
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    if row_version is not None:
+        digest = f"{row_version}-{digest}"
+    return Validator(etag=f'W/"{digest}"', last_modified=last_modified, exists=found)
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str, exists: bool = True) -> bool:
+    if header.strip() == "*":
+        # Matches any current representation, so only an existing resource
+        return exists
+    # Weak comparison: ignore W/ prefixes on either side
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since (RFC 9110 order)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, validator.etag, validator.exists)
+    if not validator.exists:
+        return False
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validator.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        last_modified = validator.last_modified
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(validator: Validator) -> dict:
+    headers = {"ETag": validator.etag, "Cache-Control": "no-cache"}
+    if validator.last_modified is not None:
+        headers["Last-Modified"] = _http_date(validator.last_modified)
+    return headers
+
+
+async def conditional_get(
+    db: AsyncSession,
+    request: Request,
+    response: Response,
+    stamps: List[Stamp],
+    version: Any = None,
+    exists: Any = None,
+) -> Optional[Response]:
+    """
+    Answer a conditional GET.
+
+    Returns a 304 response if the client's copy is current. Otherwise sets
+    the validator headers on `response` and returns None so the route
+    continues with the full query. For a single item pass `version`, a
+    scalar subquery of its row version (versioned models), or `exists`, an
+    EXISTS test for it, so a missing item is never answered with 304.
+    """
+    validator = await compute_validator(db, request, stamps, version, exists)
+    headers = validator_headers(validator)
+    if is_not_modified(request, validator):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,25 @@
+"""
+CPU-bound export helpers.
+
+Kept free of database and application imports: these functions run in
+the job process pool, whose worker processes import only this module.
+"""
+import csv
+import io
+from typing import Any, List, Optional, Sequence
+
+
+def render_csv(header: Optional[Sequence[str]], rows: List[Sequence[Any]]) -> bytes:
+    """
+    Render rows as UTF-8 CSV (None becomes an empty cell).
+
+    Pass `header=None` for every chunk after the first of a file rendered
+    page by page.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+    return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,109 @@
+"""
+Built-in background job types.
+
+Imported by the background wiring and the jobs routes so the handlers
+are registered before workers start or jobs are queued.
+"""
+from datetime import date
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy import select, func
+
+from app.core.assignment import assignment_engine
+from app.core.config import settings
+from app.core.exports import render_csv
+from app.core.jobs import JobContext, job_handler
+from app.core.schedules import generate_scheduled_requests
+from app.core.warranty import create_warranty_inspections
+from app.db.models import MaintenanceRequest
+
+EXPORT_PAGE_SIZE = 2000
+
+REQUEST_EXPORT_COLUMNS = (
+    MaintenanceRequest.reference,
+    MaintenanceRequest.subject,
+    MaintenanceRequest.request_type,
+    MaintenanceRequest.status,
+    MaintenanceRequest.priority,
+    MaintenanceRequest.category,
+    MaintenanceRequest.equipment_id,
+    MaintenanceRequest.maintenance_team_id,
+    MaintenanceRequest.assigned_to,
+    MaintenanceRequest.scheduled_date,
+    MaintenanceRequest.completed_at,
+    MaintenanceRequest.duration_hours,
+    MaintenanceRequest.created_at,
+)
+
+
+@job_handler("schedules.generate")
+async def generate_schedules(ctx: JobContext, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Materialize schedule occurrences (params: horizon_days, schedule_id)."""
+    schedule_id = params.get("schedule_id")
+    async with ctx.session() as db:
+        outcome = await generate_scheduled_requests(
+            db,
+            horizon_days=params.get("horizon_days"),
+            schedule_id=UUID(schedule_id) if schedule_id else None,
+        )
+        await db.commit()
+    assignment_engine.requests_created(outcome.loads)
+    return {"schedules": outcome.schedules, "occurrences": outcome.occurrences, "created": outcome.created}
+
+
+@job_handler("warranty.inspections")
+async def schedule_warranty_inspections(ctx: JobContext, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Create warranty inspections (params: within_days, lead_days)."""
+    within_days = params.get("within_days", settings.WARRANTY_HORIZON_DAYS)
+    lead_days = params.get("lead_days", settings.WARRANTY_INSPECTION_LEAD_DAYS)
+    async with ctx.session() as db:
+        created = await create_warranty_inspections(db, within_days, lead_days)
+        await db.commit()
+    assignment_engine.requests_created(created)
+    return {"created": len(created), "horizon_days": within_days, "lead_days": lead_days}
+
+
+@job_handler("requests.export_csv")
+async def export_requests_csv(ctx: JobContext, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Export maintenance requests as CSV (params: status, request_type, maintenance_team_id)."""
+    filters = []
+    if params.get("status"):
+        filters.append(MaintenanceRequest.status == params["status"])
+    if params.get("request_type"):
+        filters.append(MaintenanceRequest.request_type == params["request_type"])
+    if params.get("maintenance_team_id"):
+        filters.append(MaintenanceRequest.maintenance_team_id == UUID(params["maintenance_team_id"]))
+
+    # Rendered and stored page by page: only one page is in memory or sent to the process pool
+    header = [column.key for column in REQUEST_EXPORT_COLUMNS]
+    await ctx.discard_file()
+    exported = size = part = 0
+    async with ctx.session() as db:
+        total = await db.scalar(select(func.count()).select_from(MaintenanceRequest).where(*filters)) or 0
+        # Keyset pagination on id keeps every page an index range scan
+        last_id = None
+        while True:
+            query = select(MaintenanceRequest.id, *REQUEST_EXPORT_COLUMNS).where(*filters)
+            if last_id is not None:
+                query = query.where(MaintenanceRequest.id > last_id)
+            page = (await db.execute(query.order_by(MaintenanceRequest.id).limit(EXPORT_PAGE_SIZE))).all()
+            if not page and part:
+                break
+            rows = [tuple(str(v) if isinstance(v, UUID) else v for v in row[1:]) for row in page]
+            chunk = await ctx.run_cpu(render_csv, header if part == 0 else None, rows)
+            await ctx.write_file_part(part, chunk)
+            part += 1
+            size += len(chunk)
+            exported += len(rows)
+            if not page:
+                break  # Empty export: the header alone
+            last_id = page[-1][0]
+            await ctx.progress(min(99, 99 * exported // max(total, 1)), f"Exported {exported} of {total} requests")
+
+    return {
+        "filename": f"maintenance-requests-{date.today().isoformat()}.csv",
+        "content_type": "text/csv",
+        "rows": exported,
+        "size_bytes": size,
+    }
@@ -0,0 +1,415 @@
+"""
+Postgres-backed background job queue.
+
+Long-running work is queued as a row in the jobs table with `enqueue_job`
+and executed outside the request by the job worker pool, which runs
+inside every API process and needs nothing but Postgres:
+
+- JOB_WORKERS asyncio workers each claim one queued job at a time with
+  UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED), so processes
+  never take the same job, and commit the claim right away: a running job
+  holds a lease (locked_by + heartbeat_at), not a transaction;
+- heartbeats keep the lease alive; the reaper job requeues jobs whose
+  worker stopped heartbeating (crash, deploy) until max_attempts is spent;
+- failures are retried with exponential backoff, then marked failed;
+- CPU-bound steps run in a process pool via `ctx.run_cpu`, so they do not
+  block the event loop serving HTTP requests;
+- `result` holds a small JSON summary; files (exports) are written in
+  parts to job_file_parts with `ctx.write_file_part` and streamed by the
+  download route;
+- finished jobs keep their result and files for JOB_RESULT_RETENTION_HOURS,
+  after which the prune job deletes them.
+
+Job types are registered with the `job_handler` decorator (see
+app.core.job_handlers):
+
+    @job_handler("requests.export_csv")
+    async def export_requests(ctx: JobContext, params: dict) -> dict:
+        await ctx.progress(50, "Half way")
+        return {"rows": 123}
+"""
+import asyncio
+import multiprocessing
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, update, delete, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Job, JobFilePart
+from app.db.session import AsyncBackgroundSessionLocal
+
+T = TypeVar("T")
+
+JobHandler = Callable[["JobContext", Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Retry delays double per attempt up to this cap
+MAX_RETRY_DELAY_SECONDS = 60 * 60
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+class UnknownJobType(ValueError):
+    """No handler is registered for the job type."""
+
+
+class JobCancelled(Exception):
+    """Raised from `JobContext.progress` when cancellation was requested."""
+
+
+def job_handler(job_type: str):
+    """Decorator: register the async handler for a job type."""
+    def register(func: JobHandler) -> JobHandler:
+        _handlers[job_type] = func
+        return func
+    return register
+
+
+def job_types() -> List[str]:
+    return sorted(_handlers)
+
+
+def enqueue_job(
+    db: AsyncSession,
+    job_type: str,
+    params: Optional[Dict[str, Any]] = None,
+    priority: int = 0,
+    created_by: Optional[UUID] = None,
+    max_attempts: Optional[int] = None,
+    run_after: Optional[datetime] = None,
+) -> Job:
+    """
+    Queue a job in the caller's transaction; the caller commits.
+
+    Call `job_worker_pool.wake()` after the commit to start it without
+    waiting for the next poll.
+
+    Raises:
+        UnknownJobType: no handler is registered for `job_type`
+    """
+    if job_type not in _handlers:
+        raise UnknownJobType(job_type)
+    job = Job(
+        job_type=job_type,
+        params=jsonable_encoder(params or {}),
+        priority=priority,
+        created_by=created_by,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+    if run_after is not None:
+        job.run_after = run_after
+    db.add(job)
+    return job
+
+
+async def cancel_job(db: AsyncSession, job_id: UUID) -> Optional[str]:
+    """
+    Cancel a job: queued jobs immediately, running ones at their next progress report.
+
+    Returns:
+        The job's status afterwards, or None if it does not exist
+    """
+    status = await db.scalar(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "queued")
+        .values(status="cancelled", finished_at=func.now(), expires_at=_expiry())
+        .returning(Job.status)
+    )
+    if status is None:
+        await db.execute(
+            update(Job).where(Job.id == job_id, Job.status == "running").values(cancel_requested=True)
+        )
+        status = await db.scalar(select(Job.status).where(Job.id == job_id))
+    return status
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt after `attempts` failed ones."""
+    return min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+
+def _expiry():
+    return func.now() + timedelta(hours=settings.JOB_RESULT_RETENTION_HOURS)
+
+
+class JobContext:
+    """Handed to a job handler: progress reporting, sessions and the process pool."""
+
+    def __init__(self, pool: "JobWorkerPool", job_id: UUID, job_type: str, attempt: int):
+        self._pool = pool
+        self.job_id = job_id
+        self.job_type = job_type
+        self.attempt = attempt
+
+    def session(self) -> AsyncSession:
+        """A new session; handlers manage their own transactions (`async with ctx.session() as db`)."""
+        return AsyncBackgroundSessionLocal()
+
+    async def progress(self, percent: int, message: Optional[str] = None) -> None:
+        """
+        Record progress (0-100); also renews the lease.
+
+        Raises:
+            JobCancelled: cancellation was requested for this job
+        """
+        async with AsyncBackgroundSessionLocal() as db:
+            cancel_requested = await db.scalar(
+                update(Job)
+                .where(Job.id == self.job_id, Job.locked_by == self._pool.worker_id)
+                .values(
+                    progress=max(0, min(100, int(percent))),
+                    progress_message=message[:255] if message else None,
+                    heartbeat_at=func.now(),
+                )
+                .returning(Job.cancel_requested)
+            )
+            await db.commit()
+        if cancel_requested:
+            raise JobCancelled()
+
+    async def run_cpu(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a picklable module-level function in the process pool."""
+        return await self._pool.run_cpu(func, *args)
+
+    async def discard_file(self) -> None:
+        """Drop file parts written by an earlier attempt of this job."""
+        async with AsyncBackgroundSessionLocal() as db:
+            await db.execute(delete(JobFilePart).where(JobFilePart.job_id == self.job_id))
+            await db.commit()
+
+    async def write_file_part(self, part: int, content: bytes) -> None:
+        """Store the next chunk of the job's file (served by GET /jobs/{id}/download)."""
+        async with AsyncBackgroundSessionLocal() as db:
+            db.add(JobFilePart(job_id=self.job_id, part=part, content=content))
+            await db.commit()
+
+
+class JobWorkerPool:
+    """Claims queued jobs and runs them with bounded concurrency."""
+
+    def __init__(self, concurrency: int, process_workers: int):
+        self.concurrency = concurrency
+        self.process_workers = process_workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self.running_jobs = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.cancelled = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        for n in range(self.concurrency):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"job-worker:{n}"))
+
+    async def stop(self) -> None:
+        """Stop the workers; interrupted jobs are released back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    def wake(self) -> None:
+        """Claim now instead of at the next poll (after committing new jobs)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run_cpu(self, func: Callable[..., T], *args: Any) -> T:
+        if self._process_pool is None:
+            # spawn: never fork a process that is running an event loop
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._process_pool, func, *args)
+
+    async def claim(self):
+        """Claim the next due job, highest priority first; None if there is none."""
+        candidate = (
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_after <= func.now())
+            .order_by(Job.priority.desc(), Job.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with AsyncBackgroundSessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == candidate)
+                .values(
+                    status="running",
+                    attempts=Job.attempts + 1,
+                    locked_by=self.worker_id,
+                    heartbeat_at=func.now(),
+                    started_at=func.now(),
+                    progress=0,
+                    progress_message=None,
+                )
+                .returning(Job.id, Job.job_type, Job.params, Job.attempts, Job.max_attempts)
+            )
+            job = result.one_or_none()
+            await db.commit()
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self.claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                job = None
+                self.last_error = repr(exc)
+                print(f"Warning: job worker could not claim a job: {exc!r}")
+            if job is not None:
+                await self._run(job)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _run(self, job) -> None:
+        ctx = JobContext(self, job.id, job.job_type, job.attempts)
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        self.running_jobs += 1
+        try:
+            handler = _handlers.get(job.job_type)
+            if handler is None:
+                raise UnknownJobType(job.job_type)
+            result = await handler(ctx, job.params)
+        except JobCancelled:
+            self.cancelled += 1
+            await self._finish(job.id, status="cancelled", finished_at=func.now(), expires_at=_expiry())
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without spending an attempt
+            await asyncio.shield(self._finish(
+                job.id, status="queued", attempts=Job.attempts - 1, run_after=func.now()
+            ))
+            raise
+        except Exception as exc:
+            self.last_error = f"{job.job_type} {job.id}: {exc!r}"
+            if job.attempts < job.max_attempts:
+                self.retried += 1
+                await self._finish(
+                    job.id, status="queued", error=repr(exc),
+                    run_after=func.now() + timedelta(seconds=retry_delay(job.attempts)),
+                )
+            else:
+                self.failed += 1
+                print(f"Warning: job {job.job_type} {job.id} failed after {job.attempts} attempts: {exc!r}")
+                await self._finish(
+                    job.id, status="failed", error=repr(exc), finished_at=func.now(), expires_at=_expiry()
+                )
+        else:
+            self.succeeded += 1
+            await self._finish(
+                job.id, status="succeeded", progress=100, error=None,
+                result=jsonable_encoder(result) if result is not None else None,
+                finished_at=func.now(), expires_at=_expiry(),
+            )
+        finally:
+            self.running_jobs -= 1
+            heartbeat.cancel()
+
+    async def _finish(self, job_id: UUID, **values) -> None:
+        # Only while this worker still holds the lease (the reaper may have requeued it)
+        async with AsyncBackgroundSessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "running", Job.locked_by == self.worker_id)
+                .values(locked_by=None, **values)
+            )
+            await db.commit()
+
+    async def _heartbeat(self, job_id: UUID) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                async with AsyncBackgroundSessionLocal() as db:
+                    await db.execute(
+                        update(Job)
+                        .where(Job.id == job_id, Job.locked_by == self.worker_id)
+                        .values(heartbeat_at=func.now())
+                    )
+                    await db.commit()
+            except Exception as exc:
+                print(f"Warning: heartbeat for job {job_id} failed: {exc!r}")
+
+    async def stats(self, db: AsyncSession) -> Dict[str, object]:
+        result = await db.execute(select(Job.status, func.count()).group_by(Job.status))
+        return {
+            "worker_id": self.worker_id,
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "process_workers": self.process_workers,
+            "job_types": job_types(),
+            "jobs": dict(result.all()),
+            "running_jobs": self.running_jobs,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "cancelled": self.cancelled,
+            "last_error": self.last_error,
+        }
+
+
+# Process-wide worker pool used by the application lifespan
+job_worker_pool = JobWorkerPool(
+    concurrency=settings.JOB_WORKERS,
+    process_workers=settings.JOB_PROCESS_WORKERS,
+)
+
+
+async def job_reaper_job(db: AsyncSession) -> None:
+    """Scheduled job: requeue (or fail) running jobs whose lease expired."""
+    exhausted = Job.attempts >= Job.max_attempts
+    result = await db.execute(
+        update(Job)
+        .where(
+            Job.status == "running",
+            Job.heartbeat_at < func.now() - timedelta(seconds=settings.JOB_LEASE_SECONDS),
+        )
+        .values(
+            status=case((exhausted, "failed"), else_="queued"),
+            locked_by=None,
+            error="Worker stopped heartbeating (lease expired)",
+            finished_at=case((exhausted, func.now()), else_=None),
+            expires_at=case((exhausted, _expiry()), else_=None),
+        )
+        .returning(Job.id)
+    )
+    reaped = len(result.all())
+    if reaped:
+        print(f"Warning: released {reaped} jobs with expired leases")
+
+
+async def job_prune_job(db: AsyncSession) -> None:
+    """Scheduled job: delete finished jobs past their result retention."""
+    await db.execute(
+        delete(Job).where(Job.status.in_(FINISHED_STATUSES), Job.expires_at < func.now())
+    )
@@ -1,24 +1,22 @@
 """
-JWT Token utilities for authentication.
+JWT token helpers for the legacy sync API (app.api).
+
+Thin wrappers over app.core.tokens, the single token implementation, kept
+so the legacy call signatures continue to work.
 """
-import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
-import jwt
 from pydantic import BaseModel
 
-# JWT Configuration
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "gearguard-super-secret-key-change-in-production")
-JWT_ALGORITHM = "HS256"
-JWT_EXPIRATION_HOURS = 24
+from app.core import tokens
 
 
 class TokenData(BaseModel):
     """Token payload data."""
     user_id: str
-    email: str
-    role: str
+    email: Optional[str] = None
+    role: Optional[str] = None
     exp: Optional[datetime] = None
 
 
@@ -28,47 +26,31 @@ def create_access_token(user_id: str, email: str, role: str) -> str:
     
     Args:
         user_id: User's unique ID
-        email: User's email
+        email: User's email (not carried in the token)
         role: User's role (admin, manager, technician, user)
     
     Returns:
         Encoded JWT token string
     """
-    expire = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
-    
-    payload = {
-        "sub": user_id,  # subject (user id)
-        "email": email,
-        "role": role,
-        "exp": expire,
-        "iat": datetime.utcnow(),  # issued at
-    }
-    
-    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    return tokens.create_access_token(subject=user_id, role=role)
 
 
 def verify_token(token: str) -> Optional[TokenData]:
     """
-    Verify and decode a JWT token.
+    Verify and decode a JWT access token.
     
     Args:
         token: JWT token string
     
     Returns:
-        TokenData if valid, None if invalid
+        TokenData if valid, None if invalid or expired
     """
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        
-        return TokenData(
-            user_id=payload.get("sub"),
-            email=payload.get("email"),
-            role=payload.get("role"),
-            exp=datetime.fromtimestamp(payload.get("exp")),
-        )
-    except jwt.ExpiredSignatureError:
-        # Token has expired
-        return None
-    except jwt.InvalidTokenError:
-        # Token is invalid
+    claims = tokens.decode_token(token)
+    if claims is None:
         return None
+    
+    return TokenData(
+        user_id=claims.subject,
+        role=claims.role,
+        exp=claims.expires_at,
+    )
@@ -0,0 +1,25 @@
+"""
+HTTP middleware wiring.
+
+Both entry points (main.py and app/main.py) call install_middleware so
+middleware is set up in one place, then add CORS last so it is outermost
+and its headers are on every response, 503s from admission control included.
+"""
+from fastapi import FastAPI
+
+from app.db.session import read_engine
+from app.db.replica import ReadYourWritesMiddleware
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.compression import GzipMiddleware
+from app.core.admission import AdmissionControlMiddleware
+
+
+def install_middleware(app: FastAPI) -> None:
+    """Add application middleware (CORS is added afterwards by each entry point)."""
+    if read_engine is not None:
+        app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(GzipMiddleware)
+    # Added after the inner layers so it sees every query of the request
+    app.add_middleware(QueryBudgetMiddleware)
+    # Outermost of ours: rejected requests do no other work
+    app.add_middleware(AdmissionControlMiddleware)
@@ -0,0 +1,252 @@
+"""
+Multiplexed read-only sub-requests (POST /api/batch).
+
+A page that needs several GET endpoints can ask for all of them in one
+HTTP round trip. Each sub-request is dispatched to the application's
+router as an in-process ASGI call: the same routes, dependencies,
+validation and exception handlers as a direct request. Of the HTTP
+middleware only query counting is applied again, so each sub-request is
+recorded and budgeted under its own route (its statements also count
+towards the batch request); admission control, compression and CORS are
+not, the batch itself already holds a read_heavy admission slot. The
+caller's Authorization and Cookie headers are forwarded to every
+sub-request.
+
+All sub-requests share one database session (and so one pooled
+connection): while the batch runs, `get_db` and `get_read_db` hand out the
+batch's session instead of opening their own. The session runs a single
+REPEATABLE READ, READ ONLY transaction, so every sub-request sees the
+same snapshot and none of them can write. A connection executes one
+statement at a time, so the session serializes its database calls;
+sub-requests still overlap everything else (validation, serialization),
+and at most BATCH_MAX_CONCURRENCY of them are in flight at once so one
+batch cannot monopolize the worker.
+
+A database error aborts the shared transaction, so the batch is
+all-or-nothing from that point: the failing sub-request gets its error
+(usually 500), and every sub-request that touches the database afterwards,
+or has not started yet, gets 424 without running any further statements.
+Responses already produced are kept. Clients retry the 424 items.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.query_budget import QueryBudgetMiddleware
+from app.db.replica import open_read_session
+from app.db.session import shared_session
+
+API_PREFIX = "/api"
+
+# Parent request headers never passed on to sub-requests
+DROPPED_HEADERS = frozenset({
+    b"content-length", b"content-type", b"transfer-encoding", b"connection",
+    b"accept-encoding", b"if-none-match", b"if-modified-since", b"expect",
+})
+
+
+class BatchAborted(Exception):
+    """An earlier sub-request's database error aborted the batch's transaction."""
+
+
+# Response for sub-requests skipped after the transaction was aborted
+ABORTED_RESPONSE = {
+    "status": 424,
+    "headers": {},
+    "body": {"detail": "Not run: an earlier sub-request failed and aborted the batch transaction"},
+}
+
+
+class SharedSession(AsyncSession):
+    """AsyncSession whose database calls are serialized, so concurrent sub-requests can share it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = asyncio.Lock()
+        self.aborted: Optional[DBAPIError] = None
+
+    @asynccontextmanager
+    async def _serialized(self):
+        # After a database error Postgres rejects every statement until rollback
+        # (InFailedSQLTransaction), so fail fast instead of sending them
+        async with self._lock:
+            if self.aborted is not None:
+                raise BatchAborted() from self.aborted
+            try:
+                yield
+            except DBAPIError as exc:
+                self.aborted = exc
+                raise
+
+    async def execute(self, *args, **kwargs):
+        async with self._serialized():
+            return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        async with self._serialized():
+            return await super().scalar(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        async with self._serialized():
+            return await super().get(*args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        async with self._serialized():
+            return await super().refresh(*args, **kwargs)
+
+    async def connection(self, *args, **kwargs):
+        async with self._serialized():
+            return await super().connection(*args, **kwargs)
+
+    async def flush(self, *args, **kwargs):
+        async with self._serialized():
+            return await super().flush(*args, **kwargs)
+
+    async def commit(self):
+        async with self._serialized():
+            return await super().commit()
+
+    async def rollback(self):
+        async with self._lock:
+            return await super().rollback()
+
+
+def normalize_path(path: str) -> str:
+    """Sub-request paths may be given with or without the /api prefix."""
+    if not path.startswith("/"):
+        path = "/" + path
+    if path != API_PREFIX and not path.startswith(API_PREFIX + "/"):
+        path = API_PREFIX + path
+    return path
+
+
+def _exception_layer(app):
+    """The router behind the app's exception handlers and query counting (as in its middleware stack)."""
+    handlers = {
+        key: handler for key, handler in app.exception_handlers.items()
+        if key not in (500, Exception)
+    }
+    return QueryBudgetMiddleware(ExceptionMiddleware(app.router, handlers=handlers, debug=app.debug))
+
+
+def _decode_body(content_type: str, body: bytes) -> Any:
+    if not body:
+        return None
+    if content_type.startswith("application/json"):
+        return orjson.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def dispatch(app, parent: Request, path: str, headers: Dict[str, str]) -> Dict[str, Any]:
+    """Run one GET sub-request against `app` in-process and collect its response."""
+    path = normalize_path(path)
+    path, _, query = path.partition("?")
+    raw_headers = [(k, v) for k, v in parent.scope["headers"] if k not in DROPPED_HEADERS]
+    for name, value in headers.items():
+        key = name.lower().encode("latin-1")
+        raw_headers = [(k, v) for k, v in raw_headers if k != key]
+        raw_headers.append((key, value.encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": parent.scope.get("asgi", {"version": "3.0"}),
+        "http_version": parent.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": parent.scope.get("scheme", "http"),
+        "server": parent.scope.get("server"),
+        "client": parent.scope.get("client"),
+        "root_path": parent.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("latin-1"),
+        "headers": raw_headers,
+        "app": parent.scope.get("app"),
+        "state": dict(parent.scope.get("state") or {}),
+    }
+
+    finished = asyncio.Event()
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    status_code = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            for key, value in message.get("headers", []):
+                name = key.decode("latin-1")
+                if name != "content-length":
+                    response_headers[name] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except StarletteHTTPException as exc:
+        # Raised outside any route (e.g. unknown path)
+        return {"status": exc.status_code, "headers": dict(exc.headers or {}), "body": {"detail": exc.detail}}
+    except BatchAborted:
+        return dict(ABORTED_RESPONSE)
+    except Exception as exc:
+        print(f"Warning: batch sub-request GET {path} failed: {exc!r}")
+        return {"status": 500, "headers": {}, "body": {"detail": "Internal Server Error"}}
+    finally:
+        finished.set()
+
+    body = b"".join(chunks)
+    return {
+        "status": status_code,
+        "headers": response_headers,
+        "body": _decode_body(response_headers.get("content-type", ""), body),
+    }
+
+
+async def run_batch(parent: Request, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run sub-requests ({"id", "path", "headers"}) on one shared read-only session.
+
+    Once a database error has aborted the transaction, the remaining
+    sub-requests get 424 (see the module docstring).
+
+    Returns:
+        One response per item, in the same order
+    """
+    app = _exception_layer(parent.app)
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    session = await open_read_session(parent, SharedSession)
+    token = shared_session.set(session)
+    try:
+        # First statement of the transaction: one snapshot for the whole batch, no writes
+        await session.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"))
+
+        async def run(item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                if session.aborted is not None:
+                    response = dict(ABORTED_RESPONSE)
+                else:
+                    response = await dispatch(app, parent, item["path"], item.get("headers") or {})
+            return {"id": item.get("id"), "path": item["path"], **response}
+
+        return await asyncio.gather(*(run(item) for item in items))
+    finally:
+        shared_session.reset(token)
+        await session.close()
@@ -0,0 +1,202 @@
+"""
+Transactional outbox.
+
+Side effects of a domain change are recorded as outbox events with
+`enqueue`, in the same transaction as the change itself, so they are
+committed (or rolled back) together with it and never lost. The outbox
+consumer, an asyncio task started from the application lifespan, drains
+pending events in the background:
+
+- a batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED, so every
+  worker process can run a consumer without two of them taking the same
+  event;
+- each event is dispatched to the handlers registered for its type
+  inside a savepoint of the claiming transaction, so a handler's own
+  writes commit together with the event being marked done;
+- a failing event is retried with exponential backoff and marked failed
+  after OUTBOX_MAX_ATTEMPTS attempts.
+
+Handlers are registered with the `outbox_handler` decorator:
+
+    @outbox_handler("request.stage_changed")
+    async def scrap_equipment(db: AsyncSession, payload: dict) -> None:
+        ...
+
+Writes inside a handler are exactly-once; anything outside the database
+(e.g. sending a notification) is at-least-once and should be idempotent.
+"""
+import asyncio
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import OutboxEvent
+from app.db.session import AsyncBackgroundSessionLocal
+
+OutboxHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[None]]
+
+# Retry delays double per attempt up to this cap
+MAX_RETRY_DELAY_SECONDS = 300
+
+_handlers: Dict[str, List[OutboxHandler]] = {}
+
+
+def outbox_handler(event_type: str):
+    """Decorator: register an async handler for an event type."""
+    def register(func: OutboxHandler) -> OutboxHandler:
+        _handlers.setdefault(event_type, []).append(func)
+        return func
+    return register
+
+
+def enqueue(db: AsyncSession, event_type: str, payload: Dict[str, Any]) -> OutboxEvent:
+    """
+    Record an event in the caller's transaction; the caller commits.
+
+    The payload is stored as JSON (UUIDs and datetimes become strings).
+    Call `outbox_consumer.wake()` after the commit to deliver it without
+    waiting for the next poll.
+    """
+    event = OutboxEvent(event_type=event_type, payload=jsonable_encoder(payload))
+    db.add(event)
+    return event
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt after `attempts` failed ones."""
+    return min(settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+
+class OutboxConsumer:
+    """Claims pending outbox events and dispatches them to their handlers."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._loop(), name="outbox-consumer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def wake(self) -> None:
+        """Drain now instead of at the next poll (after committing new events)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def drain_once(self, batch_size: Optional[int] = None) -> int:
+        """
+        Claim and dispatch one batch of due events.
+
+        Returns:
+            Number of events claimed
+        """
+        batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        async with AsyncBackgroundSessionLocal() as db:
+            result = await db.execute(
+                select(OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.payload, OutboxEvent.attempts)
+                .where(OutboxEvent.status == "pending", OutboxEvent.available_at <= func.now())
+                .order_by(OutboxEvent.available_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            events = result.all()
+            try:
+                for event in events:
+                    await self._dispatch(db, event)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        return len(events)
+
+    async def _dispatch(self, db: AsyncSession, event) -> None:
+        attempts = event.attempts + 1
+        try:
+            handlers = _handlers.get(event.event_type)
+            if not handlers:
+                raise LookupError(f"no outbox handler registered for '{event.event_type}'")
+            async with db.begin_nested():
+                for handler in handlers:
+                    await handler(db, event.payload)
+        except Exception as exc:
+            self.last_error = f"{event.event_type} {event.id}: {exc!r}"
+            values = {"attempts": attempts, "last_error": repr(exc)}
+            if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                values["status"] = "failed"
+                self.failed += 1
+                print(f"Warning: outbox event {event.event_type} {event.id} failed after {attempts} attempts: {exc!r}")
+            else:
+                values["available_at"] = func.now() + timedelta(seconds=retry_delay(attempts))
+                self.retried += 1
+        else:
+            values = {"attempts": attempts, "status": "done", "processed_at": func.now(), "last_error": None}
+            self.processed += 1
+        await db.execute(update(OutboxEvent).where(OutboxEvent.id == event.id).values(**values))
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                claimed = 0
+                self.last_error = repr(exc)
+                print(f"Warning: outbox consumer failed: {exc!r}")
+            if claimed >= settings.OUTBOX_BATCH_SIZE:
+                continue  # Backlog: keep draining
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.OUTBOX_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def stats(self, db: AsyncSession) -> Dict[str, object]:
+        result = await db.execute(
+            select(OutboxEvent.status, func.count(), func.min(OutboxEvent.created_at))
+            .group_by(OutboxEvent.status)
+        )
+        by_status = {status: {"count": count, "oldest": oldest} for status, count, oldest in result.all()}
+        return {
+            "running": self.running,
+            "handlers": {event_type: [h.__name__ for h in funcs] for event_type, funcs in sorted(_handlers.items())},
+            "events": by_status,
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "last_error": self.last_error,
+        }
+
+
+# Process-wide consumer used by the application lifespan
+outbox_consumer = OutboxConsumer()
+
+
+async def outbox_prune_job(db: AsyncSession) -> None:
+    """Scheduled job: delete delivered events past the retention period."""
+    await db.execute(
+        delete(OutboxEvent).where(
+            OutboxEvent.status == "done",
+            OutboxEvent.processed_at < func.now() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS),
+        )
+    )
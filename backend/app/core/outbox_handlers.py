@@ -0,0 +1,47 @@
+"""
+Outbox handlers for maintenance request side effects.
+
+Imported by the background wiring so the handlers are registered before
+the outbox consumer starts.
+"""
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Equipment, EquipmentScrapLog
+from .outbox import outbox_handler
+
+REQUEST_STAGE_CHANGED = "request.stage_changed"
+REQUEST_SLA_BREACHED = "request.sla_breached"
+
+
+@outbox_handler(REQUEST_STAGE_CHANGED)
+async def scrap_equipment(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    """A request moved to scrap: mark its equipment scrapped and log it."""
+    if payload["to_status"] != "scrap" or not payload.get("equipment_id"):
+        return
+    scrapped = await db.execute(
+        update(Equipment)
+        .where(Equipment.id == UUID(payload["equipment_id"]), Equipment.status != "scrapped")
+        .values(status="scrapped", version=Equipment.version + 1)
+        .returning(Equipment.id)
+    )
+    if scrapped.scalar_one_or_none():
+        db.add(EquipmentScrapLog(
+            equipment_id=UUID(payload["equipment_id"]),
+            request_id=UUID(payload["request_id"]),
+            scrapped_by=UUID(payload["changed_by"]) if payload.get("changed_by") else None,
+            reason=f"Scrapped via maintenance request: {payload['subject']}"
+        ))
+        await db.flush()
+
+
+@outbox_handler(REQUEST_SLA_BREACHED)
+async def log_sla_breach(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    """An SLA deadline passed unmet; notifications hook in here."""
+    print(
+        f"⏰ SLA {payload['kind']} breach: {payload.get('reference') or payload['request_id']} "
+        f"(priority {payload.get('priority')}, due {payload.get('due_at')})"
+    )
@@ -0,0 +1,103 @@
+"""
+Per-request query counting and query budgets.
+
+QueryBudgetMiddleware counts the SQL statements each HTTP request executes
+and the time they take, aggregates both per route, and logs requests over
+QUERY_BUDGET_PER_REQUEST statements, which is how N+1 patterns show up. In
+debug mode (or with QUERY_STATS_HEADERS) the numbers are also returned as
+response headers, which the tests use to enforce per-endpoint budgets
+(see the `query_budget` fixture in tests/conftest.py).
+"""
+import threading
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.db.metrics import track_queries
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+
+class RouteQueryStats:
+    """Query counts and DB time aggregated per route template."""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, queries: int, db_ms: float, over_budget: bool) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {
+                    "requests": 0, "queries": 0, "max_queries": 0,
+                    "db_ms": 0.0, "max_db_ms": 0.0, "over_budget": 0,
+                }
+            stats["requests"] += 1
+            stats["queries"] += queries
+            stats["max_queries"] = max(stats["max_queries"], queries)
+            stats["db_ms"] += db_ms
+            stats["max_db_ms"] = max(stats["max_db_ms"], db_ms)
+            stats["over_budget"] += int(over_budget)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                route: {
+                    "requests": stats["requests"],
+                    "avg_queries": round(stats["queries"] / stats["requests"], 2),
+                    "max_queries": stats["max_queries"],
+                    "avg_db_ms": round(stats["db_ms"] / stats["requests"], 3),
+                    "max_db_ms": round(stats["max_db_ms"], 3),
+                    "over_budget": stats["over_budget"],
+                }
+                for route, stats in sorted(self._routes.items())
+            }
+
+
+route_query_stats = RouteQueryStats()
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope['method']} {path}"
+
+
+class QueryBudgetMiddleware:
+    """Counts queries and DB time per request (pure ASGI, streaming-safe)."""
+
+    def __init__(self, app, budget: Optional[int] = None, expose_headers: Optional[bool] = None):
+        self.app = app
+        self.budget = budget if budget is not None else settings.QUERY_BUDGET_PER_REQUEST
+        if expose_headers is None:
+            expose_headers = settings.DEBUG or settings.QUERY_STATS_HEADERS
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as counter:
+            async def send_with_headers(message):
+                # Headers report the queries made before the response started
+                if self.expose_headers and message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (QUERY_COUNT_HEADER.lower().encode(), str(counter.count).encode()),
+                        (QUERY_TIME_HEADER.lower().encode(), f"{counter.db_ms:.1f}".encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                route = _route_name(scope)
+                over_budget = self.budget > 0 and counter.count > self.budget
+                route_query_stats.record(route, counter.count, counter.db_ms, over_budget)
+                if over_budget:
+                    print(
+                        f"Warning: {route} ran {counter.count} queries "
+                        f"({counter.db_ms:.1f} ms), over the budget of {self.budget}"
+                    )
+
@@ -0,0 +1,213 @@
+"""
+Sliding-window rate limiting for login attempts.
+
+Attempts are limited per email and per client IP. The check runs before
+any database lookup or password hashing, so a credential flood costs a
+dict lookup (or one Redis round trip) per rejected attempt. Every attempt
+counts against the email limit; only failed logins (and registrations)
+count against the IP limit, so many users behind one NAT or proxy can
+still sign in.
+
+Two backends:
+- InMemoryRateLimitBackend: per process, the default.
+- RedisRateLimitBackend: shared across workers and instances. Takes any
+  redis.asyncio-compatible client, so a local stand-in such as
+  fakeredis.aioredis.FakeRedis can be used in development and tests.
+"""
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Optional dependency
+    redis_asyncio = None
+
+
+class InMemoryRateLimitBackend:
+    """Sliding window log kept in process memory, bounded by key count (LRU)."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> Tuple[bool, float]:
+        """
+        Record an attempt if under the limit.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        now = time.monotonic()
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        else:
+            self._hits.move_to_end(key)
+
+        cutoff = now - window_seconds
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+        if len(hits) >= limit:
+            return False, hits[0] + window_seconds - now
+        hits.append(now)
+        return True, 0.0
+
+    async def peek(self, key: str, limit: int, window_seconds: float) -> Tuple[bool, float]:
+        """Like `hit`, without recording an attempt."""
+        hits = self._hits.get(key)
+        if not hits:
+            return True, 0.0
+        now = time.monotonic()
+        cutoff = now - window_seconds
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+        if len(hits) >= limit:
+            return False, hits[0] + window_seconds - now
+        return True, 0.0
+
+
+class RedisRateLimitBackend:
+    """Sliding window log in a Redis sorted set per key."""
+
+    def __init__(self, client, prefix: str = "gearguard:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> Tuple[bool, float]:
+        redis_key = self.prefix + key
+        now = time.time()
+        member = f"{now}:{uuid.uuid4().hex}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(redis_key, 0, now - window_seconds)
+            pipe.zadd(redis_key, {member: now})
+            pipe.zcard(redis_key)
+            pipe.zrange(redis_key, 0, 0, withscores=True)
+            pipe.expire(redis_key, int(window_seconds) + 1)
+            _, _, count, oldest, _ = await pipe.execute()
+        if count > limit:
+            # Over the limit: take this attempt back out of the window
+            await self.client.zrem(redis_key, member)
+            oldest_score = oldest[0][1] if oldest else now
+            return False, max(0.0, oldest_score + window_seconds - now)
+        return True, 0.0
+
+    async def peek(self, key: str, limit: int, window_seconds: float) -> Tuple[bool, float]:
+        """Like `hit`, without recording an attempt."""
+        redis_key = self.prefix + key
+        now = time.time()
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(redis_key, 0, now - window_seconds)
+            pipe.zcard(redis_key)
+            pipe.zrange(redis_key, 0, 0, withscores=True)
+            _, count, oldest = await pipe.execute()
+        if count >= limit:
+            oldest_score = oldest[0][1] if oldest else now
+            return False, max(0.0, oldest_score + window_seconds - now)
+        return True, 0.0
+
+
+class LoginThrottle:
+    """Per-email and per-IP sliding-window limits for authentication attempts."""
+
+    def __init__(
+        self,
+        backend,
+        email_limit: int,
+        ip_limit: int,
+        window_seconds: float,
+    ):
+        self.backend = backend
+        self.email_limit = email_limit
+        self.ip_limit = ip_limit
+        self.window_seconds = window_seconds
+        self.allowed = 0
+        self.failed = 0
+        self.rejected_email = 0
+        self.rejected_ip = 0
+        self.backend_errors = 0
+
+    async def check(self, email: str, client_ip: Optional[str], count_ip: bool = False) -> Optional[float]:
+        """
+        Check both limits and count the attempt against the email limit.
+
+        The IP limit is only checked, unless `count_ip` is set; failed
+        attempts are counted against it with `record_failure`.
+
+        Returns:
+            None if allowed, otherwise seconds until the client may retry.
+            Backend failures fail open (the attempt is allowed).
+        """
+        try:
+            if client_ip:
+                check_ip = self.backend.hit if count_ip else self.backend.peek
+                ok, retry_after = await check_ip(f"ip:{client_ip}", self.ip_limit, self.window_seconds)
+                if not ok:
+                    self.rejected_ip += 1
+                    return retry_after
+            ok, retry_after = await self.backend.hit(
+                f"email:{email.strip().lower()}", self.email_limit, self.window_seconds
+            )
+            if not ok:
+                self.rejected_email += 1
+                return retry_after
+        except Exception as exc:
+            self.backend_errors += 1
+            print(f"Warning: login rate limiter backend failed: {exc!r}")
+        self.allowed += 1
+        return None
+
+    async def record_failure(self, client_ip: Optional[str]) -> None:
+        """Count a failed attempt against the client IP's limit."""
+        if not client_ip:
+            return
+        self.failed += 1
+        try:
+            await self.backend.hit(f"ip:{client_ip}", self.ip_limit, self.window_seconds)
+        except Exception as exc:
+            self.backend_errors += 1
+            print(f"Warning: login rate limiter backend failed: {exc!r}")
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "backend": type(self.backend).__name__,
+            "window_seconds": self.window_seconds,
+            "email_limit": self.email_limit,
+            "ip_limit": self.ip_limit,
+            "allowed": self.allowed,
+            "failed": self.failed,
+            "rejected_email": self.rejected_email,
+            "rejected_ip": self.rejected_ip,
+            "backend_errors": self.backend_errors,
+        }
+
+
+def _build_backend():
+    if settings.RATE_LIMIT_REDIS_URL:
+        if redis_asyncio is None:
+            print("Warning: RATE_LIMIT_REDIS_URL is set but redis is not installed; using in-memory rate limiting")
+        else:
+            return RedisRateLimitBackend(redis_asyncio.from_url(settings.RATE_LIMIT_REDIS_URL))
+    return InMemoryRateLimitBackend()
+
+
+login_throttle = LoginThrottle(
+    backend=_build_backend(),
+    email_limit=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    ip_limit=settings.LOGIN_RATE_LIMIT_PER_IP,
+    window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
+
+
+def get_client_ip(request) -> Optional[str]:
+    """Client IP of a request, honouring X-Forwarded-For only if configured."""
+    if settings.TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
@@ -0,0 +1,34 @@
+"""Reference number generation for maintenance requests."""
+
+import uuid
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.maintenance_request import reference_sequence
+
+
+def generate_reference() -> str:
+    """Generate a unique reference number (format: MR/YYYY/XXXXX)."""
+    year = datetime.now().year
+    unique_id = str(uuid.uuid4().int)[:5]
+    return f"MR/{year}/{unique_id}"
+
+
+async def allocate_references(db: AsyncSession, count: int) -> List[str]:
+    """
+    Pre-allocate `count` reference numbers for a bulk insert (format: MR/YYYY/PNNNNNN).
+
+    The numbers come from a sequence in one round trip, so unlike
+    `generate_reference` they cannot collide however many are taken at
+    once. Numbers of rows that end up not being inserted are skipped.
+    """
+    if count <= 0:
+        return []
+    year = datetime.now().year
+    result = await db.execute(
+        select(reference_sequence.next_value()).select_from(func.generate_series(1, count))
+    )
+    return [f"MR/{year}/P{number:06d}" for number in result.scalars()]
@@ -0,0 +1,38 @@
+"""
+Default JSON response class.
+
+ORJSONResponse renders with orjson, which serializes UUID, datetime,
+date and dataclasses natively and is several times faster than the
+stdlib encoder used by FastAPI's JSONResponse. Decimal (Numeric columns)
+is written as a JSON number, as jsonable_encoder does. Both entry points
+set it as the app's default_response_class.
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not serialize by itself."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes the way responses are rendered."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,191 @@
+"""
+Server-side token revocation.
+
+Revoked tokens are stored in the revoked_tokens table and mirrored in an
+in-process revocation list, so checking a token is a dict lookup and needs
+no query. The list is loaded at startup and kept in sync across workers by
+a scheduled job that reads entries added since the last sync. Two kinds of
+entries exist:
+
+- token: one token by jti (logout).
+- user: every token of a user issued up to a point in time (deactivation).
+
+Entries are dropped from memory and from the table once the tokens they
+cover have expired.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import RevokedToken
+from .config import settings
+from .tokens import TokenClaims
+
+# Re-read this much history on every sync, so entries committed slightly
+# out of revoked_at order (or by a host with a skewed clock) are not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def _utcnow() -> datetime:
+    # Table timestamps are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def user_key(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+class RevocationList:
+    """In-memory mirror of the revoked_tokens table."""
+
+    def __init__(self):
+        # jti -> expires_at
+        self._tokens: Dict[str, datetime] = {}
+        # user id -> (not_before, expires_at)
+        self._users: Dict[UUID, Tuple[datetime, datetime]] = {}
+        self._synced_until: Optional[datetime] = None
+        self.checks = 0
+        self.rejected = 0
+        self.ready = False
+
+    def is_revoked(self, claims: TokenClaims) -> bool:
+        self.checks += 1
+        revoked = claims.jti in self._tokens
+        if not revoked:
+            entry = self._users.get(claims.user_id)
+            # iat has whole-second precision: compare in seconds, so a token
+            # issued in the same second as the revocation counts as revoked
+            revoked = entry is not None and _naive(claims.issued_at) <= entry[0].replace(microsecond=0)
+        if revoked:
+            self.rejected += 1
+        return revoked
+
+    def apply(self, entry: RevokedToken) -> None:
+        """Add a committed entry."""
+        if entry.not_before is not None:
+            current = self._users.get(entry.user_id)
+            if current is None or entry.not_before >= current[0]:
+                self._users[entry.user_id] = (entry.not_before, entry.expires_at)
+        else:
+            self._tokens[entry.key] = entry.expires_at
+        if self._synced_until is None or entry.revoked_at > self._synced_until:
+            self._synced_until = entry.revoked_at
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Drop entries whose tokens have expired. Returns the number dropped."""
+        now = now or _utcnow()
+        expired_tokens = [jti for jti, expires_at in self._tokens.items() if expires_at <= now]
+        for jti in expired_tokens:
+            del self._tokens[jti]
+        expired_users = [user_id for user_id, (_, expires_at) in self._users.items() if expires_at <= now]
+        for user_id in expired_users:
+            del self._users[user_id]
+        return len(expired_tokens) + len(expired_users)
+
+    async def load(self, db: AsyncSession) -> None:
+        """Replace the list with all unexpired entries from the database."""
+        self._tokens = {}
+        self._users = {}
+        self._synced_until = None
+        result = await db.execute(select(RevokedToken).where(RevokedToken.expires_at > _utcnow()))
+        for entry in result.scalars().all():
+            self.apply(entry)
+        self.ready = True
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Pick up entries added by other workers since the last sync, then prune."""
+        if not self.ready:
+            await self.load(db)
+            return
+        query = select(RevokedToken).where(RevokedToken.expires_at > _utcnow())
+        if self._synced_until is not None:
+            query = query.where(RevokedToken.revoked_at > self._synced_until - SYNC_OVERLAP)
+        result = await db.execute(query)
+        for entry in result.scalars().all():
+            self.apply(entry)
+        self.prune()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "tokens": len(self._tokens),
+            "users": len(self._users),
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "synced_until": self._synced_until.isoformat() if self._synced_until else None,
+            "ready": self.ready,
+        }
+
+
+# Process-wide revocation list checked by the auth dependencies
+revocation_list = RevocationList()
+
+
+async def _upsert(db: AsyncSession, values: dict) -> RevokedToken:
+    stmt = pg_insert(RevokedToken).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RevokedToken.key],
+        set_={
+            "not_before": stmt.excluded.not_before,
+            "expires_at": stmt.excluded.expires_at,
+            "revoked_at": stmt.excluded.revoked_at,
+        },
+    )
+    await db.execute(stmt)
+    return RevokedToken(**values)
+
+
+async def revoke_tokens(db: AsyncSession, claims: Iterable[TokenClaims]) -> List[RevokedToken]:
+    """
+    Revoke individual tokens in the current transaction.
+
+    Call `revocation_list.apply` with the result after commit.
+    """
+    entries = []
+    for token in claims:
+        if not token.jti:
+            continue
+        entries.append(await _upsert(db, {
+            "key": token.jti,
+            "user_id": token.user_id,
+            "not_before": None,
+            "expires_at": _naive(token.expires_at),
+            "revoked_at": _utcnow(),
+        }))
+    return entries
+
+
+async def revoke_user_tokens(db: AsyncSession, user_id: UUID) -> RevokedToken:
+    """
+    Revoke every token issued to a user so far, in the current transaction.
+
+    Call `revocation_list.apply` with the result after commit.
+    """
+    now = _utcnow()
+    # JWT iat is whole seconds; tokens issued within this second are revoked too
+    not_before = now.replace(microsecond=0)
+    return await _upsert(db, {
+        "key": user_key(user_id),
+        "user_id": user_id,
+        "not_before": not_before,
+        # Long enough to outlive any token issued before now
+        "expires_at": now + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+        "revoked_at": now,
+    })
+
+
+async def revocation_sync_job(db: AsyncSession) -> None:
+    """Scheduled job: pull revocations made by other workers."""
+    await revocation_list.sync(db)
+
+
+async def revocation_prune_job(db: AsyncSession) -> None:
+    """Scheduled job: delete revocations whose tokens have all expired."""
+    await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= _utcnow()))
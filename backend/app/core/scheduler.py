@@ -0,0 +1,131 @@
+"""
+Periodic background job scheduler.
+
+Jobs run as asyncio tasks inside the API process. Exclusive jobs (the
+default) take a Postgres transaction-scoped advisory lock keyed by the job
+name on every run, so when several workers (or several instances) run the
+scheduler only one of them executes the job at a time; the others skip
+that tick. Non-exclusive jobs run in every worker, e.g. to refresh
+per-process state.
+"""
+import asyncio
+import zlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncBackgroundSessionLocal
+
+
+JobFunc = Callable[[AsyncSession], Awaitable[None]]
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable 32-bit lock key for a job name (fits Postgres bigint)."""
+    return zlib.crc32(name.encode("utf-8"))
+
+
+async def try_advisory_xact_lock(db: AsyncSession, name: str) -> bool:
+    """
+    Try to take a transaction-scoped advisory lock.
+
+    The lock is released automatically on commit or rollback.
+
+    Returns:
+        True if this session now holds the lock, False if another holds it
+    """
+    return bool(await db.scalar(select(func.pg_try_advisory_xact_lock(advisory_lock_key(name)))))
+
+
+@dataclass
+class PeriodicJob:
+    """A registered periodic job."""
+    name: str
+    interval_seconds: float
+    func: JobFunc
+    initial_delay_seconds: float = 0
+    exclusive: bool = True
+
+
+class Scheduler:
+    """Runs registered jobs on a fixed interval until stopped."""
+
+    def __init__(self):
+        self._jobs: Dict[str, PeriodicJob] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def register(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: JobFunc,
+        initial_delay_seconds: float = 0,
+        exclusive: bool = True,
+    ) -> None:
+        """Register a job. Re-registering a name replaces the previous job."""
+        self._jobs[name] = PeriodicJob(
+            name=name,
+            interval_seconds=interval_seconds,
+            func=func,
+            initial_delay_seconds=initial_delay_seconds,
+            exclusive=exclusive,
+        )
+
+    def start(self) -> None:
+        """Start one task per registered job."""
+        if self._tasks:
+            return
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+
+    async def stop(self) -> None:
+        """Cancel all job tasks and wait for them to finish."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_once(self, name: str) -> bool:
+        """
+        Run a job immediately (under its advisory lock if exclusive).
+
+        Returns:
+            True if the job ran, False if another worker held the lock
+        """
+        job = self._jobs[name]
+        async with AsyncBackgroundSessionLocal() as db:
+            if job.exclusive and not await try_advisory_xact_lock(db, job.name):
+                await db.rollback()
+                return False
+            try:
+                await job.func(db)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        return True
+
+    async def _loop(self, job: PeriodicJob) -> None:
+        if job.initial_delay_seconds:
+            await asyncio.sleep(job.initial_delay_seconds)
+        while True:
+            try:
+                await self.run_once(job.name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Warning: scheduled job '{job.name}' failed: {exc!r}")
+            await asyncio.sleep(job.interval_seconds)
+
+    def get_job(self, name: str) -> Optional[PeriodicJob]:
+        return self._jobs.get(name)
+
+
+# Process-wide scheduler used by the application lifespan
+scheduler = Scheduler()
@@ -0,0 +1,260 @@
+"""
+Recurring preventive maintenance.
+
+Maintenance schedules repeat every N days/weeks/months/years from their
+start date. The generator materializes upcoming occurrences into
+preventive maintenance requests in bulk:
+
+- each occurrence is due `lead_days` ahead of time (or within an explicit
+  horizon, e.g. to generate a whole quarter at once);
+- a category schedule yields one request per active equipment of the
+  category, per occurrence;
+- rows are written with multi-row INSERT ... ON CONFLICT DO NOTHING on the
+  unique (schedule, equipment, occurrence) index, with reference numbers
+  pre-allocated from a sequence, so reruns and concurrent runs never
+  create duplicates;
+- each schedule remembers how far it has been generated, so a run only
+  looks at new occurrences. Equipment added to a category later starts
+  with the occurrences after that point.
+"""
+import uuid
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select, insert, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.assignment import RequestLoad, assignment_engine
+from app.core.config import settings
+from app.core.references import allocate_references
+from app.core.warranty import INACTIVE_EQUIPMENT_STATUSES, resolve_system_user
+from app.db.models import Equipment, MaintenanceRequest, MaintenanceSchedule, RequestHistory
+
+RECURRENCES = ("daily", "weekly", "monthly", "yearly")
+
+
+def _add_months(start: date, months: int) -> date:
+    """Same day of month `months` later, clamped to the month's last day."""
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(start.day, monthrange(year, month)[1]))
+
+
+def nth_occurrence(start: date, recurrence: str, interval: int, n: int) -> date:
+    """The n-th occurrence (0-based) of a rule starting on `start`."""
+    if recurrence == "daily":
+        return start + timedelta(days=n * interval)
+    if recurrence == "weekly":
+        return start + timedelta(weeks=n * interval)
+    if recurrence == "monthly":
+        return _add_months(start, n * interval)
+    if recurrence == "yearly":
+        return _add_months(start, 12 * n * interval)
+    raise ValueError(f"Unknown recurrence: {recurrence}")
+
+
+def occurrences_between(
+    start: date,
+    recurrence: str,
+    interval: int,
+    window_start: date,
+    window_end: date,
+) -> List[date]:
+    """Occurrences of a rule within [window_start, window_end]."""
+    if window_end < window_start or window_end < start:
+        return []
+    # Jump close to the window instead of walking from the start date
+    days = max((window_start - start).days, 0)
+    approx_days = {"daily": 1, "weekly": 7, "monthly": 28, "yearly": 365}[recurrence] * interval
+    n = max(days // approx_days - 1, 0)
+    while nth_occurrence(start, recurrence, interval, n) > window_start and n > 0:
+        n -= 1
+
+    dates = []
+    while True:
+        day = nth_occurrence(start, recurrence, interval, n)
+        if day > window_end:
+            return dates
+        if day >= window_start:
+            dates.append(day)
+        n += 1
+
+
+def generation_window(schedule: MaintenanceSchedule, today: date, horizon_days: Optional[int]) -> Optional[tuple]:
+    """Occurrence dates a run should materialize for a schedule, or None."""
+    window_start = max(today, schedule.start_date)
+    if schedule.generated_until is not None:
+        window_start = max(window_start, schedule.generated_until + timedelta(days=1))
+    window_end = today + timedelta(days=horizon_days if horizon_days is not None else schedule.lead_days)
+    if schedule.end_date is not None:
+        window_end = min(window_end, schedule.end_date)
+    if window_end < window_start:
+        return None
+    return window_start, window_end
+
+
+@dataclass
+class ScheduleGeneration:
+    """Outcome of a generator run."""
+    schedules: int = 0
+    occurrences: int = 0  # Requests due, including ones that already existed
+    created: int = 0
+    loads: List[RequestLoad] = field(default_factory=list)  # Of the created requests
+
+
+def _chunks(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _target_equipment(db: AsyncSession, schedules: Sequence[MaintenanceSchedule]) -> Dict[UUID, list]:
+    """Active equipment per schedule, from one query."""
+    equipment_ids = {s.equipment_id for s in schedules if s.equipment_id}
+    categories = {s.category for s in schedules if s.category}
+    result = await db.execute(
+        select(
+            Equipment.id,
+            Equipment.name,
+            Equipment.category,
+            Equipment.maintenance_team_id,
+            Equipment.default_technician_id,
+        ).where(
+            or_(Equipment.id.in_(equipment_ids), Equipment.category.in_(categories)),
+            Equipment.status.notin_(INACTIVE_EQUIPMENT_STATUSES),
+        ).order_by(Equipment.category, Equipment.name)
+    )
+    by_id, by_category = {}, {}
+    for row in result.all():
+        by_id[row.id] = row
+        by_category.setdefault(row.category, []).append(row)
+    return {
+        s.id: ([by_id[s.equipment_id]] if s.equipment_id in by_id else [])
+        if s.equipment_id else by_category.get(s.category, [])
+        for s in schedules
+    }
+
+
+async def generate_scheduled_requests(
+    db: AsyncSession,
+    horizon_days: Optional[int] = None,
+    schedule_id: Optional[UUID] = None,
+    today: Optional[date] = None,
+) -> ScheduleGeneration:
+    """
+    Materialize upcoming schedule occurrences as preventive requests.
+
+    Args:
+        horizon_days: Generate occurrences up to today + horizon_days
+            instead of each schedule's lead time
+        schedule_id: Only this schedule
+
+    Schedules are locked with SKIP LOCKED, so a concurrent run skips the
+    ones being generated. The caller commits and then passes the
+    outcome's loads to `assignment_engine.requests_created`.
+    """
+    today = today or date.today()
+    query = select(MaintenanceSchedule).where(
+        MaintenanceSchedule.is_active == True
+    ).with_for_update(skip_locked=True)
+    if schedule_id is not None:
+        query = query.where(MaintenanceSchedule.id == schedule_id)
+    schedules = list((await db.execute(query)).scalars().all())
+
+    windows = {s.id: generation_window(s, today, horizon_days) for s in schedules}
+    schedules = [s for s in schedules if windows[s.id] is not None]
+    outcome = ScheduleGeneration(schedules=len(schedules))
+    if not schedules:
+        return outcome
+
+    system_user = None
+    if any(s.created_by is None for s in schedules):
+        system_user = await resolve_system_user(db)
+        if system_user is None:
+            print("Warning: no active admin user; skipping schedules without a creator")
+
+    targets = await _target_equipment(db, schedules)
+
+    def rows() -> Iterator[dict]:
+        for schedule in schedules:
+            created_by = schedule.created_by or system_user
+            if created_by is None:
+                continue
+            for occurrence in occurrences_between(
+                schedule.start_date, schedule.recurrence, schedule.recurrence_interval, *windows[schedule.id]
+            ):
+                for equipment in targets[schedule.id]:
+                    yield {
+                        "id": uuid.uuid4(),
+                        "subject": f"{schedule.name}: {equipment.name}",
+                        "instructions": schedule.instructions,
+                        "request_type": "preventive",
+                        "maintenance_for": "equipment",
+                        "status": "new",
+                        "priority": schedule.priority or 2,
+                        "equipment_id": equipment.id,
+                        "category": equipment.category,
+                        "maintenance_team_id": schedule.maintenance_team_id or equipment.maintenance_team_id,
+                        "assigned_to": equipment.default_technician_id,
+                        "created_by": created_by,
+                        "scheduled_date": datetime.combine(occurrence, time.min),
+                        "schedule_id": schedule.id,
+                        "occurrence_date": occurrence,
+                    }
+
+    insert_stmt = pg_insert(MaintenanceRequest).on_conflict_do_nothing(
+        index_elements=["schedule_id", "equipment_id", "occurrence_date"]
+    ).returning(
+        MaintenanceRequest.id,
+        MaintenanceRequest.created_by,
+        MaintenanceRequest.assigned_to,
+        MaintenanceRequest.priority,
+        MaintenanceRequest.status,
+    )
+
+    for chunk in _chunks(rows(), settings.SCHEDULE_INSERT_BATCH_SIZE):
+        references = await allocate_references(db, len(chunk))
+        for row, reference in zip(chunk, references):
+            row["reference"] = reference
+        inserted = (await db.execute(insert_stmt, chunk)).all()
+        if inserted:
+            await db.execute(insert(RequestHistory), [
+                {
+                    "request_id": row.id,
+                    "from_stage": None,
+                    "to_stage": "new",
+                    "changed_by": row.created_by,
+                    "comment": "Generated from maintenance schedule",
+                }
+                for row in inserted
+            ])
+            outcome.loads.extend(RequestLoad(row.assigned_to, row.priority, row.status) for row in inserted)
+        outcome.occurrences += len(chunk)
+        outcome.created += len(inserted)
+
+    for schedule in schedules:
+        if schedule.created_by or system_user:
+            schedule.generated_until = windows[schedule.id][1]
+    await db.flush()
+    return outcome
+
+
+async def schedule_generation_job(db: AsyncSession) -> None:
+    """Scheduled job: materialize occurrences due within each schedule's lead time."""
+    outcome = await generate_scheduled_requests(db)
+    # Committed here (not by the scheduler) so the load index can be updated
+    await db.commit()
+    assignment_engine.requests_created(outcome.loads)
+    print(
+        f"🗓️  Schedule generation: {outcome.schedules} schedules, "
+        f"{outcome.created} requests created ({outcome.occurrences} occurrences)"
+    )
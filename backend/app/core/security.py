@@ -1,15 +1,23 @@
-"""Security utilities - password hashing and JWT tokens."""
+"""Security utilities - password hashing. Tokens live in app.core.tokens."""
 
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Any
-from jose import jwt, JWTError
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Any, TypeVar
 from passlib.context import CryptContext
 import re
 
 from .config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. min/max pin the cost so needs_update() flags
+# hashes made with any other cost factor.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,6 +30,121 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its hash is outdated.
+    
+    Returns:
+        (valid, new_hash) - new_hash is None unless the stored hash should
+        be replaced (e.g. the configured cost factor changed)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing executor is saturated."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated bounded thread pool.
+    
+    bcrypt releases the GIL, so hashing in threads keeps the event loop free
+    for other requests. At most `max_pending` calls may be running or queued;
+    further calls raise PasswordHasherBusy immediately instead of queueing.
+    
+    A call stays pending until its thread finishes, even if the awaiting
+    request was cancelled meanwhile, since bcrypt cannot be interrupted.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self.completed = 0  # Hashing finished
+        self.failed = 0  # Hashing raised
+        self.cancelled = 0  # Caller stopped waiting (the hash may still have run)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+    
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self.pending += 1
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+            raise
+        # Runs in the worker thread when the call finishes (or on the loop if it never started)
+        future.add_done_callback(self._finished)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            with self._lock:
+                self.cancelled += 1
+            raise
+    
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled():
+                return  # Dropped from the queue; counted as cancelled by the caller
+            if future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+    
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+    
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        return await self.run(verify_and_update_password, plain_password, hashed_password)
+    
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+        }
+    
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
 def validate_password_strength(password: str) -> tuple[bool, str]:
     """
     Validate password meets requirements:
@@ -44,36 +167,3 @@ def validate_password_strength(password: str) -> tuple[bool, str]:
     
     return True, "Password is valid"
 
-
-def create_access_token(
-    subject: str | Any,
-    expires_delta: Optional[timedelta] = None
-) -> str:
-    """Create a JWT access token."""
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.SECRET_KEY, 
-        algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
-
-
-def decode_access_token(token: str) -> Optional[str]:
-    """Decode and verify a JWT token. Returns the subject (user ID) or None."""
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        return payload.get("sub")
-    except JWTError:
-        return None
@@ -0,0 +1,285 @@
+"""
+SLA deadlines and breach detection.
+
+SLA policies give every priority (optionally per team) a response target
+(work started) and a resolution target (repaired or scrapped). Requests
+get their deadlines when they are created or reopened, and when their
+priority, team or schedule changes; the clock starts at creation, or at
+`scheduled_date` for work scheduled in the future.
+
+Breaches are detected by the SLA monitor: every open deadline is a timer
+in an in-memory hierarchical timer wheel (app.core.timer_wheel), so a
+breach fires within a tick of the deadline without ever rescanning the
+requests table. Firing marks the breach with a guarded UPDATE (only the
+first worker to fire wins, and a deadline that moved or was met in the
+meantime is ignored) and queues a `request.sla_breached` outbox event in
+the same commit. Each worker loads the open deadlines at startup and
+picks up changes made by other workers with an incremental sync.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update, or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.outbox import enqueue, outbox_consumer
+from app.core.outbox_handlers import REQUEST_SLA_BREACHED
+from app.core.timer_wheel import HierarchicalTimerWheel, Timer
+from app.db.models import MaintenanceRequest, SlaPolicy
+from app.db.session import AsyncBackgroundSessionLocal
+
+OPEN_STATUSES = ("new", "in_progress")
+
+RESPONSE = "response"
+RESOLUTION = "resolution"
+
+# Re-read this much history on every sync (commits land out of updated_at order)
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# A breach that could not be recorded (e.g. database down) is retried after this
+FIRE_RETRY_SECONDS = 30
+
+
+def clock_start(opened_at: datetime, scheduled_date: Optional[datetime]) -> datetime:
+    """When the SLA clock starts: when opened, or when the work is scheduled if later."""
+    if scheduled_date is not None and scheduled_date > opened_at:
+        return scheduled_date
+    return opened_at
+
+
+async def find_policy(db: AsyncSession, priority: int, team_id: Optional[UUID]) -> Optional[SlaPolicy]:
+    """The team's policy for a priority, else the default policy for it."""
+    result = await db.execute(
+        select(SlaPolicy).where(
+            SlaPolicy.priority == priority,
+            or_(SlaPolicy.maintenance_team_id == team_id, SlaPolicy.maintenance_team_id.is_(None)),
+        ).order_by(SlaPolicy.maintenance_team_id.is_(None)).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def sla_deadlines(
+    db: AsyncSession,
+    priority: Optional[int],
+    team_id: Optional[UUID],
+    start: datetime,
+) -> Dict[str, Optional[datetime]]:
+    """Deadline columns for a request opened at `start` (all None without a policy)."""
+    policy = await find_policy(db, priority or 2, team_id)
+    return {
+        "response_due_at": start + timedelta(minutes=policy.response_minutes) if policy else None,
+        "resolution_due_at": start + timedelta(minutes=policy.resolution_minutes) if policy else None,
+        "response_breached_at": None,
+        "resolution_breached_at": None,
+    }
+
+
+def sla_breached_condition(now: datetime):
+    """Open requests past a deadline they have not met."""
+    return or_(
+        func.coalesce(MaintenanceRequest.resolution_due_at < now, False),
+        and_(
+            MaintenanceRequest.status == "new",
+            func.coalesce(MaintenanceRequest.response_due_at < now, False),
+        ),
+    )
+
+
+def sla_at_risk_condition(now: datetime, window: timedelta):
+    """Open requests not yet breached whose next deadline is within `window`."""
+    return and_(
+        ~sla_breached_condition(now),
+        sla_breached_condition(now + window),
+    )
+
+
+def _epoch(value: datetime) -> float:
+    # Deadlines are naive local time, like datetime.now()
+    return value.timestamp()
+
+
+class SlaMonitor:
+    """Per-process timer wheel of open SLA deadlines."""
+
+    def __init__(self):
+        self._wheel = HierarchicalTimerWheel(time.time(), tick_seconds=settings.SLA_TICK_SECONDS)
+        self._task: Optional[asyncio.Task] = None
+        self.last_sync: Optional[datetime] = None
+        self.fired = 0
+        self.breaches = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def track(
+        self,
+        request_id: UUID,
+        status: str,
+        response_due_at: Optional[datetime],
+        resolution_due_at: Optional[datetime],
+        response_breached_at: Optional[datetime] = None,
+        resolution_breached_at: Optional[datetime] = None,
+    ) -> None:
+        """(Re)schedule or cancel a request's timers for its current state."""
+        if status == "new" and response_due_at and not response_breached_at:
+            self._wheel.schedule((request_id, RESPONSE), _epoch(response_due_at))
+        else:
+            self._wheel.cancel((request_id, RESPONSE))
+        if status in OPEN_STATUSES and resolution_due_at and not resolution_breached_at:
+            self._wheel.schedule((request_id, RESOLUTION), _epoch(resolution_due_at))
+        else:
+            self._wheel.cancel((request_id, RESOLUTION))
+
+    def track_request(self, request: Any) -> None:
+        """`track` from a MaintenanceRequest or a row with the same columns."""
+        self.track(
+            request.id,
+            request.status,
+            request.response_due_at,
+            request.resolution_due_at,
+            request.response_breached_at,
+            request.resolution_breached_at,
+        )
+
+    def forget(self, request_id: UUID) -> None:
+        self._wheel.cancel((request_id, RESPONSE))
+        self._wheel.cancel((request_id, RESOLUTION))
+
+    def _tracked_columns(self):
+        return select(
+            MaintenanceRequest.id,
+            MaintenanceRequest.status,
+            MaintenanceRequest.response_due_at,
+            MaintenanceRequest.resolution_due_at,
+            MaintenanceRequest.response_breached_at,
+            MaintenanceRequest.resolution_breached_at,
+        )
+
+    async def load(self, db: AsyncSession) -> None:
+        """Schedule every open, unbreached deadline."""
+        synced_at = datetime.now()
+        result = await db.execute(
+            self._tracked_columns().where(
+                MaintenanceRequest.status.in_(OPEN_STATUSES),
+                MaintenanceRequest.resolution_due_at.isnot(None),
+                or_(
+                    MaintenanceRequest.response_breached_at.is_(None),
+                    MaintenanceRequest.resolution_breached_at.is_(None),
+                ),
+            )
+        )
+        for row in result.all():
+            self.track_request(row)
+        self.last_sync = synced_at
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Apply changes made since the last sync (e.g. by other workers)."""
+        if self.last_sync is None:
+            await self.load(db)
+            return
+        synced_at = datetime.now()
+        result = await db.execute(
+            self._tracked_columns().where(MaintenanceRequest.updated_at >= self.last_sync - SYNC_OVERLAP)
+        )
+        for row in result.all():
+            self.track_request(row)
+        self.last_sync = synced_at
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="sla-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            for timer in self._wheel.advance(time.time()):
+                try:
+                    await self._fire(timer)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self.last_error = repr(exc)
+                    print(f"Warning: could not record SLA breach {timer.key}: {exc!r}")
+                    if timer.key not in self._wheel:
+                        self._wheel.schedule(timer.key, time.time() + FIRE_RETRY_SECONDS)
+            await asyncio.sleep(settings.SLA_TICK_SECONDS)
+
+    async def _fire(self, timer: Timer) -> None:
+        request_id, kind = timer.key
+        self.fired += 1
+        now = datetime.now()
+        if kind == RESPONSE:
+            due, breached = MaintenanceRequest.response_due_at, MaintenanceRequest.response_breached_at
+            statuses = ("new",)
+        else:
+            due, breached = MaintenanceRequest.resolution_due_at, MaintenanceRequest.resolution_breached_at
+            statuses = OPEN_STATUSES
+
+        async with AsyncBackgroundSessionLocal() as db:
+            # Guarded: the first worker wins; met or moved deadlines do not match
+            result = await db.execute(
+                update(MaintenanceRequest)
+                .where(
+                    MaintenanceRequest.id == request_id,
+                    MaintenanceRequest.status.in_(statuses),
+                    breached.is_(None),
+                    due <= now,
+                )
+                .values({breached: now})
+                .returning(
+                    MaintenanceRequest.reference,
+                    MaintenanceRequest.subject,
+                    MaintenanceRequest.priority,
+                    MaintenanceRequest.maintenance_team_id,
+                    MaintenanceRequest.assigned_to,
+                    due,
+                )
+            )
+            row = result.one_or_none()
+            if row is None:
+                return
+            enqueue(db, REQUEST_SLA_BREACHED, {
+                "request_id": request_id,
+                "kind": kind,
+                "reference": row.reference,
+                "subject": row.subject,
+                "priority": row.priority,
+                "maintenance_team_id": row.maintenance_team_id,
+                "assigned_to": row.assigned_to,
+                "due_at": row[5],
+                "breached_at": now,
+            })
+            await db.commit()
+        self.breaches += 1
+        outbox_consumer.wake()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "running": self.running,
+            "timers": len(self._wheel),
+            "fired": self.fired,
+            "breaches": self.breaches,
+            "last_sync": self.last_sync,
+            "last_error": self.last_error,
+        }
+
+
+# Process-wide monitor used by the application lifespan
+sla_monitor = SlaMonitor()
+
+
+async def sla_sync_job(db: AsyncSession) -> None:
+    """Scheduled job (every worker): pick up deadline changes from other workers."""
+    await sla_monitor.sync(db)
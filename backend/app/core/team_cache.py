@@ -0,0 +1,42 @@
+"""
+Process-wide team-membership cache for team-scoped access control.
+
+Maps user id -> team ids. Entries are dropped when memberships change
+through the teams routes and otherwise expire after a TTL, which also
+bounds staleness for changes made by other worker processes.
+"""
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.tokens import token_versions
+from app.db.models import TeamMember
+
+
+team_membership_cache: TTLCache[List[UUID]] = TTLCache(
+    ttl_seconds=settings.TEAM_CACHE_TTL_SECONDS,
+    max_entries=settings.TEAM_CACHE_MAX_ENTRIES,
+)
+
+
+async def get_user_team_ids(db: AsyncSession, user_id: UUID, token_version: Optional[int] = None) -> List[UUID]:
+    """
+    Get the team ids a user belongs to, from the cache when possible.
+
+    Pass the user's current `token_version` (read from the database) when
+    the result goes into a token: membership changes bump it, so a cached
+    entry is only used if this worker has already seen that version, and
+    changes made through other workers are never missed.
+    """
+    trusted = token_version is None or token_versions.get(user_id) == token_version
+    team_ids = team_membership_cache.get(user_id) if trusted else None
+    if team_ids is None:
+        generation = team_membership_cache.generation
+        result = await db.execute(select(TeamMember.team_id).where(TeamMember.user_id == user_id))
+        team_ids = list(result.scalars().all())
+        team_membership_cache.set(user_id, team_ids, generation)
+    return list(team_ids)
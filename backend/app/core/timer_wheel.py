@@ -0,0 +1,128 @@
+"""
+Hierarchical timer wheel.
+
+Holds a large number of timers keyed by an id, with O(1) schedule and
+cancel, and finds the expired ones by advancing a clock instead of
+scanning all of them. Level 0 has `wheel_size` slots of one tick each;
+every further level has `wheel_size` slots each spanning a full
+rotation of the level below. A timer goes on the lowest level whose span
+covers its remaining time and is cascaded one level down each time its
+slot comes up, until it expires from level 0. Timers beyond the top
+level's span wait in an overflow set and are re-placed once per top
+rotation.
+
+With 1 s ticks, 64 slots and 4 levels a timer can be up to ~194 days away
+before it overflows; expiry is exact to the tick.
+
+Not thread-safe: use it from one thread (the event loop).
+"""
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+@dataclass
+class Timer:
+    """A scheduled timer."""
+    key: Hashable
+    deadline: float  # Epoch seconds
+    payload: Any = None
+    _tick: int = 0
+
+
+# Where a timer currently lives: (level, slot), or one of these markers
+_DUE = (-1, -1)
+_OVERFLOW = (-2, -2)
+
+
+class HierarchicalTimerWheel:
+    """Timers keyed by id, expired by advancing the wheel's clock."""
+
+    def __init__(self, now: float, tick_seconds: float = 1.0, wheel_size: int = 64, levels: int = 4):
+        self.tick_seconds = tick_seconds
+        self.wheel_size = wheel_size
+        self.levels = levels
+        self._current = math.floor(now / tick_seconds)
+        self._wheels: List[List[Dict[Hashable, Timer]]] = [
+            [{} for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        self._due: Dict[Hashable, Timer] = {}
+        self._overflow: Dict[Hashable, Timer] = {}
+        self._locations: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._locations
+
+    def _to_tick(self, at: float) -> int:
+        # Round up so a timer never fires before its deadline
+        return math.ceil(at / self.tick_seconds)
+
+    def _bucket(self, location: Tuple[int, int]) -> Dict[Hashable, Timer]:
+        if location == _DUE:
+            return self._due
+        if location == _OVERFLOW:
+            return self._overflow
+        level, slot = location
+        return self._wheels[level][slot]
+
+    def _place(self, timer: Timer) -> None:
+        delta = timer._tick - self._current
+        location = _OVERFLOW
+        if delta <= 0:
+            location = _DUE
+        else:
+            for level in range(self.levels):
+                if delta < self.wheel_size ** (level + 1):
+                    slot = (timer._tick // self.wheel_size ** level) % self.wheel_size
+                    location = (level, slot)
+                    break
+        self._bucket(location)[timer.key] = timer
+        self._locations[timer.key] = location
+
+    def schedule(self, key: Hashable, deadline: float, payload: Any = None) -> None:
+        """Schedule (or reschedule) the timer for `key` at `deadline` (epoch seconds)."""
+        self.cancel(key)
+        self._place(Timer(key=key, deadline=deadline, payload=payload, _tick=self._to_tick(deadline)))
+
+    def cancel(self, key: Hashable) -> bool:
+        """Remove the timer for `key`; False if there was none."""
+        location = self._locations.pop(key, None)
+        if location is None:
+            return False
+        del self._bucket(location)[key]
+        return True
+
+    def get(self, key: Hashable) -> Optional[Timer]:
+        location = self._locations.get(key)
+        return self._bucket(location).get(key) if location is not None else None
+
+    def _take(self, bucket: Dict[Hashable, Timer]) -> List[Timer]:
+        timers = list(bucket.values())
+        bucket.clear()
+        for timer in timers:
+            del self._locations[timer.key]
+        return timers
+
+    def advance(self, now: float) -> List[Timer]:
+        """Move the clock to `now` and return the timers that expired, in deadline order."""
+        expired = self._take(self._due)
+        target = math.floor(now / self.tick_seconds)
+        while self._current < target:
+            self._current += 1
+            # Cascade every higher-level slot that comes up on this tick
+            for level in range(1, self.levels):
+                width = self.wheel_size ** level
+                if self._current % width:
+                    break
+                for timer in self._take(self._wheels[level][(self._current // width) % self.wheel_size]):
+                    self._place(timer)
+            if self._overflow and self._current % self.wheel_size ** self.levels == 0:
+                for timer in self._take(self._overflow):
+                    self._place(timer)
+            expired.extend(self._take(self._wheels[0][self._current % self.wheel_size]))
+            expired.extend(self._take(self._due))
+        expired.sort(key=lambda timer: timer.deadline)
+        return expired
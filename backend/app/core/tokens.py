@@ -0,0 +1,240 @@
+"""
+JWT access and refresh tokens.
+
+Access tokens are short-lived and self-contained: besides the subject they
+carry the user's role, active flag, team ids and token version, so
+authorization checks can be made from the verified claims without a
+database round trip. Refresh tokens are long-lived, carry only the
+subject, and are exchanged at /auth/refresh for a new access token built
+from the current database state.
+
+Each user has a token version that is bumped whenever the claims it
+carries go stale (team membership, role or active flag changes). Bumps are
+recorded in a process-local registry for one access-token lifetime; access
+tokens minted with an older version are rejected so the client refreshes.
+Other workers pick bumps up from the users table with a scheduled sync, so
+staleness there is bounded by the sync interval.
+"""
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from jose import jwt, JWTError
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import TTLCache
+from .config import settings
+
+if TYPE_CHECKING:
+    from app.db.models import User
+
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    """Verified claims of an access or refresh token."""
+    subject: str
+    token_type: str
+    jti: str
+    issued_at: datetime
+    expires_at: datetime
+    role: Optional[str] = None
+    is_active: bool = True
+    team_ids: Tuple[UUID, ...] = ()
+    token_version: int = 0
+
+    @property
+    def user_id(self) -> Optional[UUID]:
+        try:
+            return UUID(self.subject)
+        except (TypeError, ValueError):
+            return None
+
+    def in_team(self, team_id: UUID) -> bool:
+        return team_id in self.team_ids
+
+
+def _encode(payload: dict, expires_delta: timedelta) -> str:
+    now = datetime.now(timezone.utc)
+    payload.update({
+        "iat": now,
+        "exp": now + expires_delta,
+        "jti": uuid.uuid4().hex,
+    })
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def create_access_token(
+    subject: str | Any,
+    expires_delta: Optional[timedelta] = None,
+    role: Optional[str] = None,
+    is_active: bool = True,
+    team_ids: Iterable[UUID] = (),
+    token_version: int = 0,
+) -> str:
+    """Create a short-lived access token carrying the user's authorization claims."""
+    payload = {
+        "sub": str(subject),
+        "type": ACCESS_TOKEN_TYPE,
+        "active": is_active,
+        "teams": [str(team_id) for team_id in team_ids],
+        "ver": token_version,
+    }
+    if role is not None:
+        payload["role"] = role
+    return _encode(
+        payload,
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+
+
+def create_access_token_for(user: "User", team_ids: Iterable[UUID]) -> str:
+    """Create an access token for a loaded user and their team ids."""
+    return create_access_token(
+        subject=str(user.id),
+        role=user.role,
+        is_active=bool(user.is_active),
+        team_ids=team_ids,
+        token_version=user.token_version or 0,
+    )
+
+
+def create_refresh_token(subject: str | Any, expires_delta: Optional[timedelta] = None) -> str:
+    """Create a long-lived refresh token (subject only)."""
+    return _encode(
+        {"sub": str(subject), "type": REFRESH_TOKEN_TYPE},
+        expires_delta or timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+    )
+
+
+def decode_token(token: str, token_type: str = ACCESS_TOKEN_TYPE) -> Optional[TokenClaims]:
+    """Verify a token of the given type. Returns its claims, or None if invalid or expired."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+
+    # Untyped tokens predate the authorization claims and are refused
+    if payload.get("type") != token_type or not payload.get("sub"):
+        return None
+
+    try:
+        team_ids = tuple(UUID(team_id) for team_id in payload.get("teams", ()))
+    except (TypeError, ValueError):
+        return None
+
+    return TokenClaims(
+        subject=payload["sub"],
+        token_type=token_type,
+        jti=payload.get("jti", ""),
+        issued_at=datetime.fromtimestamp(payload.get("iat", 0), tz=timezone.utc),
+        expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+        role=payload.get("role"),
+        is_active=bool(payload.get("active", False)),  # Missing means not vouched for
+        team_ids=team_ids,
+        token_version=int(payload.get("ver", 0)),
+    )
+
+
+def decode_access_token(token: str) -> Optional[str]:
+    """Decode and verify an access token. Returns the subject (user ID) or None."""
+    claims = decode_token(token)
+    return claims.subject if claims else None
+
+
+# --- Token versions ----------------------------------------------------
+
+# Latest known token version per user, kept for one access-token lifetime
+# (older access tokens have expired by then anyway)
+token_versions: TTLCache[int] = TTLCache(
+    ttl_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+def is_current(claims: TokenClaims) -> bool:
+    """False if the user's token version was bumped after this token was issued."""
+    user_id = claims.user_id
+    latest = token_versions.get(user_id) if user_id else None
+    return latest is None or claims.token_version >= latest
+
+
+def note_token_version(user_id: UUID, version: int) -> None:
+    current = token_versions.get(user_id)
+    if current is None or version > current:
+        token_versions.set(user_id, version)
+
+
+async def bump_token_versions(db: AsyncSession, user_ids: Iterable[UUID]) -> List[Tuple[UUID, int]]:
+    """
+    Increment the token version of the given users in the current transaction.
+
+    Call `note_token_versions` with the result after commit.
+    """
+    # Imported here: app.core is imported by app.db.session, before the models
+    from app.db.models import User
+
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return []
+    result = await db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(token_version=User.token_version + 1)
+        .returning(User.id, User.token_version)
+        .execution_options(synchronize_session=False)
+    )
+    return [(user_id, version) for user_id, version in result.all()]
+
+
+def note_token_versions(bumped: Iterable[Tuple[UUID, int]]) -> None:
+    """Record committed version bumps so older access tokens are rejected here."""
+    for user_id, version in bumped:
+        note_token_version(user_id, version)
+
+
+# Re-read this much history on every sync: updated_at is the bumping
+# transaction's start time, which can precede its commit
+VERSION_SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenVersionSync:
+    """Copies token versions bumped by other workers into `token_versions`."""
+
+    def __init__(self):
+        # Latest users.updated_at seen (database clock, naive)
+        self._synced_until: Optional[datetime] = None
+        self.ready = False
+
+    async def sync(self, db: AsyncSession) -> int:
+        """Note versions of users updated since the last sync. Returns the number of rows read."""
+        from app.db.models import User
+
+        query = select(User.id, User.token_version, User.updated_at).where(User.token_version > 0)
+        if self._synced_until is None:
+            # Bumps older than one access-token lifetime no longer matter
+            horizon = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+            query = query.where(User.updated_at > func.now() - horizon)
+        else:
+            query = query.where(User.updated_at > self._synced_until - VERSION_SYNC_OVERLAP)
+        rows = (await db.execute(query)).all()
+        for user_id, version, updated_at in rows:
+            note_token_version(user_id, version)
+            if updated_at is not None and (self._synced_until is None or updated_at > self._synced_until):
+                self._synced_until = updated_at
+        self.ready = True
+        return len(rows)
+
+
+# Process-wide token version sync, run by the background scheduler
+token_version_sync = TokenVersionSync()
+
+
+async def token_version_sync_job(db: AsyncSession) -> None:
+    """Scheduled job: pull token version bumps made by other workers."""
+    await token_version_sync.sync(db)
@@ -0,0 +1,132 @@
+"""
+Atomic stage transitions for maintenance requests.
+
+A transition is one compare-and-set statement built from the workflow
+table: the row is updated only if its current status is one the workflow
+allows moving from, and the history entry is inserted by the same
+statement (data-modifying CTEs), so there is no read-modify-write window
+for concurrent drags of the same card to race in.
+
+    WITH old AS (SELECT ... WHERE id = :id AND status IN (:allowed) FOR UPDATE),
+         upd AS (UPDATE maintenance_requests ... FROM old ... RETURNING ...),
+         hist AS (INSERT INTO request_history ... SELECT ... FROM upd)
+    SELECT * FROM upd
+
+FOR UPDATE in `old` makes a concurrent transition wait and then re-check
+the status against the committed row, so the recorded from-stage is
+always the status actually replaced.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update, insert, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import MaintenanceRequest, RequestHistory
+from app.core.workflow import get_allowed_sources
+
+
+class TransitionConflict(Exception):
+    """The request is not in a status that allows the transition."""
+
+    def __init__(self, current_status: str, new_status: str):
+        self.current_status = current_status
+        self.new_status = new_status
+        allowed = get_allowed_sources(new_status)
+        super().__init__(
+            f"Cannot transition from '{current_status}' to '{new_status}'. "
+            f"Allowed from: {allowed or 'none'}"
+        )
+
+
+class TransitionNotFound(Exception):
+    """The request does not exist."""
+
+
+@dataclass
+class TransitionResult:
+    """The updated request row and the status it was moved from."""
+    from_status: str
+    row: Dict[str, Any]
+
+
+def build_transition(
+    request_id: UUID,
+    new_status: str,
+    changed_by: Optional[UUID],
+    comment: Optional[str],
+    now: datetime,
+):
+    """Build the compare-and-set statement for one transition."""
+    requests = MaintenanceRequest.__table__
+    allowed_from = get_allowed_sources(new_status)
+
+    old = (
+        select(requests.c.id, requests.c.status)
+        .where(requests.c.id == request_id, requests.c.status.in_(allowed_from))
+        .with_for_update()
+        .cte("old")
+    )
+
+    values = {"status": new_status, "updated_at": func.now(), "version": requests.c.version + 1}
+    if new_status == "in_progress":
+        values["started_at"] = func.coalesce(requests.c.started_at, now)
+    elif new_status in ("repaired", "scrap"):
+        values["completed_at"] = func.coalesce(requests.c.completed_at, now)
+
+    upd = (
+        update(requests)
+        .where(requests.c.id == old.c.id)
+        .values(**values)
+        .returning(*requests.c, old.c.status.label("from_status"))
+        .cte("upd")
+    )
+
+    hist = insert(RequestHistory.__table__).from_select(
+        ["id", "request_id", "from_stage", "to_stage", "changed_by", "comment", "duration_at_change"],
+        select(
+            func.gen_random_uuid(),
+            upd.c.id,
+            upd.c.from_status,
+            upd.c.status,
+            literal(changed_by, RequestHistory.changed_by.type),
+            literal(comment, RequestHistory.comment.type),
+            upd.c.duration_hours,
+        ),
+    ).cte("hist")
+
+    return select(upd).add_cte(hist)
+
+
+async def transition_request(
+    db: AsyncSession,
+    request_id: UUID,
+    new_status: str,
+    changed_by: Optional[UUID] = None,
+    comment: Optional[str] = None,
+) -> TransitionResult:
+    """
+    Move a request to `new_status` if the workflow allows it from its current status.
+
+    Runs in the caller's transaction; the caller commits.
+
+    Raises:
+        TransitionNotFound: the request does not exist
+        TransitionConflict: its current status does not allow the transition
+    """
+    result = await db.execute(build_transition(request_id, new_status, changed_by, comment, datetime.now()))
+    row = result.mappings().one_or_none()
+    if row is not None:
+        row = dict(row)
+        from_status = row.pop("from_status")
+        return TransitionResult(from_status=from_status, row=row)
+
+    # Failure path only: tell a missing request from a conflicting status
+    current_status = await db.scalar(
+        select(MaintenanceRequest.status).where(MaintenanceRequest.id == request_id)
+    )
+    if current_status is None:
+        raise TransitionNotFound()
+    raise TransitionConflict(current_status, new_status)
@@ -0,0 +1,160 @@
+"""
+Warranty expiry tracking for equipment.
+
+Finds equipment whose warranty ends within a horizon (a range scan on the
+warranty_expiry index) and can schedule preventive inspections for it in
+bulk before coverage ends.
+"""
+import uuid
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.assignment import RequestLoad, assignment_engine
+from app.core.config import settings
+from app.core.references import allocate_references
+from app.db.models import Equipment, MaintenanceRequest, RequestHistory, User
+
+# Subject prefix used to recognise inspections created by this module
+WARRANTY_INSPECTION_SUBJECT = "Warranty inspection"
+
+# Equipment in these statuses no longer needs warranty follow-up
+INACTIVE_EQUIPMENT_STATUSES = ("scrapped", "retired")
+
+
+def expiring_equipment_query(within_days: int, today: Optional[date] = None) -> Select:
+    """
+    Select active equipment whose warranty expires in [today, today + within_days].
+
+    Ordered by expiry date so the scan walks the warranty_expiry index.
+    """
+    today = today or date.today()
+    horizon = today + timedelta(days=within_days)
+    return select(Equipment).where(
+        Equipment.warranty_expiry >= today,
+        Equipment.warranty_expiry <= horizon,
+        Equipment.status.notin_(INACTIVE_EQUIPMENT_STATUSES),
+    ).order_by(Equipment.warranty_expiry, Equipment.id)
+
+
+async def find_expiring_equipment(
+    db: AsyncSession,
+    within_days: int,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[Equipment], int]:
+    """Get a page of expiring equipment and the total count."""
+    query = expiring_equipment_query(within_days)
+    total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+    result = await db.execute(query.offset(skip).limit(limit))
+    return list(result.scalars().all()), total or 0
+
+
+async def resolve_system_user(db: AsyncSession) -> Optional[UUID]:
+    """Pick the creator for system-generated requests (oldest active admin)."""
+    return await db.scalar(
+        select(User.id).where(
+            User.role == "admin",
+            User.is_active == True
+        ).order_by(User.created_at).limit(1)
+    )
+
+
+async def create_warranty_inspections(
+    db: AsyncSession,
+    within_days: int,
+    lead_days: int,
+    created_by: Optional[UUID] = None,
+) -> List[RequestLoad]:
+    """
+    Schedule a preventive inspection for every expiring equipment that has none yet.
+
+    Inspections are scheduled `lead_days` before expiry (never in the past).
+    Equipment that already has a warranty inspection scheduled for its
+    current coverage period is skipped, so repeated runs are idempotent.
+    Rows are written with two executemany INSERTs; the caller commits and
+    then passes the result to `assignment_engine.requests_created`.
+
+    Returns:
+        Load of each created request
+    """
+    created_by = created_by or await resolve_system_user(db)
+    if created_by is None:
+        print("Warning: no active admin user; skipping warranty inspection scheduling")
+        return []
+
+    today = date.today()
+    window_days = within_days + lead_days
+    already_scheduled = select(MaintenanceRequest.id).where(
+        MaintenanceRequest.equipment_id == Equipment.id,
+        MaintenanceRequest.request_type == "preventive",
+        MaintenanceRequest.subject.startswith(WARRANTY_INSPECTION_SUBJECT),
+        MaintenanceRequest.scheduled_date >= Equipment.warranty_expiry - window_days,
+    ).exists()
+
+    query = expiring_equipment_query(within_days, today).with_only_columns(
+        Equipment.id,
+        Equipment.name,
+        Equipment.category,
+        Equipment.maintenance_team_id,
+        Equipment.default_technician_id,
+        Equipment.warranty_expiry,
+    ).where(~already_scheduled)
+    rows = (await db.execute(query)).all()
+    if not rows:
+        return []
+
+    references = await allocate_references(db, len(rows))
+    requests = []
+    history = []
+    for row, reference in zip(rows, references):
+        request_id = uuid.uuid4()
+        scheduled_day = max(today, row.warranty_expiry - timedelta(days=lead_days))
+        requests.append({
+            "id": request_id,
+            "reference": reference,
+            "subject": f"{WARRANTY_INSPECTION_SUBJECT}: {row.name}",
+            "description": f"Warranty expires on {row.warranty_expiry.isoformat()}.",
+            "request_type": "preventive",
+            "maintenance_for": "equipment",
+            "status": "new",
+            "priority": 2,
+            "equipment_id": row.id,
+            "category": row.category,
+            "maintenance_team_id": row.maintenance_team_id,
+            "assigned_to": row.default_technician_id,
+            "created_by": created_by,
+            "scheduled_date": datetime.combine(scheduled_day, time.min),
+        })
+        history.append({
+            "request_id": request_id,
+            "from_stage": None,
+            "to_stage": "new",
+            "changed_by": created_by,
+            "comment": "Scheduled before warranty expiry",
+        })
+
+    await db.execute(insert(MaintenanceRequest), requests)
+    await db.execute(insert(RequestHistory), history)
+    return [RequestLoad(row["assigned_to"], row["priority"], row["status"]) for row in requests]
+
+
+async def warranty_scan_job(db: AsyncSession) -> None:
+    """Scheduled job: report expiring equipment and optionally schedule inspections."""
+    horizon = settings.WARRANTY_HORIZON_DAYS
+    expiring = await db.scalar(
+        select(func.count()).select_from(expiring_equipment_query(horizon).order_by(None).subquery())
+    )
+    created = []
+    if settings.WARRANTY_AUTO_CREATE_INSPECTIONS:
+        created = await create_warranty_inspections(
+            db, horizon, settings.WARRANTY_INSPECTION_LEAD_DAYS
+        )
+        # Committed here (not by the scheduler) so the load index can be updated
+        await db.commit()
+        assignment_engine.requests_created(created)
+    print(f"🛡️  Warranty scan: {expiring or 0} expiring within {horizon} days, {len(created)} inspections scheduled")
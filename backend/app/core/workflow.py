@@ -62,6 +62,22 @@ def get_allowed_transitions(current_status: str) -> list:
     return STATUS_TRANSITIONS.get(current_status, [])
 
 
+def get_allowed_sources(new_status: str) -> list:
+    """
+    Get list of statuses from which a request may move to `new_status`.
+    
+    Args:
+        new_status: Desired new status
+    
+    Returns:
+        List of statuses that allow the transition (empty if none)
+    """
+    return [
+        current for current, allowed_next in STATUS_TRANSITIONS.items()
+        if new_status in allowed_next
+    ]
+
+
 def is_terminal_status(status: str) -> bool:
     """Check if a status is terminal (no further transitions allowed)."""
     return len(STATUS_TRANSITIONS.get(status, [])) == 0
@@ -0,0 +1,168 @@
+"""
+Connection-pool metrics, per-request query counting and SQL logging.
+
+TimedQueuePool records how long each checkout waited for a connection in
+a fixed-bucket histogram, which together with checked-out and overflow
+counts shows whether the pool is sized for the worker count.
+
+Cursor-execute events add every statement and its duration to the
+QueryCounter of the current context (see `track_queries`), which is how
+per-request query counts are collected. SQL logging replaces engine echo:
+only slow statements and an optional random sample are printed.
+"""
+import bisect
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Upper bounds of the wait-time histogram buckets, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram (the last bucket is +Inf)."""
+
+    def __init__(self, bounds=WAIT_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, value)] += 1
+            self.total += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)}
+            buckets["le_inf"] = self.counts[-1]
+            return {
+                "count": self.total,
+                "avg": round(self.sum / self.total, 3) if self.total else 0.0,
+                "max": round(self.max, 3),
+                "buckets": buckets,
+            }
+
+
+class PoolMetrics:
+    """Checkout wait times and timeouts for one engine's pool."""
+
+    def __init__(self):
+        self.wait_ms = Histogram()
+        self.timeouts = 0
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times every checkout."""
+
+    metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.wait_ms.observe((time.perf_counter() - start) * 1000)
+
+
+def timed_pool_class() -> type:
+    """A TimedQueuePool subclass with its own metrics, one per engine."""
+    return type("TimedQueuePool", (TimedQueuePool,), {"metrics": PoolMetrics()})
+
+
+def pool_stats(engine) -> Dict[str, object]:
+    """Current pool occupancy plus checkout wait metrics."""
+    pool = engine.sync_engine.pool
+    stats: Dict[str, object] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update({
+            "wait_ms": metrics.wait_ms.snapshot(),
+            "timeouts": metrics.timeouts,
+        })
+    return stats
+
+
+@dataclass
+class QueryCounter:
+    """Statements executed and time spent in the database, in milliseconds."""
+    count: int = 0
+    db_ms: float = 0.0
+    parent: Optional["QueryCounter"] = None  # Enclosing block's counter, which counts these too
+
+    def add(self, elapsed_ms: float) -> None:
+        counter = self
+        while counter is not None:
+            counter.count += 1
+            counter.db_ms += elapsed_ms
+            counter = counter.parent
+
+
+_current_counter: contextvars.ContextVar[Optional[QueryCounter]] = contextvars.ContextVar(
+    "query_counter", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryCounter]:
+    """Count the statements executed within the block (in this context), also into any enclosing block."""
+    counter = QueryCounter(parent=_current_counter.get())
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def install_query_instrumentation(engine, slow_ms: float, sample_rate: float) -> None:
+    """
+    Count statements into the current QueryCounter and print statements
+    slower than `slow_ms`, plus a random `sample_rate` fraction of the rest.
+    Either kind of logging can be disabled with 0.
+    """
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _log_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        counter = _current_counter.get()
+        if counter is not None:
+            counter.add(elapsed_ms)
+        if slow_ms > 0 and elapsed_ms >= slow_ms:
+            print(f"Slow query ({elapsed_ms:.1f} ms): {statement[:1000]}")
+        elif sample_rate > 0 and random.random() < sample_rate:
+            print(f"SQL ({elapsed_ms:.1f} ms): {statement[:1000]}")
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _drop_timer(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
@@ -5,6 +5,11 @@ from app.db.models.equipment import Equipment
 from app.db.models.maintenance_request import MaintenanceRequest
 from app.db.models.request_history import RequestHistory
 from app.db.models.equipment_scrap_log import EquipmentScrapLog
+from app.db.models.revoked_token import RevokedToken
+from app.db.models.outbox_event import OutboxEvent
+from app.db.models.maintenance_schedule import MaintenanceSchedule
+from app.db.models.job import Job, JobFilePart
+from app.db.models.sla_policy import SlaPolicy
 
 __all__ = [
     "User",
@@ -14,4 +19,10 @@ __all__ = [
     "MaintenanceRequest",
     "RequestHistory",
     "EquipmentScrapLog",
+    "RevokedToken",
+    "OutboxEvent",
+    "MaintenanceSchedule",
+    "Job",
+    "JobFilePart",
+    "SlaPolicy",
 ]
@@ -39,7 +39,7 @@ class Equipment(Base):
     # Financial & Warranty
     purchase_date = Column(Date)
     purchase_cost = Column(Numeric(15, 2))
-    warranty_expiry = Column(Date)
+    warranty_expiry = Column(Date, index=True)  # Range-scanned by the warranty expiry job
     warranty_info = Column(Text)
     
     # Health & Status - CRITICAL for Dashboard KPIs
@@ -52,6 +52,9 @@ class Equipment(Base):
     # Metadata
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Optimistic concurrency
+    
+    __mapper_args__ = {"version_id_col": version}
     
     # Relationships
     assigned_employee = relationship("User", foreign_keys=[assigned_employee_id], backref="assigned_equipment")
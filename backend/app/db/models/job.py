@@ -0,0 +1,72 @@
+import uuid
+from sqlalchemy import Column, String, TIMESTAMP, Integer, Text, Boolean, ForeignKey, Index, LargeBinary, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class Job(Base):
+    """
+    Job model - Background job queue.
+    
+    Long-running work (imports, exports, recomputations, reports) is queued
+    here and executed by the job worker pool (app.core.jobs). Workers claim
+    queued jobs with SKIP LOCKED and hold a lease kept alive by heartbeats.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # What to run
+    job_type = Column(String(100), nullable=False, index=True)
+    params = Column(JSONB, nullable=False, default=dict)
+    priority = Column(Integer, nullable=False, default=0, server_default="0")  # Higher runs first
+    
+    # Lifecycle: 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled'
+    status = Column(String(20), nullable=False, default="queued", server_default="queued")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=3, server_default="3")
+    run_after = Column(TIMESTAMP, nullable=False, server_default=func.now())  # Not claimed before this
+    cancel_requested = Column(Boolean, nullable=False, default=False, server_default="false")
+    
+    # Lease held by the running worker
+    locked_by = Column(String(100))
+    heartbeat_at = Column(TIMESTAMP)
+    
+    # Progress and outcome
+    progress = Column(Integer, nullable=False, default=0, server_default="0")  # 0-100
+    progress_message = Column(String(255))
+    result = Column(JSONB)  # Small summary; files produced by the job are in job_file_parts
+    error = Column(Text)
+    
+    # Metadata
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    started_at = Column(TIMESTAMP)
+    finished_at = Column(TIMESTAMP)
+    expires_at = Column(TIMESTAMP, index=True)  # Finished jobs are deleted after this
+    
+    __table_args__ = (
+        # Workers only ever scan queued jobs in claim order
+        Index(
+            "idx_jobs_queued",
+            text("priority DESC"), "run_after",
+            postgresql_where=text("status = 'queued'"),
+        ),
+    )
+
+
+class JobFilePart(Base):
+    """
+    JobFilePart model - A chunk of a file produced by a job (e.g. an export).
+    
+    Files are written page by page and streamed back in `part` order, so
+    neither the worker nor the download holds the whole file in memory and
+    the job row stays small. Parts go with their job when it is pruned.
+    """
+    __tablename__ = "job_file_parts"
+
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    part = Column(Integer, primary_key=True)
+    content = Column(LargeBinary, nullable=False)
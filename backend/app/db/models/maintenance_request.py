@@ -1,13 +1,16 @@
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Date, TIMESTAMP, Numeric, ForeignKey, Integer, Text, Boolean
+from sqlalchemy import Column, String, Date, TIMESTAMP, Numeric, ForeignKey, Integer, Text, Boolean, Index, Sequence
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from app.db.base import Base
 
+# Block-allocated reference numbers for bulk-generated requests (see app.core.references)
+reference_sequence = Sequence("maintenance_request_reference_seq", metadata=Base.metadata)
+
 
 class MaintenanceRequest(Base):
     """
@@ -57,6 +60,16 @@ class MaintenanceRequest(Base):
     completed_at = Column(TIMESTAMP)
     duration_hours = Column(Numeric(10, 2), default=0)  # Hours spent on repair
     
+    # SLA deadlines from the matching SLA policy (see app.core.sla)
+    response_due_at = Column(TIMESTAMP)  # Work must start (in_progress) by then
+    resolution_due_at = Column(TIMESTAMP)  # Must be repaired/scrapped by then
+    response_breached_at = Column(TIMESTAMP)
+    resolution_breached_at = Column(TIMESTAMP)
+    
+    # Recurring schedule occurrence this request was generated for
+    schedule_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_schedules.id", ondelete="SET NULL"), nullable=True)
+    occurrence_date = Column(Date)
+    
     # Form Tabs Content
     notes = Column(Text)  # Notes tab
     instructions = Column(Text)  # Instructions tab
@@ -64,6 +77,24 @@ class MaintenanceRequest(Base):
     # Metadata
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Optimistic concurrency
+    
+    __mapper_args__ = {"version_id_col": version}
+    
+    __table_args__ = (
+        # One request per schedule occurrence (and equipment, for category schedules)
+        Index(
+            "uq_maintenance_requests_schedule_occurrence",
+            "schedule_id", "equipment_id", "occurrence_date",
+            unique=True,
+        ),
+        # SLA at-risk / breached counts scan open requests by deadline
+        Index(
+            "idx_maintenance_requests_open_resolution_due",
+            "resolution_due_at",
+            postgresql_where=text("status IN ('new', 'in_progress')"),
+        ),
+    )
     
     # Relationships
     equipment = relationship("Equipment", backref="maintenance_requests")
@@ -0,0 +1,62 @@
+import uuid
+from sqlalchemy import Column, String, Date, TIMESTAMP, ForeignKey, Integer, Text, Boolean, CheckConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class MaintenanceSchedule(Base):
+    """
+    MaintenanceSchedule model - Recurring preventive maintenance.
+    
+    Targets one equipment or every active equipment of a category. The
+    schedule generator (app.core.schedules) materializes its occurrences
+    into preventive maintenance requests ahead of time.
+    """
+    __tablename__ = "maintenance_schedules"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # Basic Information - name becomes the generated request subject
+    name = Column(String(255), nullable=False)
+    instructions = Column(Text)
+    priority = Column(Integer, default=2)
+    
+    # Target: one equipment or a whole category
+    equipment_id = Column(UUID(as_uuid=True), ForeignKey("equipment.id", ondelete="CASCADE"), nullable=True, index=True)
+    category = Column(String(100), nullable=True, index=True)
+    
+    # Team override; defaults to each equipment's maintenance team
+    maintenance_team_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_teams.id", ondelete="SET NULL"), nullable=True)
+    
+    # Recurrence rule: every `recurrence_interval` days/weeks/months/years from start_date
+    recurrence = Column(String(20), nullable=False)  # 'daily' | 'weekly' | 'monthly' | 'yearly'
+    recurrence_interval = Column(Integer, nullable=False, default=1)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date)
+    
+    # Requests are created this many days before each occurrence
+    lead_days = Column(Integer, nullable=False, default=14)
+    
+    # Occurrences up to this date have been materialized
+    generated_until = Column(Date)
+    
+    is_active = Column(Boolean, default=True, nullable=False)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    
+    # Metadata
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        CheckConstraint(
+            "(equipment_id IS NULL) <> (category IS NULL)",
+            name="ck_maintenance_schedules_target",
+        ),
+    )
+    
+    # Relationships
+    equipment = relationship("Equipment", backref="maintenance_schedules")
+    maintenance_team = relationship("MaintenanceTeam")
@@ -0,0 +1,41 @@
+import uuid
+from sqlalchemy import Column, String, TIMESTAMP, Integer, Text, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class OutboxEvent(Base):
+    """
+    OutboxEvent model - Transactional outbox for side effects.
+    
+    Written in the same transaction as the domain change that caused it and
+    drained asynchronously by the outbox consumer (app.core.outbox).
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # What happened, e.g. 'request.stage_changed'
+    event_type = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    
+    # Delivery state: 'pending' | 'done' | 'failed'
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    available_at = Column(TIMESTAMP, nullable=False, server_default=func.now())  # Not retried before this
+    last_error = Column(Text)
+    
+    # Timestamps
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    processed_at = Column(TIMESTAMP)
+    
+    __table_args__ = (
+        # The consumer only ever scans pending events in availability order
+        Index(
+            "idx_outbox_events_pending",
+            "available_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, TIMESTAMP, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class RevokedToken(Base):
+    """
+    RevokedToken model - Server-side token revocation list.
+    
+    Either a single token (key = its jti) revoked at logout, or every token
+    of a user issued up to `not_before` (key = 'user:<id>'), e.g. on
+    deactivation. Rows are pruned once `expires_at` has passed, since the
+    tokens they cover have expired by then.
+    """
+    __tablename__ = "revoked_tokens"
+
+    key = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    
+    # Set for user-wide entries: tokens issued at or before this are revoked
+    not_before = Column(TIMESTAMP, nullable=True)
+    
+    # When the covered tokens expire; the entry can be pruned after this
+    expires_at = Column(TIMESTAMP, nullable=False, index=True)
+    
+    # Written by the application (UTC) so workers can sync incrementally
+    revoked_at = Column(TIMESTAMP, nullable=False, index=True)
@@ -0,0 +1,47 @@
+import uuid
+from sqlalchemy import Column, TIMESTAMP, ForeignKey, Integer, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class SlaPolicy(Base):
+    """
+    SlaPolicy model - Response and resolution targets per priority.
+    
+    A policy applies to one priority, either for one maintenance team or
+    (maintenance_team_id NULL) as the default for every team without its
+    own policy. Response is met when work starts (in_progress), resolution
+    when the request is repaired or scrapped.
+    """
+    __tablename__ = "sla_policies"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    priority = Column(Integer, nullable=False)  # 1=Low ... 5=Critical
+    maintenance_team_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_teams.id", ondelete="CASCADE"), nullable=True)
+    
+    # Targets, from the moment the request is opened
+    response_minutes = Column(Integer, nullable=False)
+    resolution_minutes = Column(Integer, nullable=False)
+    
+    # Metadata
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # One policy per (priority, team) and one default per priority
+        Index(
+            "uq_sla_policies_team_priority", "maintenance_team_id", "priority",
+            unique=True, postgresql_where=text("maintenance_team_id IS NOT NULL"),
+        ),
+        Index(
+            "uq_sla_policies_default_priority", "priority",
+            unique=True, postgresql_where=text("maintenance_team_id IS NULL"),
+        ),
+    )
+    
+    # Relationships
+    maintenance_team = relationship("MaintenanceTeam")
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, TIMESTAMP, Boolean
+from sqlalchemy import Column, String, TIMESTAMP, Boolean, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -30,6 +30,7 @@ class User(Base):
     role = Column(String(50), nullable=False, default="user")  # 'user' | 'technician' | 'manager' | 'admin'
     is_technician = Column(Boolean, default=False, index=True)  # Can be assigned to requests
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped when token claims go stale
     
     # Profile
     avatar_url = Column(String(500))  # For Kanban card display
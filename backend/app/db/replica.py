@@ -0,0 +1,190 @@
+"""
+Read-replica routing.
+
+When DATABASE_READ_URL is set, read-heavy routes take their session from
+`get_read_db`, which uses the replica unless:
+
+- the client wrote recently (read-your-writes): after a successful
+  write, reads with the same bearer token subject go to the primary for
+  DB_READ_STICKY_SECONDS, so a user never reads data older than their
+  own writes. The user map is per worker process, so write responses
+  also carry an X-Read-Primary-Until header; clients echo it on later
+  requests, which keeps them on the primary in any worker;
+- the replica is unhealthy: a failed connection or a failed/lagging
+  health check marks it down, and reads use the primary until the next
+  successful health check.
+
+Without a replica `get_read_db` is the same as `get_db`.
+"""
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.tokens import decode_token
+from app.db.session import AsyncSessionLocal, AsyncReadSessionLocal, read_engine, shared_session
+
+# Sent on successful writes and echoed by clients; epoch second until which reads stick to the primary
+STICKY_HEADER = "X-Read-Primary-Until"
+
+# Token subjects that wrote within the stickiness window (per process)
+recent_writers: TTLCache[bool] = TTLCache(
+    ttl_seconds=settings.DB_READ_STICKY_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ReplicaState:
+    """Health of the read replica and routing counters."""
+
+    def __init__(self):
+        self.healthy = read_engine is not None
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+        self.fallbacks = 0
+
+    def mark_down(self, exc: BaseException) -> None:
+        if self.healthy:
+            print(f"Warning: read replica marked unhealthy: {exc!r}")
+        self.healthy = False
+        self.last_error = repr(exc)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "configured": read_engine is not None,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "last_error": self.last_error,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "fallbacks": self.fallbacks,
+        }
+
+
+replica_state = ReplicaState()
+
+
+def bearer_subject(authorization: Optional[str]) -> Optional[str]:
+    """Subject of a valid bearer access token in an Authorization header, else None."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    claims = decode_token(token)
+    return claims.subject if claims else None
+
+
+def is_sticky(request: Request) -> bool:
+    """True if the client wrote within the stickiness window."""
+    value = request.headers.get(STICKY_HEADER)
+    try:
+        if value is not None and float(value) > time.time():
+            return True
+    except ValueError:
+        pass
+    subject = bearer_subject(request.headers.get("authorization"))
+    return subject is not None and recent_writers.get(subject) is not None
+
+
+async def open_read_session(request: Request, session_class=AsyncSession) -> AsyncSession:
+    """
+    A new read-only session: the replica when safe, else the primary.
+
+    The caller closes it. `session_class` is an AsyncSession subclass to
+    create instead of a plain AsyncSession.
+    """
+    if AsyncReadSessionLocal is not None and replica_state.healthy:
+        if is_sticky(request):
+            replica_state.sticky_reads += 1
+        else:
+            session = session_class(**AsyncReadSessionLocal.kw)
+            try:
+                # Check out a connection now so an unreachable replica falls back
+                await session.connection()
+            except Exception as exc:
+                await session.close()
+                replica_state.mark_down(exc)
+                replica_state.fallbacks += 1
+            else:
+                replica_state.replica_reads += 1
+                return session
+
+    replica_state.primary_reads += 1
+    return session_class(**AsyncSessionLocal.kw)
+
+
+async def get_read_db(request: Request):
+    """Dependency for a read-only session: the replica when safe, else the primary."""
+    shared = shared_session.get()
+    if shared is not None:
+        yield shared
+        return
+    session = await open_read_session(request)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def replica_health_job(db: AsyncSession) -> None:
+    """Scheduled job: probe the replica and its replay lag; restores routing when healthy."""
+    if read_engine is None:
+        return
+    try:
+        async with read_engine.connect() as conn:
+            # The last replay timestamp stops moving while the primary is idle, so
+            # a replica that has replayed everything it received is not lagging
+            lag = await conn.scalar(text(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+                " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            ))
+    except Exception as exc:
+        replica_state.mark_down(exc)
+        return
+
+    # NULL when not in recovery (or nothing replayed yet)
+    replica_state.lag_seconds = float(lag) if lag is not None else None
+    if replica_state.lag_seconds is not None and replica_state.lag_seconds > settings.DB_READ_MAX_LAG_SECONDS:
+        replica_state.mark_down(RuntimeError(f"replica lag {replica_state.lag_seconds:.1f}s"))
+        return
+
+    if not replica_state.healthy:
+        print("Read replica healthy again; routing reads to it")
+    replica_state.healthy = True
+    replica_state.last_error = None
+
+
+class ReadYourWritesMiddleware:
+    """Marks the writer sticky on successful write responses (pure ASGI)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = dict(scope["headers"])
+                subject = bearer_subject(headers.get(b"authorization", b"").decode("latin-1"))
+                if subject is not None:
+                    recent_writers.set(subject, True)
+                until = f"{time.time() + settings.DB_READ_STICKY_SECONDS:.3f}"
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (STICKY_HEADER.lower().encode("latin-1"), until.encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
@@ -2,21 +2,31 @@
 
 import os
 import ssl
+from contextvars import ContextVar
+from typing import Optional
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
+from app.core.config import settings
+from app.db.metrics import timed_pool_class, install_query_instrumentation
+
 # Load environment variables
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Convert to async driver format (postgresql+asyncpg://)
-if DATABASE_URL:
+def to_async_url(url: str):
+    """
+    Convert a Postgres URL to the asyncpg driver format (postgresql+asyncpg://).
+
+    Returns:
+        (url, use_ssl) - sslmode/channel_binding are removed from the URL
+        since asyncpg does not accept them; SSL is configured separately
+    """
     # Parse the URL to handle query parameters
-    parsed = urlparse(DATABASE_URL)
-    
+    parsed = urlparse(url)
+
     # Handle various postgres URL formats
     scheme = parsed.scheme
     if scheme == "postgres":
@@ -26,17 +36,20 @@ if DATABASE_URL:
     elif scheme != "postgresql+asyncpg":
         print(f"Warning: DATABASE_URL scheme may not be compatible: {scheme}")
         scheme = "postgresql+asyncpg"
-    
+
     # Parse query params and remove ones not supported by asyncpg
     query_params = parse_qs(parsed.query)
-    
+
     # Remove sslmode and channel_binding from URL (we'll handle SSL separately)
     ssl_mode = query_params.pop('sslmode', ['disable'])[0]
     query_params.pop('channel_binding', None)
-    
+
+    # SQLAlchemy's own prepared statement cache for the asyncpg dialect
+    query_params['prepared_statement_cache_size'] = [str(settings.DB_STATEMENT_CACHE_SIZE)]
+
     # Rebuild URL without problematic params
     new_query = urlencode(query_params, doseq=True)
-    DATABASE_URL = urlunparse((
+    async_url = urlunparse((
         scheme,
         parsed.netloc,
         parsed.path,
@@ -44,38 +57,93 @@ if DATABASE_URL:
         new_query,
         parsed.fragment
     ))
-    
+
     # Determine if SSL is required
-    USE_SSL = ssl_mode in ('require', 'verify-ca', 'verify-full', 'prefer')
-else:
+    return async_url, ssl_mode in ('require', 'verify-ca', 'verify-full', 'prefer')
+
+
+def create_engine_for(url: str, pool_size: Optional[int] = None, max_overflow: Optional[int] = None):
+    """Create an async engine with the configured pool (or the given size), SSL and SQL logging."""
+    async_url, use_ssl = to_async_url(url)
+
+    # Create SSL context if needed
+    connect_args = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if use_ssl:
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        connect_args["ssl"] = ssl_context
+
+    new_engine = create_async_engine(
+        async_url,
+        echo=settings.DB_ECHO,
+        poolclass=timed_pool_class(),
+        pool_size=settings.DB_POOL_SIZE if pool_size is None else pool_size,
+        max_overflow=settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    install_query_instrumentation(new_engine, settings.DB_SLOW_QUERY_MS, settings.DB_QUERY_LOG_SAMPLE_RATE)
+    return new_engine
+
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is required")
 
-# Create SSL context if needed
-connect_args = {}
-if USE_SSL:
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
-    connect_args["ssl"] = ssl_context
+engine = create_engine_for(DATABASE_URL)
+
+AsyncSessionLocal = sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
 
-engine = create_async_engine(
+# Background work (job workers, scheduler, outbox consumer, SLA monitor) has its
+# own pool so it never takes connections admission control budgets for requests
+background_engine = create_engine_for(
     DATABASE_URL,
-    echo=True,  # Set to False in production
-    pool_pre_ping=True,
-    connect_args=connect_args,
+    pool_size=settings.DB_BACKGROUND_POOL_SIZE,
+    max_overflow=settings.DB_BACKGROUND_MAX_OVERFLOW,
 )
 
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
+AsyncBackgroundSessionLocal = sessionmaker(
+    bind=background_engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
+# Optional read replica for read-heavy routes (see app.db.replica)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+read_engine = create_engine_for(DATABASE_READ_URL) if DATABASE_READ_URL else None
+
+AsyncReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+) if read_engine is not None else None
+
+
+# Set while POST /api/batch runs its sub-requests, which all share its session
+shared_session: ContextVar[Optional[AsyncSession]] = ContextVar("shared_session", default=None)
+
 
 async def get_db():
     """Dependency for getting database session."""
+    shared = shared_session.get()
+    if shared is not None:
+        yield shared
+        return
     async with AsyncSessionLocal() as session:
         try:
             yield session
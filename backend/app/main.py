@@ -9,13 +9,19 @@ from contextlib import asynccontextmanager
 
 from app.routes import api_router
 from app.core.config import settings
+from app.core.background import start_background_tasks, stop_background_tasks
+from app.core.middleware import install_middleware
+from app.db.replica import STICKY_HEADER
+from app.core.responses import ORJSONResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print(f"🚀 Starting {settings.APP_NAME}...")
+    await start_background_tasks()
     yield
     print(f"👋 Shutting down {settings.APP_NAME}...")
+    await stop_background_tasks()
 
 
 app = FastAPI(
@@ -23,18 +29,21 @@ app = FastAPI(
     description="The Ultimate Maintenance Tracker for Equipment and Work Centers",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
 origins = settings.CORS_ORIGINS.split(",") if settings.CORS_ORIGINS != "*" else ["*"]
 
+install_middleware(app)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[STICKY_HEADER],
 )
 
 app.include_router(api_router, prefix="/api")
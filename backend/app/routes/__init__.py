@@ -1,13 +1,19 @@
 """API Routes for GearGuard."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from .auth import router as auth_router
 from .users import router as users_router
 from .equipment import router as equipment_router
 from .teams import router as teams_router
 from .requests import router as requests_router
+from .schedules import router as schedules_router
+from .jobs import router as jobs_router
+from .sla import router as sla_router
 from .dashboard import router as dashboard_router
+from .batch import router as batch_router
+from .internal import router as internal_router
+from app.core.deps import get_current_admin
 
 # Main API router
 api_router = APIRouter()
@@ -18,4 +24,11 @@ api_router.include_router(users_router, prefix="/users", tags=["Users"])
 api_router.include_router(equipment_router, prefix="/equipment", tags=["Equipment"])
 api_router.include_router(teams_router, prefix="/teams", tags=["Teams"])
 api_router.include_router(requests_router, prefix="/requests", tags=["Maintenance Requests"])
+api_router.include_router(schedules_router, prefix="/schedules", tags=["Maintenance Schedules"])
+api_router.include_router(sla_router, prefix="/sla-policies", tags=["SLA Policies"])
+api_router.include_router(jobs_router, prefix="/jobs", tags=["Jobs"])
 api_router.include_router(dashboard_router, prefix="/dashboard", tags=["Dashboard"])
+api_router.include_router(batch_router, prefix="/batch", tags=["Batch"])
+api_router.include_router(
+    internal_router, prefix="/internal", tags=["Internal"], dependencies=[Depends(get_current_admin)]
+)
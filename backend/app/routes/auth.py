@@ -1,9 +1,11 @@
 """Authentication API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from datetime import timedelta
 
 from app.db.session import get_db
 from app.db.models import User
@@ -13,21 +15,82 @@ from app.schemas.auth import (
     LoginResponse,
     AuthUserResponse,
     MessageResponse,
+    RefreshRequest,
+    LogoutRequest,
 )
 from app.core.security import (
-    get_password_hash,
-    verify_password,
-    create_access_token,
+    password_hasher,
+    PasswordHasherBusy,
+)
+from app.core.tokens import (
+    REFRESH_TOKEN_TYPE,
+    TokenClaims,
+    create_access_token_for,
+    create_refresh_token,
+    decode_token,
+    note_token_version,
 )
+from app.core.revocation import revocation_list, revoke_tokens
 from app.core.config import settings
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_claims
+from app.core.rate_limit import login_throttle, get_client_ip
+from app.core.team_cache import get_user_team_ids
 
 router = APIRouter()
 
 
+def hasher_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress. Please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def throttle_attempt(email: str, http_request: Request, count_ip: bool = False) -> None:
+    """Reject the attempt with 429 if the email or client IP is over its limit."""
+    retry_after = await login_throttle.check(email, get_client_ip(http_request), count_ip=count_ip)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts. Please try again later.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+async def login_failed(http_request: Request, detail: str) -> HTTPException:
+    """Count a failed login against the client IP's limit; returns the 401 to raise."""
+    await login_throttle.record_failure(get_client_ip(http_request))
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+async def issue_tokens(db: AsyncSession, user: User) -> LoginResponse:
+    """Build the login response: fresh access token claims plus a refresh token."""
+    team_ids = await get_user_team_ids(db, user.id, token_version=user.token_version or 0)
+    note_token_version(user.id, user.token_version or 0)
+    
+    return LoginResponse(
+        user=AuthUserResponse(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            role=user.role,
+            is_technician=user.is_technician,
+            avatar_url=user.avatar_url,
+            department=user.department,
+            job_title=user.job_title,
+        ),
+        access_token=create_access_token_for(user, team_ids),
+        refresh_token=create_refresh_token(user.id),
+        token_type="bearer",
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
 @router.post("/register", response_model=LoginResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     request: RegisterRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -39,6 +102,9 @@ async def register(
     - At least one lowercase letter  
     - At least one special character
     """
+    # Every registration counts against the IP limit, successful or not
+    await throttle_attempt(request.email, http_request, count_ip=True)
+    
     # Check if email already exists
     result = await db.execute(select(User).where(User.email == request.email))
     existing_user = result.scalar_one_or_none()
@@ -49,8 +115,11 @@ async def register(
             detail="An account with this email already exists"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(request.password)
+    # Create new user (bcrypt runs on the hashing executor, off the event loop)
+    try:
+        hashed_password = await password_hasher.hash(request.password)
+    except PasswordHasherBusy:
+        raise hasher_busy_exception()
     
     user = User(
         name=request.name,
@@ -65,88 +134,90 @@ async def register(
     await db.commit()
     await db.refresh(user)
     
-    # Generate token
-    access_token = create_access_token(subject=str(user.id))
-    expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60  # Convert to seconds
-    
-    return LoginResponse(
-        user=AuthUserResponse(
-            id=user.id,
-            name=user.name,
-            email=user.email,
-            role=user.role,
-            is_technician=user.is_technician,
-            avatar_url=user.avatar_url,
-            department=user.department,
-            job_title=user.job_title,
-        ),
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=expires_in,
-    )
+    return await issue_tokens(db, user)
 
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: LoginRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Login with email and password.
     
-    Returns access token and user info on success.
+    Returns access token, refresh token and user info on success.
+    Attempts are rate limited per email and client IP before any lookup;
+    only failed attempts count against the IP limit.
+    Passwords hashed with an outdated bcrypt cost are rehashed transparently.
     """
+    await throttle_attempt(request.email, http_request)
+    
     # Find user by email
     result = await db.execute(select(User).where(User.email == request.email))
     user = result.scalar_one_or_none()
     
     # Check if user exists
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Account not found. Please check your email or sign up.",
-        )
+        raise await login_failed(http_request, "Account not found. Please check your email or sign up.")
     
     # Check if user has a password set
     if not user.password_hash:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Please set a password for your account",
-        )
+        raise await login_failed(http_request, "Please set a password for your account")
     
-    # Verify password
-    if not verify_password(request.password, user.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid password. Please try again.",
+    # Verify password (bcrypt runs on the hashing executor, off the event loop)
+    try:
+        password_ok, new_hash = await password_hasher.verify_and_update(
+            request.password, user.password_hash
         )
+    except PasswordHasherBusy:
+        raise hasher_busy_exception()
+    
+    if not password_ok:
+        raise await login_failed(http_request, "Invalid password. Please try again.")
     
     # Check if user is active
     if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Your account has been deactivated. Please contact support.",
-        )
+        raise await login_failed(http_request, "Your account has been deactivated. Please contact support.")
     
-    # Generate token
-    access_token = create_access_token(subject=str(user.id))
-    expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    # Hash used an outdated cost factor: store the rehash made during verify
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
     
-    return LoginResponse(
-        user=AuthUserResponse(
-            id=user.id,
-            name=user.name,
-            email=user.email,
-            role=user.role,
-            is_technician=user.is_technician,
-            avatar_url=user.avatar_url,
-            department=user.department,
-            job_title=user.job_title,
-        ),
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=expires_in,
+    return await issue_tokens(db, user)
+
+
+@router.post("/refresh", response_model=LoginResponse)
+async def refresh(
+    request: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new access token.
+    
+    The new access token carries the user's current role, active flag,
+    team ids and token version, so clients call this when an access token
+    expires or is rejected after a membership change.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    claims = decode_token(request.refresh_token, REFRESH_TOKEN_TYPE)
+    if claims is None or claims.user_id is None or revocation_list.is_revoked(claims):
+        raise credentials_exception
+    
+    result = await db.execute(
+        select(User).where(User.id == claims.user_id, User.is_active == True)
     )
+    user = result.scalar_one_or_none()
+    if not user:
+        raise credentials_exception
+    
+    return await issue_tokens(db, user)
 
 
 @router.get("/me", response_model=AuthUserResponse)
@@ -165,13 +236,28 @@ async def get_me(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout", response_model=MessageResponse)
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    claims: TokenClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Logout current user.
     
-    Note: With JWT, logout is handled client-side by removing the token.
-    This endpoint is for API completeness.
+    Revokes the access token (and the refresh token, if given) by token id,
+    so they are rejected by every worker until they expire.
     """
+    revoked = [claims]
+    if request and request.refresh_token:
+        refresh_claims = decode_token(request.refresh_token, REFRESH_TOKEN_TYPE)
+        if refresh_claims is not None and refresh_claims.subject == claims.subject:
+            revoked.append(refresh_claims)
+    
+    entries = await revoke_tokens(db, revoked)
+    await db.commit()
+    for entry in entries:
+        revocation_list.apply(entry)
+    
     return MessageResponse(
         message="Successfully logged out",
         success=True
@@ -0,0 +1,29 @@
+"""Batch API routes."""
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.multiplex import run_batch
+from app.schemas.batch import BatchRequest, BatchResult
+
+router = APIRouter()
+
+
+@router.post("", response_model=BatchResult)
+async def batch(payload: BatchRequest, request: Request):
+    """
+    Run several read-only GET requests in one round trip.
+
+    Sub-requests go through the regular routes and share one database
+    session; each response carries its own status, headers and body.
+    They also share one transaction: after a sub-request hits a database
+    error, the sub-requests that still need the database get 424 and
+    should be retried.
+    """
+    if len(payload.requests) > settings.BATCH_MAX_SUBREQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.BATCH_MAX_SUBREQUESTS} sub-requests per batch",
+        )
+    responses = await run_batch(request, [item.model_dump() for item in payload.requests])
+    return BatchResult(responses=responses)
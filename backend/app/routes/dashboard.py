@@ -3,13 +3,15 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List
 
-from app.db.session import get_db
+from app.db.replica import get_read_db
 from app.db.models import Equipment, MaintenanceRequest, User, TeamMember
+from app.core.config import settings
+from app.core.sla import sla_breached_condition, sla_at_risk_condition, OPEN_STATUSES
 from app.schemas.dashboard import (
-    DashboardKPIs, CriticalEquipmentKPI, TechnicianLoadKPI, OpenRequestsKPI,
+    DashboardKPIs, CriticalEquipmentKPI, TechnicianLoadKPI, OpenRequestsKPI, SlaKPI,
     ActivityItem, DashboardSummary, EquipmentHealthSummary,
     RequestsByType, RequestsByStatus
 )
@@ -18,7 +20,7 @@ router = APIRouter()
 
 
 @router.get("/kpis", response_model=DashboardKPIs)
-async def get_kpis(db: AsyncSession = Depends(get_db)):
+async def get_kpis(db: AsyncSession = Depends(get_read_db)):
     """Get dashboard KPIs."""
     
     # Critical Equipment (health < 30%)
@@ -65,6 +67,16 @@ async def get_kpis(db: AsyncSession = Depends(get_db)):
         )
     )
     
+    # SLA: breached and at-risk open requests in one pass
+    now = datetime.now()
+    window = timedelta(minutes=settings.SLA_AT_RISK_MINUTES)
+    sla_breached, sla_at_risk = (await db.execute(
+        select(
+            func.count().filter(sla_breached_condition(now)),
+            func.count().filter(sla_at_risk_condition(now, window)),
+        ).where(MaintenanceRequest.status.in_(OPEN_STATUSES))
+    )).one()
+    
     return DashboardKPIs(
         critical_equipment=CriticalEquipmentKPI(
             count=critical_count or 0,
@@ -86,6 +98,13 @@ async def get_kpis(db: AsyncSession = Depends(get_db)):
             label="Open Requests",
             description=f"{pending_count or 0} Pending, {overdue_count or 0} Overdue"
         ),
+        sla=SlaKPI(
+            at_risk_count=sla_at_risk or 0,
+            breached_count=sla_breached or 0,
+            at_risk_window_minutes=settings.SLA_AT_RISK_MINUTES,
+            label="SLA",
+            description=f"{sla_at_risk or 0} At Risk, {sla_breached or 0} Breached"
+        ),
         last_updated=datetime.now()
     )
 
@@ -93,7 +112,7 @@ async def get_kpis(db: AsyncSession = Depends(get_db)):
 @router.get("/activity", response_model=List[ActivityItem])
 async def get_recent_activity(
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get recent activity feed."""
     # Get recent requests
@@ -138,7 +157,7 @@ async def get_recent_activity(
 
 
 @router.get("/summary", response_model=DashboardSummary)
-async def get_dashboard_summary(db: AsyncSession = Depends(get_db)):
+async def get_dashboard_summary(db: AsyncSession = Depends(get_read_db)):
     """Get complete dashboard summary."""
     
     # Get KPIs
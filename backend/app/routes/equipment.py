@@ -1,24 +1,47 @@
 """Equipment API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from typing import List, Optional
+from datetime import date
 from uuid import UUID
 
 from app.db.session import get_db
-from app.db.models import Equipment, MaintenanceRequest
+from app.db.replica import get_read_db
+from app.db.models import Equipment, MaintenanceRequest, MaintenanceTeam, User
+from app.core.config import settings
+from app.core.etag import conditional_get, table_stamp
+from app.core.warranty import find_expiring_equipment, create_warranty_inspections
+from app.core.assignment import assignment_engine
+from app.core.concurrency import get_expected_version, version_conflict
+from app.core.batch import get_batch_ids, id_in, keyed
+from app.core.deps import get_current_manager_or_admin
 from app.schemas.equipment import (
     EquipmentCreate, EquipmentUpdate, EquipmentResponse, 
-    EquipmentList, EquipmentHealth
+    EquipmentList, EquipmentBatch, EquipmentHealth,
+    EquipmentWarrantyList, EquipmentWarrantyItem, WarrantyInspectionResult
 )
 
 router = APIRouter()
 
 
+def equipment_stamps(*criteria) -> list:
+    """Validator stamps for equipment responses (embeds users, teams, open requests)."""
+    return [
+        table_stamp(Equipment, *criteria),
+        table_stamp(User),
+        table_stamp(MaintenanceTeam),
+        table_stamp(MaintenanceRequest),
+    ]
+
+
 @router.get("/", response_model=EquipmentList)
 async def list_equipment(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     category: Optional[str] = None,
@@ -26,26 +49,31 @@ async def list_equipment(
     status: Optional[str] = None,
     is_critical: Optional[bool] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all equipment with optional filtering."""
-    query = select(Equipment).options(
-        selectinload(Equipment.assigned_employee),
-        selectinload(Equipment.maintenance_team),
-        selectinload(Equipment.default_technician)
-    )
-    
-    # Apply filters
+    # Build filters
+    filters = []
     if category:
-        query = query.where(Equipment.category == category)
+        filters.append(Equipment.category == category)
     if department:
-        query = query.where(Equipment.department == department)
+        filters.append(Equipment.department == department)
     if status:
-        query = query.where(Equipment.status == status)
+        filters.append(Equipment.status == status)
     if is_critical:
-        query = query.where(Equipment.health_percentage < 30)
+        filters.append(Equipment.health_percentage < 30)
     if search:
-        query = query.where(Equipment.name.ilike(f"%{search}%"))
+        filters.append(Equipment.name.ilike(f"%{search}%"))
+    
+    not_modified = await conditional_get(db, request, response, equipment_stamps(*filters))
+    if not_modified:
+        return not_modified
+    
+    query = select(Equipment).where(*filters).options(
+        selectinload(Equipment.assigned_employee),
+        selectinload(Equipment.maintenance_team),
+        selectinload(Equipment.default_technician)
+    )
     
     # Count total
     count_query = select(func.count()).select_from(query.subquery())
@@ -120,9 +148,111 @@ async def get_health_summary(db: AsyncSession = Depends(get_db)):
     )
 
 
+@router.get("/expiring", response_model=EquipmentWarrantyList)
+async def list_expiring_equipment(
+    within_days: Optional[int] = Query(None, ge=0, le=3650),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """List active equipment whose warranty expires within the horizon."""
+    horizon = within_days if within_days is not None else settings.WARRANTY_HORIZON_DAYS
+    equipment_list, total = await find_expiring_equipment(db, horizon, skip=skip, limit=limit)
+    
+    today = date.today()
+    items = [
+        EquipmentWarrantyItem(
+            id=eq.id,
+            name=eq.name,
+            serial_number=eq.serial_number,
+            category=eq.category,
+            department=eq.department,
+            location=eq.location,
+            status=eq.status,
+            warranty_expiry=eq.warranty_expiry,
+            days_until_expiry=(eq.warranty_expiry - today).days,
+            maintenance_team_id=eq.maintenance_team_id,
+            default_technician_id=eq.default_technician_id,
+        )
+        for eq in equipment_list
+    ]
+    
+    return EquipmentWarrantyList(
+        items=items, total=total, skip=skip, limit=limit, horizon_days=horizon
+    )
+
+
+@router.post("/expiring/inspections", response_model=WarrantyInspectionResult, dependencies=[Depends(get_current_manager_or_admin)])
+async def schedule_warranty_inspections(
+    within_days: Optional[int] = Query(None, ge=0, le=3650),
+    lead_days: Optional[int] = Query(None, ge=0, le=365),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create preventive inspections for expiring equipment that has none scheduled."""
+    horizon = within_days if within_days is not None else settings.WARRANTY_HORIZON_DAYS
+    lead = lead_days if lead_days is not None else settings.WARRANTY_INSPECTION_LEAD_DAYS
+    
+    created = await create_warranty_inspections(db, horizon, lead)
+    await db.commit()
+    assignment_engine.requests_created(created)
+    
+    return WarrantyInspectionResult(created=len(created), horizon_days=horizon, lead_days=lead)
+
+
+@router.get("/batch", response_model=EquipmentBatch)
+async def get_equipment_batch(
+    request: Request,
+    response: Response,
+    ids: List[UUID] = Depends(get_batch_ids),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get many equipment by ID in one call, keyed by ID."""
+    not_modified = await conditional_get(db, request, response, equipment_stamps(id_in(Equipment.id, ids)))
+    if not_modified:
+        return not_modified
+    
+    query = select(Equipment).where(id_in(Equipment.id, ids)).options(
+        selectinload(Equipment.assigned_employee),
+        selectinload(Equipment.maintenance_team),
+        selectinload(Equipment.default_technician)
+    )
+    result = await db.execute(query)
+    equipment_list = result.scalars().all()
+    
+    # Open request counts for all of them in one grouped query
+    open_counts_query = select(
+        MaintenanceRequest.equipment_id, func.count()
+    ).where(
+        id_in(MaintenanceRequest.equipment_id, ids),
+        MaintenanceRequest.status.in_(['new', 'in_progress'])
+    ).group_by(MaintenanceRequest.equipment_id)
+    open_counts = dict((await db.execute(open_counts_query)).all())
+    
+    return keyed(ids, {
+        eq.id: {
+            **eq.__dict__,
+            'is_critical': eq.health_percentage < 30,
+            'open_request_count': open_counts.get(eq.id, 0)
+        }
+        for eq in equipment_list
+    })
+
+
 @router.get("/{equipment_id}", response_model=EquipmentResponse)
-async def get_equipment(equipment_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_equipment(
+    equipment_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
     """Get a single equipment by ID."""
+    not_modified = await conditional_get(
+        db, request, response, equipment_stamps(Equipment.id == equipment_id),
+        version=select(Equipment.version).where(Equipment.id == equipment_id).scalar_subquery()
+    )
+    if not_modified:
+        return not_modified
+    
     query = select(Equipment).where(Equipment.id == equipment_id).options(
         selectinload(Equipment.assigned_employee),
         selectinload(Equipment.maintenance_team),
@@ -173,32 +303,65 @@ async def create_equipment(
     }
 
 
+def equipment_representation(equipment: Equipment) -> dict:
+    """Response body for a single equipment after a write (without nested objects)."""
+    return {
+        **equipment.__dict__,
+        'is_critical': equipment.health_percentage < 30,
+        'open_request_count': 0
+    }
+
+
+async def equipment_conflict(db: AsyncSession, equipment_id: UUID) -> HTTPException:
+    """409 with the equipment as it is now."""
+    result = await db.execute(
+        select(Equipment)
+        .where(Equipment.id == equipment_id)
+        .execution_options(populate_existing=True)
+    )
+    equipment = result.scalar_one_or_none()
+    if not equipment:
+        return HTTPException(status_code=404, detail="Equipment not found")
+    return version_conflict(EquipmentResponse.model_validate(equipment_representation(equipment)))
+
+
 @router.patch("/{equipment_id}", response_model=EquipmentResponse)
 async def update_equipment(
     equipment_id: UUID,
     equipment_data: EquipmentUpdate,
+    expected_version: Optional[int] = Depends(get_expected_version),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update equipment."""
+    """
+    Update equipment.
+    
+    Send the version last seen as `If-Match: "<version>"` (or the ETag of
+    GET /equipment/{id}, or `expected_version`) to get 409 with the current
+    equipment instead of overwriting someone else's changes.
+    """
     result = await db.execute(select(Equipment).where(Equipment.id == equipment_id))
     equipment = result.scalar_one_or_none()
     
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
     
+    if expected_version is not None and equipment.version != expected_version:
+        raise version_conflict(EquipmentResponse.model_validate(equipment_representation(equipment)))
+    
     # Update only provided fields
     update_data = equipment_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(equipment, field, value)
     
-    await db.commit()
+    # The UPDATE is guarded by the loaded version (version_id_col)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise await equipment_conflict(db, equipment_id)
     await db.refresh(equipment)
     
-    return {
-        **equipment.__dict__,
-        'is_critical': equipment.health_percentage < 30,
-        'open_request_count': 0
-    }
+    return equipment_representation(equipment)
 
 
 @router.delete("/{equipment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,112 @@
+"""Internal metrics API routes."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.team_cache import team_membership_cache
+from app.core.deps import principal_cache
+from app.core.tokens import token_versions
+from app.core.assignment import assignment_engine
+from app.core.security import password_hasher
+from app.core.rate_limit import login_throttle
+from app.core.revocation import revocation_list
+from app.core.outbox import outbox_consumer
+from app.core.jobs import job_worker_pool
+from app.core.sla import sla_monitor
+from app.core.compression import compression_stats
+from app.core.admission import admission_controller
+from app.db.session import engine, background_engine, read_engine, get_db
+from app.db.metrics import pool_stats
+from app.db.replica import replica_state
+from app.core.query_budget import route_query_stats
+
+router = APIRouter()
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    """Connection pool occupancy and checkout wait-time histogram (ms), per engine."""
+    return {
+        "primary": pool_stats(engine),
+        "background": pool_stats(background_engine),
+        "replica": pool_stats(read_engine) if read_engine is not None else None,
+    }
+
+
+@router.get("/replica")
+async def get_replica_stats():
+    """Read replica health and how reads were routed."""
+    return replica_state.stats()
+
+
+@router.get("/queries")
+async def get_query_stats():
+    """Statements and DB time per request, by route."""
+    return route_query_stats.snapshot()
+
+
+@router.get("/caches")
+async def get_cache_stats():
+    """Hit/miss metrics for in-process caches."""
+    return {
+        "team_membership": team_membership_cache.stats(),
+        "principal": principal_cache.stats(),
+        "token_versions": token_versions.stats(),
+    }
+
+
+@router.get("/password-hasher")
+async def get_password_hasher_stats():
+    """Load of the bcrypt executor (pending includes queued calls)."""
+    return password_hasher.stats()
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_stats():
+    """Allowed and rejected login attempts."""
+    return {"login": login_throttle.stats()}
+
+
+@router.get("/assignment")
+async def get_assignment_load():
+    """Priority-weighted open load of every team member, by team."""
+    return {
+        "ready": assignment_engine.ready,
+        "teams": assignment_engine.snapshot(),
+    }
+
+
+@router.get("/revocations")
+async def get_revocation_stats():
+    """Size and sync state of the in-memory token revocation list."""
+    return revocation_list.stats()
+
+
+@router.get("/outbox")
+async def get_outbox_stats(db: AsyncSession = Depends(get_db)):
+    """Outbox consumer counters and events by delivery status."""
+    return await outbox_consumer.stats(db)
+
+
+@router.get("/jobs")
+async def get_job_stats(db: AsyncSession = Depends(get_db)):
+    """Job worker pool counters and jobs by status."""
+    return await job_worker_pool.stats(db)
+
+
+@router.get("/sla")
+async def get_sla_monitor_stats():
+    """Timers in the SLA timer wheel and breaches fired."""
+    return sla_monitor.stats()
+
+
+@router.get("/compression")
+async def get_compression_stats():
+    """Responses gzip-compressed and bytes before/after compression."""
+    return compression_stats.stats()
+
+
+@router.get("/admission")
+async def get_admission_stats():
+    """Active and queued requests and rejections per admission route class."""
+    return admission_controller.stats()
@@ -0,0 +1,177 @@
+"""Background Jobs API routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from typing import List, Optional
+from uuid import UUID
+
+from app.db.session import get_db, AsyncSessionLocal
+from app.db.models import Job, JobFilePart
+from app.core.deps import get_current_claims, get_current_manager_or_admin
+from app.core.tokens import TokenClaims
+from app.core.jobs import enqueue_job, cancel_job, job_types, job_worker_pool, UnknownJobType
+from app.core import job_handlers  # noqa: F401  (registers job types)
+from app.schemas.job import JobCreate, JobResponse, JobProgress, JobSummary, JobList
+
+router = APIRouter()
+
+
+def is_manager(claims: TokenClaims) -> bool:
+    return claims.role in ("admin", "manager")
+
+
+def visible_jobs(claims: TokenClaims) -> List:
+    """Filters limiting jobs to the caller's own unless they are a manager or admin."""
+    return [] if is_manager(claims) else [Job.created_by == claims.user_id]
+
+
+async def get_job_or_404(db: AsyncSession, job_id: UUID, claims: TokenClaims) -> Job:
+    """Load a job the caller may see; other users' jobs are reported as not found."""
+    result = await db.execute(select(Job).where(Job.id == job_id, *visible_jobs(claims)))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/types", response_model=List[str], dependencies=[Depends(get_current_claims)])
+async def list_job_types():
+    """List the job types that can be queued."""
+    return job_types()
+
+
+@router.get("/", response_model=JobList)
+async def list_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    status: Optional[str] = None,
+    job_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    claims: TokenClaims = Depends(get_current_claims)
+):
+    """List jobs, newest first (only the caller's own unless manager/admin)."""
+    filters = visible_jobs(claims)
+    if status:
+        filters.append(Job.status == status)
+    if job_type:
+        filters.append(Job.job_type == job_type)
+    
+    total = await db.scalar(select(func.count()).select_from(Job).where(*filters))
+    # Without the (possibly large) params and result columns
+    result = await db.execute(
+        select(
+            Job.id, Job.job_type, Job.status, Job.priority, Job.progress, Job.progress_message,
+            Job.attempts, Job.error, Job.created_at, Job.finished_at,
+        ).where(*filters).order_by(Job.created_at.desc()).offset(skip).limit(limit)
+    )
+    items = [JobSummary.model_validate(row._mapping) for row in result.all()]
+    
+    return JobList(items=items, total=total or 0, skip=skip, limit=limit)
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    job_data: JobCreate,
+    db: AsyncSession = Depends(get_db),
+    claims: TokenClaims = Depends(get_current_manager_or_admin)
+):
+    """Queue a job (manager/admin only); poll GET /jobs/{id}/progress for its status."""
+    try:
+        job = enqueue_job(
+            db, job_data.job_type, job_data.params,
+            priority=job_data.priority, created_by=claims.user_id
+        )
+    except UnknownJobType:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown job type '{job_data.job_type}'. Available: {', '.join(job_types())}"
+        )
+    await db.commit()
+    await db.refresh(job)
+    job_worker_pool.wake()
+    
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    claims: TokenClaims = Depends(get_current_claims)
+):
+    """Get a job with its parameters and result."""
+    return await get_job_or_404(db, job_id, claims)
+
+
+@router.get("/{job_id}/progress", response_model=JobProgress)
+async def get_job_progress(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    claims: TokenClaims = Depends(get_current_claims)
+):
+    """Get a job's status and progress (cheap enough to poll)."""
+    result = await db.execute(
+        select(Job.id, Job.status, Job.progress, Job.progress_message, Job.attempts)
+        .where(Job.id == job_id, *visible_jobs(claims))
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobProgress.model_validate(row._mapping)
+
+
+@router.get("/{job_id}/download")
+async def download_job_result(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    claims: TokenClaims = Depends(get_current_claims)
+):
+    """Download the file produced by a finished export job."""
+    job = await get_job_or_404(db, job_id, claims)
+    has_file = await db.scalar(
+        select(JobFilePart.part).where(JobFilePart.job_id == job_id).limit(1)
+    )
+    if job.status != "succeeded" or not job.result or has_file is None:
+        raise HTTPException(status_code=404, detail="Job has no downloadable result")
+    
+    headers = {"Content-Disposition": f'attachment; filename="{job.result.get("filename", job_id)}"'}
+    if job.result.get("size_bytes") is not None:
+        headers["Content-Length"] = str(job.result["size_bytes"])
+    return StreamingResponse(
+        stream_job_file(job_id),
+        media_type=job.result.get("content_type", "application/octet-stream"),
+        headers=headers,
+    )
+
+
+async def stream_job_file(job_id: UUID):
+    """Yield a job's file part by part (own session: the request's is closed while streaming)."""
+    async with AsyncSessionLocal() as db:
+        part = -1
+        while True:
+            row = (await db.execute(
+                select(JobFilePart.part, JobFilePart.content)
+                .where(JobFilePart.job_id == job_id, JobFilePart.part > part)
+                .order_by(JobFilePart.part).limit(1)
+            )).one_or_none()
+            if row is None:
+                return
+            part = row.part
+            yield row.content
+
+
+@router.post("/{job_id}/cancel", response_model=JobProgress)
+async def cancel(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    claims: TokenClaims = Depends(get_current_manager_or_admin)
+):
+    """Cancel a job: queued jobs at once, running jobs at their next progress report."""
+    job_status = await cancel_job(db, job_id)
+    if job_status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    await db.commit()
+    
+    return await get_job_progress(job_id, db, claims)
@@ -1,18 +1,32 @@
 """Maintenance Requests API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from typing import List, Optional
 from datetime import datetime, date
 from uuid import UUID
-import uuid as uuid_lib
 
 from app.db.session import get_db
-from app.db.models import MaintenanceRequest, Equipment, RequestHistory, EquipmentScrapLog
+from app.db.replica import get_read_db
+from app.db.models import (
+    MaintenanceRequest, Equipment, RequestHistory, MaintenanceTeam, User
+)
+from app.core.references import generate_reference
+from app.core.etag import conditional_get, table_stamp
+from app.core.assignment import assignment_engine, RequestLoad
+from app.core.transitions import transition_request, TransitionConflict, TransitionNotFound
+from app.core.concurrency import get_expected_version, version_conflict
+from app.core.outbox import enqueue, outbox_consumer
+from app.core.outbox_handlers import REQUEST_STAGE_CHANGED
+from app.core.sla import sla_deadlines, clock_start, sla_monitor, OPEN_STATUSES
+from app.core.batch import get_batch_ids, id_in, keyed
+from app.core.deps import get_current_claims, get_current_manager_or_admin, ensure_team_access
+from app.core.tokens import TokenClaims
 from app.schemas.maintenance_request import (
-    RequestCreate, RequestUpdate, RequestResponse, RequestList,
+    RequestCreate, RequestUpdate, RequestResponse, RequestList, RequestBatch,
     RequestKanban, RequestKanbanColumn, RequestKanbanCard,
     RequestCalendar, RequestCalendarItem, RequestStageUpdate
 )
@@ -30,13 +44,6 @@ STAGE_LABELS = {
 PRIORITY_LABELS = {1: "Low", 2: "Normal", 3: "High", 4: "Urgent", 5: "Critical"}
 
 
-def generate_reference() -> str:
-    """Generate a unique reference number."""
-    year = datetime.now().year
-    unique_id = str(uuid_lib.uuid4().int)[:5]
-    return f"MR/{year}/{unique_id}"
-
-
 def compute_is_overdue(scheduled_date: Optional[datetime], status: str) -> bool:
     """Compute if a request is overdue."""
     if scheduled_date is None:
@@ -46,8 +53,44 @@ def compute_is_overdue(scheduled_date: Optional[datetime], status: str) -> bool:
     return scheduled_date < datetime.now()
 
 
+def visible_requests(claims: TokenClaims) -> list:
+    """
+    Filters limiting technicians to their teams' requests.
+
+    Managers and admins see every request. Decided from the token's team
+    ids like `ensure_team_access`, so no membership query is made.
+    """
+    if claims.role in ("admin", "manager"):
+        return []
+    return [MaintenanceRequest.maintenance_team_id.in_(claims.team_ids)]
+
+
+def request_stamps(*criteria) -> list:
+    """
+    Validator stamps for request responses.
+
+    Besides the embedded equipment, team and user rows, the number of
+    overdue requests is included because is_overdue flips with time
+    without touching updated_at.
+    """
+    overdue_count = select(func.count()).select_from(MaintenanceRequest).where(
+        *criteria,
+        MaintenanceRequest.scheduled_date < datetime.now(),
+        MaintenanceRequest.status.in_(['new', 'in_progress'])
+    ).scalar_subquery()
+    return [
+        table_stamp(MaintenanceRequest, *criteria),
+        (overdue_count,),
+        table_stamp(Equipment),
+        table_stamp(MaintenanceTeam),
+        table_stamp(User),
+    ]
+
+
 @router.get("/", response_model=RequestList)
 async def list_requests(
+    http_request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     status: Optional[str] = None,
@@ -57,29 +100,35 @@ async def list_requests(
     assigned_to: Optional[UUID] = None,
     is_overdue: Optional[bool] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    claims: TokenClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all maintenance requests with optional filtering."""
-    query = select(MaintenanceRequest).options(
-        selectinload(MaintenanceRequest.equipment),
-        selectinload(MaintenanceRequest.maintenance_team),
-        selectinload(MaintenanceRequest.technician),
-        selectinload(MaintenanceRequest.creator)
-    )
-    
-    # Apply filters
+    """List maintenance requests (of the caller's teams for technicians) with optional filtering."""
+    # Build filters
+    filters = visible_requests(claims)
     if status:
-        query = query.where(MaintenanceRequest.status == status)
+        filters.append(MaintenanceRequest.status == status)
     if request_type:
-        query = query.where(MaintenanceRequest.request_type == request_type)
+        filters.append(MaintenanceRequest.request_type == request_type)
     if equipment_id:
-        query = query.where(MaintenanceRequest.equipment_id == equipment_id)
+        filters.append(MaintenanceRequest.equipment_id == equipment_id)
     if team_id:
-        query = query.where(MaintenanceRequest.maintenance_team_id == team_id)
+        filters.append(MaintenanceRequest.maintenance_team_id == team_id)
     if assigned_to:
-        query = query.where(MaintenanceRequest.assigned_to == assigned_to)
+        filters.append(MaintenanceRequest.assigned_to == assigned_to)
     if search:
-        query = query.where(MaintenanceRequest.subject.ilike(f"%{search}%"))
+        filters.append(MaintenanceRequest.subject.ilike(f"%{search}%"))
+    
+    not_modified = await conditional_get(db, http_request, response, request_stamps(*filters))
+    if not_modified:
+        return not_modified
+    
+    query = select(MaintenanceRequest).where(*filters).options(
+        selectinload(MaintenanceRequest.equipment),
+        selectinload(MaintenanceRequest.maintenance_team),
+        selectinload(MaintenanceRequest.technician),
+        selectinload(MaintenanceRequest.creator)
+    )
     
     # Count total
     count_query = select(func.count()).select_from(query.subquery())
@@ -106,24 +155,31 @@ async def list_requests(
 
 @router.get("/kanban", response_model=RequestKanban)
 async def get_kanban(
+    http_request: Request,
+    response: Response,
     team_id: Optional[UUID] = None,
-    db: AsyncSession = Depends(get_db)
+    claims: TokenClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get requests grouped by status for Kanban board."""
+    filters = visible_requests(claims)
+    if team_id:
+        filters.append(MaintenanceRequest.maintenance_team_id == team_id)
+    not_modified = await conditional_get(db, http_request, response, request_stamps(*filters))
+    if not_modified:
+        return not_modified
+    
     columns = []
     total = 0
     
     for stage in ['new', 'in_progress', 'repaired', 'scrap']:
         query = select(MaintenanceRequest).where(
-            MaintenanceRequest.status == stage
+            MaintenanceRequest.status == stage, *filters
         ).options(
             selectinload(MaintenanceRequest.equipment),
             selectinload(MaintenanceRequest.technician)
         )
         
-        if team_id:
-            query = query.where(MaintenanceRequest.maintenance_team_id == team_id)
-        
         query = query.order_by(MaintenanceRequest.priority.desc(), MaintenanceRequest.created_at.desc())
         result = await db.execute(query)
         requests = result.scalars().all()
@@ -161,9 +217,12 @@ async def get_kanban(
 
 @router.get("/calendar", response_model=RequestCalendar)
 async def get_calendar(
+    http_request: Request,
+    response: Response,
     month: int = Query(..., ge=1, le=12),
     year: int = Query(..., ge=2020, le=2100),
-    db: AsyncSession = Depends(get_db)
+    claims: TokenClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get preventive requests for calendar view."""
     # Get start and end of month
@@ -173,11 +232,17 @@ async def get_calendar(
     else:
         end_date = datetime(year, month + 1, 1)
     
-    query = select(MaintenanceRequest).where(
+    filters = [
         MaintenanceRequest.request_type == 'preventive',
         MaintenanceRequest.scheduled_date >= start_date,
-        MaintenanceRequest.scheduled_date < end_date
-    ).options(
+        MaintenanceRequest.scheduled_date < end_date,
+        *visible_requests(claims)
+    ]
+    not_modified = await conditional_get(db, http_request, response, request_stamps(*filters))
+    if not_modified:
+        return not_modified
+    
+    query = select(MaintenanceRequest).where(*filters).options(
         selectinload(MaintenanceRequest.equipment),
         selectinload(MaintenanceRequest.technician)
     ).order_by(MaintenanceRequest.scheduled_date)
@@ -200,10 +265,56 @@ async def get_calendar(
     return RequestCalendar(items=items, month=month, year=year)
 
 
+@router.get("/batch", response_model=RequestBatch)
+async def get_requests_batch(
+    http_request: Request,
+    response: Response,
+    ids: List[UUID] = Depends(get_batch_ids),
+    claims: TokenClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get many requests by ID in one call, keyed by ID (others' teams' requests are missing)."""
+    criteria = [id_in(MaintenanceRequest.id, ids), *visible_requests(claims)]
+    not_modified = await conditional_get(db, http_request, response, request_stamps(*criteria))
+    if not_modified:
+        return not_modified
+    
+    query = select(MaintenanceRequest).where(*criteria).options(
+        selectinload(MaintenanceRequest.equipment),
+        selectinload(MaintenanceRequest.maintenance_team),
+        selectinload(MaintenanceRequest.technician),
+        selectinload(MaintenanceRequest.creator)
+    )
+    result = await db.execute(query)
+    
+    return keyed(ids, {
+        req.id: {
+            **req.__dict__,
+            'is_overdue': compute_is_overdue(req.scheduled_date, req.status),
+            'priority_label': PRIORITY_LABELS.get(req.priority, "Normal")
+        }
+        for req in result.scalars().all()
+    })
+
+
 @router.get("/{request_id}", response_model=RequestResponse)
-async def get_request(request_id: UUID, db: AsyncSession = Depends(get_db)):
-    """Get a single request by ID."""
-    query = select(MaintenanceRequest).where(MaintenanceRequest.id == request_id).options(
+async def get_request(
+    request_id: UUID,
+    http_request: Request,
+    response: Response,
+    claims: TokenClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a single request by ID (404 for technicians outside its team)."""
+    criteria = [MaintenanceRequest.id == request_id, *visible_requests(claims)]
+    not_modified = await conditional_get(
+        db, http_request, response, request_stamps(*criteria),
+        version=select(MaintenanceRequest.version).where(*criteria).scalar_subquery()
+    )
+    if not_modified:
+        return not_modified
+    
+    query = select(MaintenanceRequest).where(*criteria).options(
         selectinload(MaintenanceRequest.equipment),
         selectinload(MaintenanceRequest.maintenance_team),
         selectinload(MaintenanceRequest.technician),
@@ -227,13 +338,14 @@ async def get_request(request_id: UUID, db: AsyncSession = Depends(get_db)):
 @router.post("/", response_model=RequestResponse, status_code=status.HTTP_201_CREATED)
 async def create_request(
     request_data: RequestCreate,
-    created_by: UUID = Query(..., description="User ID of creator"),
+    claims: TokenClaims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new maintenance request with auto-fill from equipment."""
+    """Create a new maintenance request with auto-fill from equipment; the caller is its creator."""
     data = request_data.model_dump()
-    data['created_by'] = created_by
+    data['created_by'] = claims.user_id
     data['reference'] = generate_reference()
+    default_technician_id = None
     
     # Auto-fill from equipment if provided
     if data.get('equipment_id'):
@@ -250,9 +362,20 @@ async def create_request(
             if not data.get('maintenance_team_id') and equipment.maintenance_team_id:
                 data['maintenance_team_id'] = equipment.maintenance_team_id
             
-            # Auto-fill technician from equipment if not provided
-            if not data.get('assigned_to') and equipment.default_technician_id:
-                data['assigned_to'] = equipment.default_technician_id
+            # Equipment default technician is the fallback assignee
+            default_technician_id = equipment.default_technician_id
+    
+    # Auto-assign the least-loaded team member, else the equipment default
+    if not data.get('assigned_to'):
+        data['assigned_to'] = (
+            assignment_engine.pick(data.get('maintenance_team_id')) or default_technician_id
+        )
+    
+    # SLA deadlines from the policy for this priority and team
+    data.update(await sla_deadlines(
+        db, data.get('priority'), data.get('maintenance_team_id'),
+        clock_start(datetime.now(), data.get('scheduled_date'))
+    ))
     
     request = MaintenanceRequest(**data)
     db.add(request)
@@ -262,12 +385,14 @@ async def create_request(
         request_id=request.id,
         from_stage=None,
         to_stage='new',
-        changed_by=created_by,
+        changed_by=claims.user_id,
         comment='Request created'
     )
     db.add(history)
     
     await db.commit()
+    assignment_engine.request_changed(None, RequestLoad.of(request))
+    sla_monitor.track_request(request)
     await db.refresh(request)
     
     return {
@@ -277,13 +402,44 @@ async def create_request(
     }
 
 
+def request_representation(request: MaintenanceRequest) -> dict:
+    """Response body for a single request (without nested objects)."""
+    return {
+        **request.__dict__,
+        'is_overdue': compute_is_overdue(request.scheduled_date, request.status),
+        'priority_label': PRIORITY_LABELS.get(request.priority, "Normal")
+    }
+
+
+async def request_conflict(db: AsyncSession, request_id: UUID) -> HTTPException:
+    """409 with the request as it is now."""
+    result = await db.execute(
+        select(MaintenanceRequest)
+        .where(MaintenanceRequest.id == request_id)
+        .execution_options(populate_existing=True)
+    )
+    request = result.scalar_one_or_none()
+    if not request:
+        return HTTPException(status_code=404, detail="Request not found")
+    return version_conflict(RequestResponse.model_validate(request_representation(request)))
+
+
 @router.patch("/{request_id}", response_model=RequestResponse)
 async def update_request(
     request_id: UUID,
     request_data: RequestUpdate,
+    expected_version: Optional[int] = Depends(get_expected_version),
+    claims: TokenClaims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update a request."""
+    """
+    Update a request.
+    
+    Technicians may only edit their teams' requests (checked from token
+    claims). Send the version last seen as `If-Match: "<version>"` (or the
+    ETag of GET /requests/{id}, or `expected_version`) to get 409 with the
+    current request instead of overwriting someone else's changes.
+    """
     result = await db.execute(
         select(MaintenanceRequest).where(MaintenanceRequest.id == request_id)
     )
@@ -292,94 +448,129 @@ async def update_request(
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
+    ensure_team_access(claims, request.maintenance_team_id)
+    if 'maintenance_team_id' in request_data.model_fields_set:
+        ensure_team_access(claims, request_data.maintenance_team_id)
+    
+    if expected_version is not None and request.version != expected_version:
+        raise version_conflict(RequestResponse.model_validate(request_representation(request)))
+    
+    old_load = RequestLoad.of(request)
+    
     # Update only provided fields
     update_data = request_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(request, field, value)
     
-    await db.commit()
+    # Priority, team or schedule changes move the SLA deadlines
+    if request.status in OPEN_STATUSES and update_data.keys() & {'priority', 'maintenance_team_id', 'scheduled_date'}:
+        deadlines = await sla_deadlines(
+            db, request.priority, request.maintenance_team_id,
+            clock_start(request.created_at or datetime.now(), request.scheduled_date)
+        )
+        for field, value in deadlines.items():
+            setattr(request, field, value)
+    
+    # The UPDATE is guarded by the loaded version (version_id_col)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise await request_conflict(db, request_id)
+    assignment_engine.request_changed(old_load, RequestLoad.of(request))
+    sla_monitor.track_request(request)
     await db.refresh(request)
     
-    is_overdue = compute_is_overdue(request.scheduled_date, request.status)
-    
-    return {
-        **request.__dict__,
-        'is_overdue': is_overdue,
-        'priority_label': PRIORITY_LABELS.get(request.priority, "Normal")
-    }
+    return request_representation(request)
 
 
 @router.patch("/{request_id}/stage", response_model=RequestResponse)
 async def update_stage(
     request_id: UUID,
     stage_data: RequestStageUpdate,
-    changed_by: UUID = Query(..., description="User ID making the change"),
+    claims: TokenClaims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update request stage (for Kanban drag-drop)."""
-    result = await db.execute(
-        select(MaintenanceRequest).where(MaintenanceRequest.id == request_id)
-    )
-    request = result.scalar_one_or_none()
-    
-    if not request:
+    """
+    Update request stage (for Kanban drag-drop).
+    
+    Technicians may only move their teams' requests (checked from token
+    claims; managers and admins skip the team lookup).
+    
+    The transition is a single compare-and-set statement checked against
+    the workflow table (the history entry is written by the same
+    statement); other side effects are queued in the outbox in the same
+    commit. Returns 409 if the request's current stage does not allow
+    the move, e.g. because someone else moved the card first.
+    """
+    if claims.role not in ("admin", "manager"):
+        result = await db.execute(
+            select(MaintenanceRequest.maintenance_team_id).where(MaintenanceRequest.id == request_id)
+        )
+        team_id = result.one_or_none()
+        if team_id is None:
+            raise HTTPException(status_code=404, detail="Request not found")
+        ensure_team_access(claims, team_id[0])
+    changed_by = claims.user_id
+    
+    try:
+        transition = await transition_request(
+            db, request_id, stage_data.status, changed_by, stage_data.comment
+        )
+    except TransitionNotFound:
         raise HTTPException(status_code=404, detail="Request not found")
+    except TransitionConflict as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
     
-    old_stage = request.status
-    new_stage = stage_data.status
-    
-    # Update stage
-    request.status = new_stage
-    
-    # Update timestamps
-    if new_stage == 'in_progress' and not request.started_at:
-        request.started_at = datetime.now()
-    elif new_stage in ('repaired', 'scrap') and not request.completed_at:
-        request.completed_at = datetime.now()
-    
-    # Log stage change
-    history = RequestHistory(
-        request_id=request_id,
-        from_stage=old_stage,
-        to_stage=new_stage,
-        changed_by=changed_by,
-        comment=stage_data.comment,
-        duration_at_change=request.duration_hours
-    )
-    db.add(history)
+    request = transition.row
+    new_stage = request['status']
     
-    # Handle scrap logic - update equipment status
-    if new_stage == 'scrap' and request.equipment_id:
-        eq_result = await db.execute(
-            select(Equipment).where(Equipment.id == request.equipment_id)
+    # Reopened: the SLA clock starts again
+    if new_stage == 'new':
+        deadlines = await sla_deadlines(
+            db, request['priority'], request['maintenance_team_id'], datetime.now()
         )
-        equipment = eq_result.scalar_one_or_none()
-        
-        if equipment:
-            equipment.status = 'scrapped'
-            
-            # Create scrap log
-            scrap_log = EquipmentScrapLog(
-                equipment_id=equipment.id,
-                request_id=request_id,
-                scrapped_by=changed_by,
-                reason=f"Scrapped via maintenance request: {request.subject}"
-            )
-            db.add(scrap_log)
+        await db.execute(
+            update(MaintenanceRequest).where(MaintenanceRequest.id == request_id).values(**deadlines)
+        )
+        request.update(deadlines)
+    
+    # Side effects (e.g. scrapping the equipment) run from the outbox,
+    # committed together with the transition
+    enqueue(db, REQUEST_STAGE_CHANGED, {
+        'request_id': request_id,
+        'subject': request['subject'],
+        'equipment_id': request['equipment_id'],
+        'from_status': transition.from_status,
+        'to_status': new_stage,
+        'changed_by': changed_by,
+    })
     
     await db.commit()
-    await db.refresh(request)
+    outbox_consumer.wake()
+    assignment_engine.request_changed(
+        RequestLoad(request['assigned_to'], request['priority'], transition.from_status),
+        RequestLoad(request['assigned_to'], request['priority'], new_stage),
+    )
+    sla_monitor.track(
+        request_id, new_stage,
+        request['response_due_at'], request['resolution_due_at'],
+        request['response_breached_at'], request['resolution_breached_at'],
+    )
     
-    is_overdue = compute_is_overdue(request.scheduled_date, request.status)
+    is_overdue = compute_is_overdue(request['scheduled_date'], new_stage)
     
     return {
-        **request.__dict__,
+        **request,
         'is_overdue': is_overdue,
-        'priority_label': PRIORITY_LABELS.get(request.priority, "Normal")
+        'priority_label': PRIORITY_LABELS.get(request['priority'], "Normal")
     }
 
 
-@router.delete("/{request_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{request_id}", status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(get_current_manager_or_admin)]
+)
 async def delete_request(request_id: UUID, db: AsyncSession = Depends(get_db)):
     """Delete a request."""
     result = await db.execute(
@@ -390,14 +581,17 @@ async def delete_request(request_id: UUID, db: AsyncSession = Depends(get_db)):
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
+    old_load = RequestLoad.of(request)
     await db.delete(request)
     await db.commit()
+    assignment_engine.request_changed(old_load, None)
+    sla_monitor.forget(request_id)
     
     return None
 
 
 @router.get("/{request_id}/history", response_model=List[dict])
-async def get_request_history(request_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_request_history(request_id: UUID, db: AsyncSession = Depends(get_read_db)):
     """Get stage change history for a request."""
     query = select(RequestHistory).where(
         RequestHistory.request_id == request_id
@@ -0,0 +1,131 @@
+"""Maintenance Schedules API routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from typing import Optional
+from uuid import UUID
+
+from app.db.session import get_db
+from app.db.replica import get_read_db
+from app.db.models import MaintenanceSchedule, Equipment
+from app.core.schedules import generate_scheduled_requests
+from app.core.assignment import assignment_engine
+from app.core.deps import get_current_manager_or_admin
+from app.schemas.maintenance_schedule import (
+    ScheduleCreate, ScheduleUpdate, ScheduleResponse, ScheduleList, ScheduleGenerationResult
+)
+
+router = APIRouter()
+
+
+async def get_schedule_or_404(db: AsyncSession, schedule_id: UUID) -> MaintenanceSchedule:
+    result = await db.execute(select(MaintenanceSchedule).where(MaintenanceSchedule.id == schedule_id))
+    schedule = result.scalar_one_or_none()
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return schedule
+
+
+@router.get("/", response_model=ScheduleList)
+async def list_schedules(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    equipment_id: Optional[UUID] = None,
+    category: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List maintenance schedules with optional filtering."""
+    filters = []
+    if equipment_id:
+        filters.append(MaintenanceSchedule.equipment_id == equipment_id)
+    if category:
+        filters.append(MaintenanceSchedule.category == category)
+    if is_active is not None:
+        filters.append(MaintenanceSchedule.is_active == is_active)
+    
+    total = await db.scalar(
+        select(func.count()).select_from(MaintenanceSchedule).where(*filters)
+    )
+    result = await db.execute(
+        select(MaintenanceSchedule).where(*filters)
+        .order_by(MaintenanceSchedule.name).offset(skip).limit(limit)
+    )
+    
+    return ScheduleList(items=result.scalars().all(), total=total or 0, skip=skip, limit=limit)
+
+
+@router.post("/generate", response_model=ScheduleGenerationResult, dependencies=[Depends(get_current_manager_or_admin)])
+async def generate_schedules(
+    horizon_days: Optional[int] = Query(None, ge=0, le=730, description="Defaults to each schedule's lead time"),
+    schedule_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Materialize upcoming occurrences into preventive requests in one batch.
+    
+    Idempotent: occurrences that already have a request are skipped.
+    """
+    outcome = await generate_scheduled_requests(db, horizon_days=horizon_days, schedule_id=schedule_id)
+    await db.commit()
+    assignment_engine.requests_created(outcome.loads)
+    
+    return ScheduleGenerationResult(
+        schedules=outcome.schedules,
+        occurrences=outcome.occurrences,
+        created=outcome.created,
+        horizon_days=horizon_days,
+    )
+
+
+@router.post("/", response_model=ScheduleResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_manager_or_admin)])
+async def create_schedule(schedule_data: ScheduleCreate, db: AsyncSession = Depends(get_db)):
+    """Create a recurring schedule for one equipment or a whole category."""
+    if schedule_data.equipment_id:
+        exists = await db.scalar(select(Equipment.id).where(Equipment.id == schedule_data.equipment_id))
+        if not exists:
+            raise HTTPException(status_code=404, detail="Equipment not found")
+    
+    schedule = MaintenanceSchedule(**schedule_data.model_dump())
+    db.add(schedule)
+    await db.commit()
+    await db.refresh(schedule)
+    
+    return schedule
+
+
+@router.get("/{schedule_id}", response_model=ScheduleResponse)
+async def get_schedule(schedule_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Get a single schedule by ID."""
+    return await get_schedule_or_404(db, schedule_id)
+
+
+@router.patch("/{schedule_id}", response_model=ScheduleResponse, dependencies=[Depends(get_current_manager_or_admin)])
+async def update_schedule(
+    schedule_id: UUID,
+    schedule_data: ScheduleUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a schedule; already generated requests are left as they are."""
+    schedule = await get_schedule_or_404(db, schedule_id)
+    
+    for field, value in schedule_data.model_dump(exclude_unset=True).items():
+        setattr(schedule, field, value)
+    if schedule.end_date is not None and schedule.end_date < schedule.start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    
+    await db.commit()
+    await db.refresh(schedule)
+    
+    return schedule
+
+
+@router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_manager_or_admin)])
+async def delete_schedule(schedule_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Delete a schedule; requests generated from it are kept."""
+    schedule = await get_schedule_or_404(db, schedule_id)
+    await db.delete(schedule)
+    await db.commit()
+    
+    return None
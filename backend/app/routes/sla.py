@@ -0,0 +1,76 @@
+"""SLA Policies API routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
+from uuid import UUID
+
+from app.db.session import get_db
+from app.db.models import SlaPolicy
+from app.core.deps import get_current_manager_or_admin
+from app.schemas.sla import SlaPolicyCreate, SlaPolicyUpdate, SlaPolicyResponse, SlaPolicyList
+
+router = APIRouter()
+
+
+async def get_policy_or_404(db: AsyncSession, policy_id: UUID) -> SlaPolicy:
+    result = await db.execute(select(SlaPolicy).where(SlaPolicy.id == policy_id))
+    policy = result.scalar_one_or_none()
+    if not policy:
+        raise HTTPException(status_code=404, detail="SLA policy not found")
+    return policy
+
+
+@router.get("/", response_model=SlaPolicyList)
+async def list_policies(maintenance_team_id: Optional[UUID] = None, db: AsyncSession = Depends(get_db)):
+    """List SLA policies (defaults first, then per team)."""
+    query = select(SlaPolicy).order_by(
+        SlaPolicy.maintenance_team_id.isnot(None), SlaPolicy.maintenance_team_id, SlaPolicy.priority
+    )
+    if maintenance_team_id:
+        query = query.where(SlaPolicy.maintenance_team_id == maintenance_team_id)
+    result = await db.execute(query)
+    
+    return SlaPolicyList(items=result.scalars().all())
+
+
+@router.post("/", response_model=SlaPolicyResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_manager_or_admin)])
+async def create_policy(policy_data: SlaPolicyCreate, db: AsyncSession = Depends(get_db)):
+    """Create the policy for a priority (and team)."""
+    policy = SlaPolicy(**policy_data.model_dump())
+    db.add(policy)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A policy for this priority and team already exists"
+        )
+    await db.refresh(policy)
+    
+    return policy
+
+
+@router.patch("/{policy_id}", response_model=SlaPolicyResponse, dependencies=[Depends(get_current_manager_or_admin)])
+async def update_policy(policy_id: UUID, policy_data: SlaPolicyUpdate, db: AsyncSession = Depends(get_db)):
+    """Update a policy's targets; existing deadlines are not moved."""
+    policy = await get_policy_or_404(db, policy_id)
+    policy.response_minutes = policy_data.response_minutes
+    policy.resolution_minutes = policy_data.resolution_minutes
+    await db.commit()
+    await db.refresh(policy)
+    
+    return policy
+
+
+@router.delete("/{policy_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_manager_or_admin)])
+async def delete_policy(policy_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Delete a policy; the priority's default applies to the team again."""
+    policy = await get_policy_or_404(db, policy_id)
+    await db.delete(policy)
+    await db.commit()
+    
+    return None
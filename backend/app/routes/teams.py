@@ -1,63 +1,257 @@
 """Maintenance Teams API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete, and_, exists, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
+from datetime import datetime
 from uuid import UUID
 
 from app.db.session import get_db
-from app.db.models import MaintenanceTeam, TeamMember, User
+from app.db.replica import get_read_db
+from app.db.models import MaintenanceTeam, TeamMember, User, MaintenanceRequest
+from app.core.etag import conditional_get, table_stamp
+from app.core.team_cache import team_membership_cache
+from app.core.assignment import assignment_engine, is_assignable
+from app.core.tokens import bump_token_versions, note_token_versions
+from app.core.batch import get_batch_ids, id_in, keyed
+from app.core.deps import get_current_manager_or_admin
 from app.schemas.maintenance_team import (
-    TeamCreate, TeamUpdate, TeamResponse, TeamDetail, TeamList,
-    TeamMemberCreate, TeamMemberResponse
+    TeamCreate, TeamUpdate, TeamResponse, TeamDetail, TeamList, TeamBatch,
+    TeamMemberCreate, TeamMemberResponse, TeamWorkload, MemberWorkload,
+    TeamMemberBase, TeamMembershipSync, TeamMembershipSyncResult
 )
 
 router = APIRouter()
 
 
+def team_stamps(*criteria) -> list:
+    """
+    Validator stamps for team responses.
+
+    team_members has no updated_at; membership changes touch the parent
+    team's updated_at instead (see touch_team).
+    """
+    return [
+        table_stamp(MaintenanceTeam, *criteria),
+        table_stamp(User),
+    ]
+
+
+def member_counts_subquery():
+    """Member count per team as one grouped subquery (join on team_id)."""
+    return select(
+        TeamMember.team_id,
+        func.count().label("member_count")
+    ).group_by(TeamMember.team_id).subquery()
+
+
+def teams_with_member_counts(*criteria):
+    """Select (MaintenanceTeam, member_count) rows for teams matching the criteria."""
+    member_counts = member_counts_subquery()
+    return select(
+        MaintenanceTeam,
+        func.coalesce(member_counts.c.member_count, 0).label("member_count")
+    ).outerjoin(
+        member_counts, member_counts.c.team_id == MaintenanceTeam.id
+    ).where(*criteria).options(
+        selectinload(MaintenanceTeam.team_lead)
+    )
+
+
+def request_counts_columns(now: datetime) -> list:
+    """Aggregate columns for open/in-progress/overdue counts over open requests."""
+    return [
+        func.count().filter(MaintenanceRequest.status == 'new').label("new_count"),
+        func.count().filter(MaintenanceRequest.status == 'in_progress').label("in_progress_count"),
+        func.count().filter(MaintenanceRequest.scheduled_date < now).label("overdue_count"),
+    ]
+
+
+async def touch_team(db: AsyncSession, team_id: UUID) -> None:
+    """Bump a team's updated_at so cached team representations are invalidated."""
+    await db.execute(
+        update(MaintenanceTeam).where(MaintenanceTeam.id == team_id).values(updated_at=func.now())
+    )
+
+
 @router.get("/", response_model=TeamList)
 async def list_teams(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all maintenance teams."""
-    query = select(MaintenanceTeam).options(
-        selectinload(MaintenanceTeam.team_lead)
-    )
-    
-    if search:
-        query = query.where(MaintenanceTeam.name.ilike(f"%{search}%"))
+    filters = [MaintenanceTeam.name.ilike(f"%{search}%")] if search else []
+    not_modified = await conditional_get(db, request, response, team_stamps(*filters))
+    if not_modified:
+        return not_modified
     
     # Count total
-    count_query = select(func.count()).select_from(query.subquery())
+    count_query = select(func.count()).select_from(
+        select(MaintenanceTeam.id).where(*filters).subquery()
+    )
     total = await db.scalar(count_query)
     
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
+    # Apply pagination; member counts come from one grouped subquery
+    query = teams_with_member_counts(*filters).offset(skip).limit(limit)
     result = await db.execute(query)
-    teams = result.scalars().all()
     
-    # Add member count
-    response_items = []
-    for team in teams:
-        member_count = await db.scalar(
-            select(func.count()).where(TeamMember.team_id == team.id)
-        )
-        response_items.append({
-            **team.__dict__,
-            'member_count': member_count or 0
-        })
+    response_items = [
+        {**team.__dict__, 'member_count': member_count}
+        for team, member_count in result.all()
+    ]
     
     return TeamList(items=response_items, total=total or 0, skip=skip, limit=limit)
 
 
+@router.get("/workload", response_model=List[TeamWorkload])
+async def get_team_workload(db: AsyncSession = Depends(get_db)):
+    """
+    Get open work per team and per team member.
+    
+    Team counts cover all open requests of the team; member counts cover
+    the team's open requests assigned to that member. Everything comes
+    from a single statement: teams joined to members and to two grouped
+    aggregates over open requests.
+    """
+    now = datetime.now()
+    open_requests = MaintenanceRequest.status.in_(['new', 'in_progress'])
+    
+    team_agg = select(
+        MaintenanceRequest.maintenance_team_id.label("team_id"),
+        *request_counts_columns(now)
+    ).where(
+        open_requests,
+        MaintenanceRequest.maintenance_team_id.isnot(None)
+    ).group_by(MaintenanceRequest.maintenance_team_id).subquery()
+    
+    member_agg = select(
+        MaintenanceRequest.maintenance_team_id.label("team_id"),
+        MaintenanceRequest.assigned_to.label("user_id"),
+        *request_counts_columns(now)
+    ).where(
+        open_requests,
+        MaintenanceRequest.maintenance_team_id.isnot(None),
+        MaintenanceRequest.assigned_to.isnot(None)
+    ).group_by(
+        MaintenanceRequest.maintenance_team_id, MaintenanceRequest.assigned_to
+    ).subquery()
+    
+    query = select(
+        MaintenanceTeam.id.label("team_id"),
+        MaintenanceTeam.name.label("team_name"),
+        MaintenanceTeam.color,
+        func.coalesce(team_agg.c.new_count, 0).label("new_count"),
+        func.coalesce(team_agg.c.in_progress_count, 0).label("in_progress_count"),
+        func.coalesce(team_agg.c.overdue_count, 0).label("overdue_count"),
+        TeamMember.user_id,
+        TeamMember.role,
+        User.name.label("user_name"),
+        User.avatar_url,
+        func.coalesce(member_agg.c.new_count, 0).label("member_new_count"),
+        func.coalesce(member_agg.c.in_progress_count, 0).label("member_in_progress_count"),
+        func.coalesce(member_agg.c.overdue_count, 0).label("member_overdue_count"),
+    ).select_from(MaintenanceTeam).outerjoin(
+        team_agg, team_agg.c.team_id == MaintenanceTeam.id
+    ).outerjoin(
+        TeamMember, TeamMember.team_id == MaintenanceTeam.id
+    ).outerjoin(
+        User, User.id == TeamMember.user_id
+    ).outerjoin(
+        member_agg, and_(
+            member_agg.c.team_id == MaintenanceTeam.id,
+            member_agg.c.user_id == TeamMember.user_id
+        )
+    ).order_by(MaintenanceTeam.name, User.name)
+    
+    result = await db.execute(query)
+    
+    # One row per (team, member); teams without members yield a single row
+    teams = {}
+    for row in result.all():
+        team = teams.get(row.team_id)
+        if team is None:
+            team = teams[row.team_id] = TeamWorkload(
+                team_id=row.team_id,
+                team_name=row.team_name,
+                color=row.color,
+                open_count=row.new_count + row.in_progress_count,
+                new_count=row.new_count,
+                in_progress_count=row.in_progress_count,
+                overdue_count=row.overdue_count,
+                members=[]
+            )
+        if row.user_id is not None:
+            team.members.append(MemberWorkload(
+                user_id=row.user_id,
+                name=row.user_name,
+                avatar_url=row.avatar_url,
+                role=row.role or "member",
+                assigned_open_count=row.member_new_count + row.member_in_progress_count,
+                in_progress_count=row.member_in_progress_count,
+                overdue_count=row.member_overdue_count
+            ))
+    
+    return list(teams.values())
+
+
+@router.get("/batch", response_model=TeamBatch)
+async def get_teams_batch(
+    request: Request,
+    response: Response,
+    ids: List[UUID] = Depends(get_batch_ids),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get many teams with their members by ID in one call, keyed by ID."""
+    not_modified = await conditional_get(db, request, response, team_stamps(id_in(MaintenanceTeam.id, ids)))
+    if not_modified:
+        return not_modified
+    
+    query = select(MaintenanceTeam).where(id_in(MaintenanceTeam.id, ids)).options(
+        selectinload(MaintenanceTeam.team_lead)
+    )
+    result = await db.execute(query)
+    teams = result.scalars().all()
+    
+    # Members of all the teams in one query
+    members_query = select(TeamMember).where(id_in(TeamMember.team_id, ids)).options(
+        selectinload(TeamMember.user)
+    )
+    members_by_team = {}
+    for member in (await db.execute(members_query)).scalars().all():
+        members_by_team.setdefault(member.team_id, []).append(member)
+    
+    return keyed(ids, {
+        team.id: {
+            **team.__dict__,
+            'member_count': len(members_by_team.get(team.id, [])),
+            'members': members_by_team.get(team.id, [])
+        }
+        for team in teams
+    })
+
+
 @router.get("/{team_id}", response_model=TeamDetail)
-async def get_team(team_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_team(
+    team_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
     """Get a single team with its members."""
+    not_modified = await conditional_get(
+        db, request, response, team_stamps(MaintenanceTeam.id == team_id),
+        exists=exists().where(MaintenanceTeam.id == team_id)
+    )
+    if not_modified:
+        return not_modified
+    
     query = select(MaintenanceTeam).where(MaintenanceTeam.id == team_id).options(
         selectinload(MaintenanceTeam.team_lead)
     )
@@ -83,7 +277,7 @@ async def get_team(team_id: UUID, db: AsyncSession = Depends(get_db)):
     }
 
 
-@router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_manager_or_admin)])
 async def create_team(team_data: TeamCreate, db: AsyncSession = Depends(get_db)):
     """Create a new maintenance team."""
     # Check if name already exists
@@ -101,7 +295,7 @@ async def create_team(team_data: TeamCreate, db: AsyncSession = Depends(get_db))
     return {**team.__dict__, 'member_count': 0}
 
 
-@router.patch("/{team_id}", response_model=TeamResponse)
+@router.patch("/{team_id}", response_model=TeamResponse, dependencies=[Depends(get_current_manager_or_admin)])
 async def update_team(
     team_id: UUID,
     team_data: TeamUpdate,
@@ -120,16 +314,17 @@ async def update_team(
         setattr(team, field, value)
     
     await db.commit()
-    await db.refresh(team)
     
-    member_count = await db.scalar(
-        select(func.count()).where(TeamMember.team_id == team.id)
+    # Reload the team together with its member count in one query
+    result = await db.execute(
+        teams_with_member_counts(MaintenanceTeam.id == team_id).execution_options(populate_existing=True)
     )
+    team, member_count = result.one()
     
-    return {**team.__dict__, 'member_count': member_count or 0}
+    return {**team.__dict__, 'member_count': member_count}
 
 
-@router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_manager_or_admin)])
 async def delete_team(team_id: UUID, db: AsyncSession = Depends(get_db)):
     """Delete a team."""
     result = await db.execute(select(MaintenanceTeam).where(MaintenanceTeam.id == team_id))
@@ -138,16 +333,37 @@ async def delete_team(team_id: UUID, db: AsyncSession = Depends(get_db)):
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
+    # Members' tokens carry this team id; make them refresh
+    member_ids = await db.execute(select(TeamMember.user_id).where(TeamMember.team_id == team_id))
+    bumped = await bump_token_versions(db, member_ids.scalars().all())
+    
     await db.delete(team)
     await db.commit()
+    note_token_versions(bumped)
+    
+    # Memberships are removed by cascade; we don't know whose, so drop all
+    team_membership_cache.clear()
+    assignment_engine.remove_team(team_id)
     
     return None
 
 
 # Team Members endpoints
 @router.get("/{team_id}/members", response_model=List[TeamMemberResponse])
-async def list_team_members(team_id: UUID, db: AsyncSession = Depends(get_db)):
+async def list_team_members(
+    team_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
     """List all members of a team."""
+    not_modified = await conditional_get(
+        db, request, response, team_stamps(MaintenanceTeam.id == team_id),
+        exists=exists().where(MaintenanceTeam.id == team_id)
+    )
+    if not_modified:
+        return not_modified
+    
     # Verify team exists
     team_result = await db.execute(select(MaintenanceTeam).where(MaintenanceTeam.id == team_id))
     if not team_result.scalar_one_or_none():
@@ -160,7 +376,98 @@ async def list_team_members(team_id: UUID, db: AsyncSession = Depends(get_db)):
     return result.scalars().all()
 
 
-@router.post("/{team_id}/members", response_model=TeamMemberResponse, status_code=status.HTTP_201_CREATED)
+@router.put("/{team_id}/members", response_model=TeamMembershipSyncResult, dependencies=[Depends(get_current_manager_or_admin)])
+async def sync_team_members(
+    team_id: UUID,
+    sync_data: TeamMembershipSync,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Replace a team's membership with the given list.
+    
+    Members not in the list are removed, new ones are inserted and existing
+    ones get their role updated. The diff is computed by Postgres with one
+    DELETE ... RETURNING and one INSERT ... ON CONFLICT DO UPDATE ...
+    RETURNING, all in a single transaction.
+    """
+    # Lock the team row so concurrent syncs of the same team serialize
+    team_result = await db.execute(
+        select(MaintenanceTeam.id).where(MaintenanceTeam.id == team_id).with_for_update()
+    )
+    if team_result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    
+    desired = {member.user_id: member.role for member in sync_data.members}
+    
+    # Verify users exist
+    assignable = set()
+    if desired:
+        existing_users = (await db.execute(
+            select(User.id, User.is_active, User.is_technician).where(User.id.in_(list(desired)))
+        )).all()
+        assignable = {user.id for user in existing_users if is_assignable(user)}
+        missing = set(desired) - {user.id for user in existing_users}
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Users not found: {', '.join(sorted(str(u) for u in missing))}"
+            )
+    
+    # Remove members that are not in the desired list
+    removed_result = await db.execute(
+        delete(TeamMember).where(
+            TeamMember.team_id == team_id,
+            TeamMember.user_id.notin_(list(desired))
+        ).returning(TeamMember.user_id)
+    )
+    removed = list(removed_result.scalars().all())
+    
+    # Insert new members and update changed roles; unchanged rows are skipped
+    added, updated = [], []
+    if desired:
+        stmt = pg_insert(TeamMember).values([
+            {"team_id": team_id, "user_id": user_id, "role": role}
+            for user_id, role in desired.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TeamMember.team_id, TeamMember.user_id],
+            set_={"role": stmt.excluded.role},
+            where=TeamMember.role.is_distinct_from(stmt.excluded.role)
+        ).returning(
+            TeamMember.user_id,
+            TeamMember.role,
+            # xmax is 0 for freshly inserted rows, non-zero for updated ones
+            (literal_column("xmax") == 0).label("inserted")
+        )
+        for row in (await db.execute(stmt)).all():
+            change = TeamMemberBase(user_id=row.user_id, role=row.role)
+            (added if row.inserted else updated).append(change)
+    
+    bumped = await bump_token_versions(db, [*removed, *(member.user_id for member in added)])
+    if added or updated or removed:
+        await touch_team(db, team_id)
+    await db.commit()
+    note_token_versions(bumped)
+    
+    team_membership_cache.invalidate(*removed, *(member.user_id for member in added))
+    for user_id in removed:
+        assignment_engine.remove_member(team_id, user_id)
+    for member in added:
+        if member.user_id in assignable:
+            assignment_engine.add_member(team_id, member.user_id)
+    
+    return TeamMembershipSyncResult(
+        added=added,
+        updated=updated,
+        removed=removed,
+        member_count=len(desired)
+    )
+
+
+@router.post(
+    "/{team_id}/members", response_model=TeamMemberResponse, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_manager_or_admin)]
+)
 async def add_team_member(
     team_id: UUID,
     member_data: TeamMemberCreate,
@@ -174,7 +481,8 @@ async def add_team_member(
     
     # Verify user exists
     user_result = await db.execute(select(User).where(User.id == member_data.user_id))
-    if not user_result.scalar_one_or_none():
+    user = user_result.scalar_one_or_none()
+    if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if already a member
@@ -189,13 +497,19 @@ async def add_team_member(
     
     member = TeamMember(team_id=team_id, **member_data.model_dump())
     db.add(member)
+    await touch_team(db, team_id)
+    bumped = await bump_token_versions(db, [member_data.user_id])
     await db.commit()
+    note_token_versions(bumped)
+    team_membership_cache.invalidate(member.user_id)
+    if is_assignable(user):
+        assignment_engine.add_member(team_id, member.user_id)
     await db.refresh(member)
     
     return member
 
 
-@router.delete("/{team_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{team_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_manager_or_admin)])
 async def remove_team_member(
     team_id: UUID,
     user_id: UUID,
@@ -214,6 +528,11 @@ async def remove_team_member(
         raise HTTPException(status_code=404, detail="Team member not found")
     
     await db.delete(member)
+    await touch_team(db, team_id)
+    bumped = await bump_token_versions(db, [user_id])
     await db.commit()
+    note_token_versions(bumped)
+    team_membership_cache.invalidate(user_id)
+    assignment_engine.remove_member(team_id, user_id)
     
     return None
@@ -1,34 +1,49 @@
 """Users API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, exists
 from typing import List, Optional
 from uuid import UUID
 
 from app.db.session import get_db
-from app.db.models import User
-from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserList
+from app.db.replica import get_read_db
+from app.db.models import User, TeamMember
+from app.core.etag import conditional_get, table_stamp
+from app.core.assignment import assignment_engine, is_assignable
+from app.core.deps import invalidate_principal, get_current_admin
+from app.core.tokens import note_token_version
+from app.core.revocation import revocation_list, revoke_user_tokens
+from app.core.batch import get_batch_ids, id_in, keyed
+from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserList, UserBatch
 
 router = APIRouter()
 
 
 @router.get("/", response_model=UserList)
 async def list_users(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     is_technician: Optional[bool] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all users with optional filtering."""
-    query = select(User).where(User.is_active == True)
+    filters = [User.is_active == True]
     
     if is_technician is not None:
-        query = query.where(User.is_technician == is_technician)
+        filters.append(User.is_technician == is_technician)
     
     if search:
-        query = query.where(User.name.ilike(f"%{search}%"))
+        filters.append(User.name.ilike(f"%{search}%"))
+    
+    not_modified = await conditional_get(db, request, response, [table_stamp(User, *filters)])
+    if not_modified:
+        return not_modified
+    
+    query = select(User).where(*filters)
     
     # Count total
     count_query = select(func.count()).select_from(query.subquery())
@@ -43,19 +58,53 @@ async def list_users(
 
 
 @router.get("/technicians", response_model=List[UserResponse])
-async def list_technicians(db: AsyncSession = Depends(get_db)):
+async def list_technicians(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
     """List all technicians (for assignment dropdowns)."""
-    query = select(User).where(
-        User.is_active == True,
-        User.is_technician == True
-    )
+    filters = [User.is_active == True, User.is_technician == True]
+    not_modified = await conditional_get(db, request, response, [table_stamp(User, *filters)])
+    if not_modified:
+        return not_modified
+    
+    query = select(User).where(*filters)
     result = await db.execute(query)
     return result.scalars().all()
 
 
+@router.get("/batch", response_model=UserBatch)
+async def get_users_batch(
+    request: Request,
+    response: Response,
+    ids: List[UUID] = Depends(get_batch_ids),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get many users by ID in one call, keyed by ID."""
+    not_modified = await conditional_get(db, request, response, [table_stamp(User, id_in(User.id, ids))])
+    if not_modified:
+        return not_modified
+    
+    result = await db.execute(select(User).where(id_in(User.id, ids)))
+    return keyed(ids, {user.id: user for user in result.scalars().all()})
+
+
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_user(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
     """Get a single user by ID."""
+    not_modified = await conditional_get(
+        db, request, response, [table_stamp(User, User.id == user_id)],
+        exists=exists().where(User.id == user_id)
+    )
+    if not_modified:
+        return not_modified
+    
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
@@ -65,7 +114,7 @@ async def get_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
     return user
 
 
-@router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(get_current_admin)])
 async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Create a new user."""
     # Check if email already exists
@@ -81,7 +130,7 @@ async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db))
     return user
 
 
-@router.patch("/{user_id}", response_model=UserResponse)
+@router.patch("/{user_id}", response_model=UserResponse, dependencies=[Depends(get_current_admin)])
 async def update_user(
     user_id: UUID,
     user_data: UserUpdate,
@@ -96,16 +145,45 @@ async def update_user(
     
     # Update only provided fields
     update_data = user_data.model_dump(exclude_unset=True)
+    claims_changed = any(
+        field in update_data and update_data[field] != getattr(user, field)
+        for field in ('role', 'is_active')
+    )
+    assignable_changed = any(
+        field in update_data and update_data[field] != getattr(user, field)
+        for field in ('is_active', 'is_technician')
+    )
     for field, value in update_data.items():
         setattr(user, field, value)
     
+    # Role and active flag are token claims; make outstanding tokens refresh
+    token_version = None
+    if claims_changed:
+        token_version = user.token_version = (user.token_version or 0) + 1
+    
+    # Deactivation revokes every outstanding token, in all workers
+    revocation = None
+    if claims_changed and update_data.get('is_active') is False:
+        revocation = await revoke_user_tokens(db, user_id)
+    
     await db.commit()
+    invalidate_principal(user_id)
+    if token_version is not None:
+        note_token_version(user_id, token_version)
+    if revocation is not None:
+        revocation_list.apply(revocation)
+    if assignable_changed:
+        if is_assignable(user):
+            team_ids = await db.execute(select(TeamMember.team_id).where(TeamMember.user_id == user_id))
+            assignment_engine.add_user(user_id, team_ids.scalars().all())
+        else:
+            assignment_engine.remove_user(user_id)
     await db.refresh(user)
     
     return user
 
 
-@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_admin)])
 async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
     """Soft delete a user (set is_active to False)."""
     result = await db.execute(select(User).where(User.id == user_id))
@@ -115,6 +193,12 @@ async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found")
     
     user.is_active = False
+    token_version = user.token_version = (user.token_version or 0) + 1
+    revocation = await revoke_user_tokens(db, user_id)
     await db.commit()
+    invalidate_principal(user_id)
+    note_token_version(user_id, token_version)
+    revocation_list.apply(revocation)
+    assignment_engine.remove_user(user_id)
     
     return None
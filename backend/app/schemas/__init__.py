@@ -4,21 +4,24 @@ Pydantic schemas for GearGuard API.
 These schemas define the request/response models for the API endpoints.
 """
 
-from .user import UserCreate, UserUpdate, UserResponse, UserList, UserBrief
-from .equipment import EquipmentCreate, EquipmentUpdate, EquipmentResponse, EquipmentList, EquipmentBrief
-from .maintenance_team import TeamCreate, TeamUpdate, TeamResponse, TeamList
-from .maintenance_request import RequestCreate, RequestUpdate, RequestResponse, RequestList, RequestKanban
+from .user import UserCreate, UserUpdate, UserResponse, UserList, UserBatch, UserBrief
+from .equipment import EquipmentCreate, EquipmentUpdate, EquipmentResponse, EquipmentList, EquipmentBatch, EquipmentBrief
+from .maintenance_team import TeamCreate, TeamUpdate, TeamResponse, TeamList, TeamBatch
+from .maintenance_request import RequestCreate, RequestUpdate, RequestResponse, RequestList, RequestBatch, RequestKanban
+from .maintenance_schedule import ScheduleCreate, ScheduleUpdate, ScheduleResponse, ScheduleList
 from .dashboard import DashboardKPIs, ActivityItem
 
 __all__ = [
     # User
-    "UserCreate", "UserUpdate", "UserResponse", "UserList", "UserBrief",
+    "UserCreate", "UserUpdate", "UserResponse", "UserList", "UserBatch", "UserBrief",
     # Equipment
-    "EquipmentCreate", "EquipmentUpdate", "EquipmentResponse", "EquipmentList", "EquipmentBrief",
+    "EquipmentCreate", "EquipmentUpdate", "EquipmentResponse", "EquipmentList", "EquipmentBatch", "EquipmentBrief",
     # Team
-    "TeamCreate", "TeamUpdate", "TeamResponse", "TeamList",
+    "TeamCreate", "TeamUpdate", "TeamResponse", "TeamList", "TeamBatch",
     # Request
-    "RequestCreate", "RequestUpdate", "RequestResponse", "RequestList", "RequestKanban",
+    "RequestCreate", "RequestUpdate", "RequestResponse", "RequestList", "RequestBatch", "RequestKanban",
+    # Schedule
+    "ScheduleCreate", "ScheduleUpdate", "ScheduleResponse", "ScheduleList",
     # Dashboard
     "DashboardKPIs", "ActivityItem",
 ]
@@ -1,4 +1,5 @@
 from typing import Optional
+from uuid import UUID
 from pydantic import BaseModel, EmailStr
 
 
@@ -23,3 +24,37 @@ class AuthResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     message: str
+
+
+class AuthUserResponse(BaseModel):
+    """Authenticated user profile."""
+    id: UUID
+    name: str
+    email: str
+    role: str
+    is_technician: bool = False
+    avatar_url: Optional[str] = None
+    department: Optional[str] = None
+    job_title: Optional[str] = None
+
+
+class LoginResponse(BaseModel):
+    """Response for login/register/refresh: user, access token and refresh token."""
+    user: AuthUserResponse
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int  # Access token lifetime in seconds
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None  # Revoked together with the access token
+
+
+class MessageResponse(BaseModel):
+    message: str
+    success: bool = True
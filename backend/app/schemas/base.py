@@ -1,7 +1,7 @@
 """Base schema utilities."""
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -31,3 +31,8 @@ class PaginatedResponse(BaseModel):
     total: int
     skip: int
     limit: int
+
+
+class BatchResponse(BaseModel):
+    """Base batch GET-by-ids response (items are keyed by id)."""
+    missing: List[UUID] = []
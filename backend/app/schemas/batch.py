@@ -0,0 +1,31 @@
+"""Batch (multiplexed sub-request) schemas."""
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class BatchSubRequest(BaseModel):
+    """A read-only sub-request."""
+    id: Optional[str] = Field(None, max_length=100)  # Echoed back to match responses
+    method: str = Field(default="GET", pattern="^GET$")
+    path: str = Field(..., min_length=1, max_length=2000)  # e.g. "/requests/kanban?team_id=..."
+    headers: Dict[str, str] = {}  # e.g. If-None-Match for this sub-request
+
+
+class BatchRequest(BaseModel):
+    """Sub-requests to run in one round trip."""
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+
+class BatchSubResponse(BaseModel):
+    """Response of one sub-request."""
+    id: Optional[str] = None
+    path: str
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
+
+
+class BatchResult(BaseModel):
+    """Sub-request responses, in request order."""
+    responses: List[BatchSubResponse]
@@ -34,11 +34,21 @@ class OpenRequestsKPI(BaseModel):
     description: str = "Pending and overdue"
 
 
+class SlaKPI(BaseModel):
+    """SLA KPI data."""
+    at_risk_count: int
+    breached_count: int
+    at_risk_window_minutes: int
+    label: str = "SLA"
+    description: str = "Open requests at risk of or past their SLA"
+
+
 class DashboardKPIs(BaseModel):
     """All dashboard KPIs."""
     critical_equipment: CriticalEquipmentKPI
     technician_load: TechnicianLoadKPI
     open_requests: OpenRequestsKPI
+    sla: SlaKPI
     last_updated: datetime
 
 
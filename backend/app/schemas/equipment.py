@@ -1,12 +1,12 @@
 """Equipment Pydantic schemas."""
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
-from .base import BaseSchema, TimestampMixin, PaginatedResponse
+from .base import BaseSchema, TimestampMixin, PaginatedResponse, BatchResponse
 from .user import UserBrief
 
 
@@ -65,6 +65,7 @@ class EquipmentResponse(EquipmentBase, TimestampMixin, BaseSchema):
     assigned_employee_id: Optional[UUID] = None
     maintenance_team_id: Optional[UUID] = None
     default_technician_id: Optional[UUID] = None
+    version: int = 1  # Send back as If-Match / expected_version when updating
     
     # Computed properties
     is_critical: bool = False
@@ -93,6 +94,11 @@ class EquipmentList(PaginatedResponse):
     items: List[EquipmentResponse]
 
 
+class EquipmentBatch(BatchResponse):
+    """Equipment by id (batch GET)."""
+    items: Dict[UUID, EquipmentResponse]
+
+
 class EquipmentHealth(BaseSchema):
     """Equipment health summary for dashboard."""
     total_equipment: int
@@ -100,3 +106,31 @@ class EquipmentHealth(BaseSchema):
     maintenance_count: int  # status = maintenance
     healthy_count: int  # health >= 70%
     average_health: float
+
+
+class EquipmentWarrantyItem(BaseSchema):
+    """Equipment with a warranty expiring soon."""
+    id: UUID
+    name: str
+    serial_number: str
+    category: str
+    department: Optional[str] = None
+    location: Optional[str] = None
+    status: str
+    warranty_expiry: date
+    days_until_expiry: int
+    maintenance_team_id: Optional[UUID] = None
+    default_technician_id: Optional[UUID] = None
+
+
+class EquipmentWarrantyList(PaginatedResponse):
+    """Paginated list of equipment with expiring warranties."""
+    items: List[EquipmentWarrantyItem]
+    horizon_days: int
+
+
+class WarrantyInspectionResult(BaseModel):
+    """Result of scheduling warranty inspections."""
+    created: int
+    horizon_days: int
+    lead_days: int
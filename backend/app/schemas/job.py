@@ -0,0 +1,54 @@
+"""Background job Pydantic schemas."""
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, List
+from datetime import datetime
+from uuid import UUID
+
+from .base import BaseSchema, PaginatedResponse
+
+
+class JobCreate(BaseModel):
+    """Schema for queueing a job."""
+    job_type: str = Field(..., min_length=1, max_length=100)
+    params: Dict[str, Any] = Field(default_factory=dict)
+    priority: int = Field(default=0, ge=-100, le=100)
+
+
+class JobProgress(BaseSchema):
+    """Lightweight job status for polling."""
+    id: UUID
+    status: str
+    progress: int = 0
+    progress_message: Optional[str] = None
+    attempts: int = 0
+
+
+class JobResponse(JobProgress):
+    """Schema for job response."""
+    job_type: str
+    params: Dict[str, Any] = {}
+    priority: int = 0
+    max_attempts: int
+    cancel_requested: bool = False
+    result: Optional[Dict[str, Any]] = None  # Summary only; files come from GET /jobs/{id}/download
+    error: Optional[str] = None
+    created_by: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+
+class JobSummary(JobProgress):
+    """Job in a list (without params and result)."""
+    job_type: str
+    priority: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobList(PaginatedResponse):
+    """Paginated list of jobs."""
+    items: List[JobSummary]
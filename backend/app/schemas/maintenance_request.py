@@ -1,12 +1,12 @@
 """Maintenance Request Pydantic schemas."""
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
-from .base import BaseSchema, TimestampMixin, PaginatedResponse
+from .base import BaseSchema, TimestampMixin, PaginatedResponse, BatchResponse
 from .user import UserBrief
 from .equipment import EquipmentBrief
 
@@ -72,6 +72,11 @@ class RequestResponse(RequestBase, TimestampMixin, BaseSchema):
     maintenance_team_id: Optional[UUID] = None
     assigned_to: Optional[UUID] = None
     created_by: UUID
+    version: int = 1  # Send back as If-Match / expected_version when updating
+    
+    # Set on requests generated from a maintenance schedule
+    schedule_id: Optional[UUID] = None
+    occurrence_date: Optional[date] = None
     
     # Time tracking
     request_date: Optional[date] = None
@@ -80,6 +85,12 @@ class RequestResponse(RequestBase, TimestampMixin, BaseSchema):
     completed_at: Optional[datetime] = None
     duration_hours: Decimal = Decimal("0")
     
+    # SLA
+    response_due_at: Optional[datetime] = None
+    resolution_due_at: Optional[datetime] = None
+    response_breached_at: Optional[datetime] = None
+    resolution_breached_at: Optional[datetime] = None
+    
     # Computed
     is_overdue: bool = False
     priority_label: str = "Normal"
@@ -96,6 +107,11 @@ class RequestList(PaginatedResponse):
     items: List[RequestResponse]
 
 
+class RequestBatch(BatchResponse):
+    """Requests by id (batch GET)."""
+    items: Dict[UUID, RequestResponse]
+
+
 class RequestKanbanCard(BaseSchema):
     """Simplified request for Kanban card display."""
     id: UUID
@@ -0,0 +1,80 @@
+"""Maintenance Schedule Pydantic schemas."""
+
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+from datetime import date
+from uuid import UUID
+
+from .base import BaseSchema, TimestampMixin, PaginatedResponse
+
+RECURRENCE_PATTERN = "^(daily|weekly|monthly|yearly)$"
+
+
+class ScheduleBase(BaseModel):
+    """Base schedule schema with common fields."""
+    name: str = Field(..., min_length=1, max_length=255)
+    instructions: Optional[str] = None
+    priority: int = Field(default=2, ge=1, le=5)
+    maintenance_team_id: Optional[UUID] = None
+    recurrence: str = Field(..., pattern=RECURRENCE_PATTERN)
+    recurrence_interval: int = Field(default=1, ge=1, le=366)
+    start_date: date
+    end_date: Optional[date] = None
+    lead_days: int = Field(default=14, ge=0, le=365)
+    is_active: bool = True
+
+
+class ScheduleCreate(ScheduleBase):
+    """Schema for creating a schedule; targets one equipment or one category."""
+    equipment_id: Optional[UUID] = None
+    category: Optional[str] = Field(None, min_length=1, max_length=100)
+    created_by: Optional[UUID] = None
+
+    @model_validator(mode="after")
+    def one_target(self) -> "ScheduleCreate":
+        if (self.equipment_id is None) == (self.category is None):
+            raise ValueError("Set exactly one of equipment_id or category")
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class ScheduleUpdate(BaseModel):
+    """
+    Schema for updating a schedule.
+
+    Occurrences already generated are kept; rule changes apply to the
+    occurrences generated after the update.
+    """
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    instructions: Optional[str] = None
+    priority: Optional[int] = Field(None, ge=1, le=5)
+    maintenance_team_id: Optional[UUID] = None
+    recurrence: Optional[str] = Field(None, pattern=RECURRENCE_PATTERN)
+    recurrence_interval: Optional[int] = Field(None, ge=1, le=366)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    lead_days: Optional[int] = Field(None, ge=0, le=365)
+    is_active: Optional[bool] = None
+
+
+class ScheduleResponse(ScheduleBase, TimestampMixin, BaseSchema):
+    """Schema for schedule response."""
+    id: UUID
+    equipment_id: Optional[UUID] = None
+    category: Optional[str] = None
+    generated_until: Optional[date] = None
+    created_by: Optional[UUID] = None
+
+
+class ScheduleList(PaginatedResponse):
+    """Paginated list of schedules."""
+    items: List[ScheduleResponse]
+
+
+class ScheduleGenerationResult(BaseModel):
+    """Result of materializing schedule occurrences."""
+    schedules: int
+    occurrences: int
+    created: int
+    horizon_days: Optional[int] = None
@@ -1,11 +1,11 @@
 """Maintenance Team Pydantic schemas."""
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, Optional, List
 from datetime import datetime
 from uuid import UUID
 
-from .base import BaseSchema, TimestampMixin, PaginatedResponse
+from .base import BaseSchema, TimestampMixin, PaginatedResponse, BatchResponse
 from .user import UserBrief
 
 
@@ -20,6 +20,29 @@ class TeamMemberCreate(TeamMemberBase):
     pass
 
 
+class TeamMembershipSync(BaseModel):
+    """Desired full membership of a team (replaces the current one)."""
+    members: List[TeamMemberBase] = Field(default_factory=list, max_length=5000)
+
+    @field_validator("members")
+    @classmethod
+    def unique_users(cls, members: List[TeamMemberBase]) -> List[TeamMemberBase]:
+        seen = set()
+        for member in members:
+            if member.user_id in seen:
+                raise ValueError(f"Duplicate user_id in members: {member.user_id}")
+            seen.add(member.user_id)
+        return members
+
+
+class TeamMembershipSyncResult(BaseModel):
+    """Changes applied by a membership sync."""
+    added: List[TeamMemberBase] = []
+    updated: List[TeamMemberBase] = []  # Existing members whose role changed
+    removed: List[UUID] = []
+    member_count: int = 0
+
+
 class TeamMemberResponse(BaseSchema):
     """Schema for team member response."""
     id: UUID
@@ -67,8 +90,36 @@ class TeamList(PaginatedResponse):
     items: List[TeamResponse]
 
 
+class TeamBatch(BatchResponse):
+    """Teams with their members by id (batch GET)."""
+    items: Dict[UUID, TeamDetail]
+
+
 class TeamBrief(BaseSchema):
     """Brief team info for embedding."""
     id: UUID
     name: str
     color: str = "#3498db"
+
+
+class MemberWorkload(BaseModel):
+    """Open work assigned to one team member."""
+    user_id: UUID
+    name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    role: str = "member"
+    assigned_open_count: int = 0
+    in_progress_count: int = 0
+    overdue_count: int = 0
+
+
+class TeamWorkload(BaseModel):
+    """Open work of a team, with per-member breakdown."""
+    team_id: UUID
+    team_name: str
+    color: Optional[str] = "#3498db"
+    open_count: int = 0  # new + in_progress
+    new_count: int = 0
+    in_progress_count: int = 0
+    overdue_count: int = 0
+    members: List[MemberWorkload] = []
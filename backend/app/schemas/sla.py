@@ -0,0 +1,42 @@
+"""SLA policy Pydantic schemas."""
+
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+from uuid import UUID
+
+from .base import BaseSchema, TimestampMixin
+
+
+class SlaPolicyBase(BaseModel):
+    """Base SLA policy schema."""
+    response_minutes: int = Field(..., ge=1)
+    resolution_minutes: int = Field(..., ge=1)
+
+    @model_validator(mode="after")
+    def response_before_resolution(self):
+        if self.resolution_minutes < self.response_minutes:
+            raise ValueError("resolution_minutes must not be less than response_minutes")
+        return self
+
+
+class SlaPolicyCreate(SlaPolicyBase):
+    """Schema for creating a policy; without a team it is the default for the priority."""
+    priority: int = Field(..., ge=1, le=5)
+    maintenance_team_id: Optional[UUID] = None
+
+
+class SlaPolicyUpdate(SlaPolicyBase):
+    """Schema for updating a policy's targets (applies to deadlines set afterwards)."""
+    pass
+
+
+class SlaPolicyResponse(SlaPolicyBase, TimestampMixin, BaseSchema):
+    """Schema for SLA policy response."""
+    id: UUID
+    priority: int
+    maintenance_team_id: Optional[UUID] = None
+
+
+class SlaPolicyList(BaseModel):
+    """All SLA policies."""
+    items: List[SlaPolicyResponse]
@@ -1,10 +1,10 @@
 """User Pydantic schemas."""
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from uuid import UUID
 
-from .base import BaseSchema, TimestampMixin, PaginatedResponse
+from .base import BaseSchema, TimestampMixin, PaginatedResponse, BatchResponse
 
 
 class UserBase(BaseModel):
@@ -55,3 +55,8 @@ class UserBrief(BaseSchema):
 class UserList(PaginatedResponse):
     """Paginated list of users."""
     items: List[UserResponse]
+
+
+class UserBatch(BatchResponse):
+    """Users by id (batch GET)."""
+    items: Dict[UUID, UserResponse]
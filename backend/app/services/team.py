@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.db.models.maintenance_team import MaintenanceTeam
 from app.db.models.team_member import TeamMember
 from app.schemas.team import MaintenanceTeamCreate, MaintenanceTeamUpdate
+from app.core.team_cache import team_membership_cache
 
 
 # Team CRUD
@@ -54,6 +55,8 @@ def delete_team(db: Session, team_id: UUID) -> bool:
     
     db.delete(db_team)
     db.commit()
+    # Memberships are removed by cascade; we don't know whose, so drop all
+    team_membership_cache.clear()
     return True
 
 
@@ -75,6 +78,7 @@ def add_team_member(db: Session, team_id: UUID, user_id: UUID) -> Optional[TeamM
     db_member = TeamMember(team_id=team_id, user_id=user_id)
     db.add(db_member)
     db.commit()
+    team_membership_cache.invalidate(user_id)
     db.refresh(db_member)
     return db_member
 
@@ -90,16 +94,23 @@ def remove_team_member(db: Session, team_id: UUID, user_id: UUID) -> bool:
     
     db.delete(db_member)
     db.commit()
+    team_membership_cache.invalidate(user_id)
     return True
 
 
 def get_user_team_ids(db: Session, user_id: UUID) -> List[UUID]:
     """
     Get all team IDs that a user belongs to.
-    Used for team-scoped access control.
+    Used for team-scoped access control; served from the membership cache
+    when possible.
     """
-    memberships = db.query(TeamMember).filter(TeamMember.user_id == user_id).all()
-    return [m.team_id for m in memberships]
+    team_ids = team_membership_cache.get(user_id)
+    if team_ids is None:
+        generation = team_membership_cache.generation
+        rows = db.query(TeamMember.team_id).filter(TeamMember.user_id == user_id).all()
+        team_ids = [row.team_id for row in rows]
+        team_membership_cache.set(user_id, team_ids, generation)
+    return list(team_ids)
 
 
 def is_user_in_team(db: Session, user_id: UUID, team_id: UUID) -> bool:
@@ -0,0 +1,123 @@
+"""
+Benchmark: latency of an unrelated endpoint during a login storm.
+
+Compares bcrypt verification called inline in an async route (blocking the
+event loop) with the bounded hashing executor used by the auth routes.
+No database is needed; the routes only do the password check.
+
+Pings are sent on a fixed schedule for as long as the storm lasts and
+latency is measured from the scheduled send time, so time spent with the
+event loop blocked is counted (no coordinated omission).
+
+Run from backend/ (requires httpx):
+    python -m benchmarks.login_storm [--logins 40] [--interval-ms 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.core.security import (
+    PasswordHasher,
+    PasswordHasherBusy,
+    get_password_hash,
+    verify_password,
+)
+
+PASSWORD = "Benchmark!Pass1"
+
+
+def build_app(offload: bool, hasher: PasswordHasher) -> FastAPI:
+    app = FastAPI()
+    password_hash = get_password_hash(PASSWORD)
+
+    @app.post("/login")
+    async def login():
+        if offload:
+            try:
+                ok = await hasher.verify(PASSWORD, password_hash)
+            except PasswordHasherBusy:
+                raise HTTPException(status_code=503, detail="busy")
+        else:
+            ok = verify_password(PASSWORD, password_hash)
+        return {"ok": ok}
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "healthy"}
+
+    return app
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(offload: bool, logins: int, interval_ms: float, workers: int, max_pending: int) -> dict:
+    hasher = PasswordHasher(workers=workers, max_pending=max_pending)
+    app = build_app(offload, hasher)
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    statuses = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        storm_done = asyncio.Event()
+
+        async def ping_loop():
+            interval = interval_ms / 1000
+            scheduled = time.perf_counter()
+            while not storm_done.is_set():
+                scheduled += interval
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await client.get("/ping")
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+
+        async def login_once():
+            response = await client.post("/login")
+            statuses.append(response.status_code)
+
+        async def storm():
+            await asyncio.gather(*(login_once() for _ in range(logins)))
+            storm_done.set()
+
+        started = time.perf_counter()
+        await asyncio.gather(ping_loop(), storm())
+        elapsed = time.perf_counter() - started
+
+    hasher.shutdown()
+    return {
+        "mode": "executor" if offload else "inline",
+        "pings": len(latencies),
+        "ping_p50_ms": statistics.median(latencies),
+        "ping_p99_ms": percentile(latencies, 99),
+        "ping_max_ms": max(latencies),
+        "logins_ok": statuses.count(200),
+        "logins_503": statuses.count(503),
+        "elapsed_s": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40, help="concurrent login attempts")
+    parser.add_argument("--interval-ms", type=float, default=5, help="ping schedule interval")
+    parser.add_argument("--workers", type=int, default=2, help="hashing threads")
+    parser.add_argument("--max-pending", type=int, default=32, help="executor queue limit")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'pings':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'ok':>6}{'503':>6}{'total s':>10}")
+    for offload in (False, True):
+        r = asyncio.run(run(offload, args.logins, args.interval_ms, args.workers, args.max_pending))
+        print(
+            f"{r['mode']:<10}{r['pings']:>7}{r['ping_p50_ms']:>10.2f}{r['ping_p99_ms']:>10.2f}{r['ping_max_ms']:>10.2f}"
+            f"{r['logins_ok']:>6}{r['logins_503']:>6}{r['elapsed_s']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
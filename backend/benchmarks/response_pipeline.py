@@ -0,0 +1,167 @@
+"""
+Benchmark: serialization CPU and bytes on the wire for large responses.
+
+Serves synthetic `/requests/kanban` and `/requests/` payloads through the
+real response models (RequestKanban, RequestList) and compares:
+
+- stdlib:       FastAPI's JSONResponse, no compression (before)
+- orjson:       ORJSONResponse, no compression
+- orjson+gzip:  ORJSONResponse behind GzipMiddleware (after)
+
+CPU is process time per response, covering validation, serialization and
+compression. Bytes are what the client downloads (compressed size when
+gzip applies). No database is needed.
+
+Run from backend/ (requires httpx):
+    python -m benchmarks.response_pipeline [--requests 500] [--iterations 50]
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core.compression import GzipMiddleware
+from app.core.responses import ORJSONResponse
+from app.schemas.maintenance_request import (
+    RequestKanban,
+    RequestKanbanCard,
+    RequestKanbanColumn,
+    RequestList,
+)
+
+STAGES = {"new": "New", "in_progress": "In Progress", "repaired": "Repaired", "scrap": "Scrap"}
+PRIORITY_LABELS = {1: "Low", 2: "Normal", 3: "High", 4: "Urgent", 5: "Critical"}
+CATEGORIES = ["CNC Machine", "Forklift", "Compressor", "Conveyor", "Printer", "HVAC"]
+
+
+def synthetic_requests(count: int, seed: int = 7) -> list:
+    """Request rows shaped like list_requests builds them."""
+    rnd = random.Random(seed)
+    now = datetime.now()
+    technicians = [
+        {"id": uuid.uuid4(), "name": f"Technician {i}", "email": f"tech{i}@gearguard.local",
+         "avatar_url": None, "is_technician": True}
+        for i in range(12)
+    ]
+    teams = [{"id": uuid.uuid4(), "name": f"Team {i}", "color": "#3498db"} for i in range(4)]
+    rows = []
+    for i in range(count):
+        category = rnd.choice(CATEGORIES)
+        equipment = {
+            "id": uuid.uuid4(), "name": f"{category} #{i % 80}", "serial_number": f"SN-{rnd.randrange(10**8):08d}",
+            "category": category, "health_percentage": rnd.randrange(20, 101), "is_critical": rnd.random() < 0.1,
+        }
+        created = now - timedelta(days=rnd.randrange(365), minutes=rnd.randrange(1440))
+        priority = rnd.randrange(1, 6)
+        technician = rnd.choice(technicians)
+        team = rnd.choice(teams)
+        rows.append({
+            "id": uuid.uuid4(),
+            "reference": f"MR/{created.year}/{i:05d}",
+            "subject": f"{rnd.choice(['Oil leak', 'Noise', 'Overheating', 'Calibration'])} on {equipment['name']}",
+            "description": "Reported by the shift lead during the morning round. " * rnd.randrange(1, 4),
+            "request_type": rnd.choice(["corrective", "preventive"]),
+            "maintenance_for": "equipment",
+            "priority": priority,
+            "status": rnd.choice(list(STAGES)),
+            "category": category,
+            "equipment_id": equipment["id"],
+            "maintenance_team_id": team["id"],
+            "assigned_to": technician["id"],
+            "created_by": technicians[0]["id"],
+            "request_date": created.date(),
+            "scheduled_date": created + timedelta(days=rnd.randrange(30)),
+            "duration_hours": Decimal(rnd.randrange(0, 80)) / 4,
+            "response_due_at": created + timedelta(hours=4),
+            "resolution_due_at": created + timedelta(days=2),
+            "created_at": created,
+            "updated_at": created + timedelta(hours=rnd.randrange(48)),
+            "is_overdue": rnd.random() < 0.2,
+            "priority_label": PRIORITY_LABELS[priority],
+            "equipment": equipment,
+            "maintenance_team": team,
+            "technician": technician,
+            "creator": technicians[0],
+        })
+    return rows
+
+
+def build_app(response_class, gzip: bool, rows: list) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+    if gzip:
+        app.add_middleware(GzipMiddleware)
+
+    @app.get("/requests/", response_model=RequestList)
+    async def list_requests():
+        return RequestList(items=rows[:100], total=len(rows), skip=0, limit=100)
+
+    @app.get("/requests/kanban", response_model=RequestKanban)
+    async def kanban():
+        columns = []
+        for stage, label in STAGES.items():
+            cards = [
+                RequestKanbanCard(
+                    id=row["id"],
+                    reference=row["reference"],
+                    subject=row["subject"],
+                    priority=row["priority"],
+                    priority_label=row["priority_label"],
+                    is_overdue=row["is_overdue"],
+                    scheduled_date=row["scheduled_date"],
+                    equipment_name=row["equipment"]["name"],
+                    technician=row["technician"],
+                )
+                for row in rows if row["status"] == stage
+            ]
+            columns.append(RequestKanbanColumn(stage=stage, stage_label=label, count=len(cards), cards=cards))
+        return RequestKanban(columns=columns, total_requests=len(rows))
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, iterations: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path, headers={"Accept-Encoding": "gzip"})  # Warm up
+        wire = body = 0
+        cpu_started = time.process_time()
+        for _ in range(iterations):
+            response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+            wire = response.num_bytes_downloaded
+            body = len(response.content)
+        cpu = time.process_time() - cpu_started
+    return {"cpu_ms": cpu / iterations * 1000, "wire_bytes": wire, "json_bytes": body}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="requests on the kanban board")
+    parser.add_argument("--iterations", type=int, default=50, help="responses per measurement")
+    args = parser.parse_args()
+
+    rows = synthetic_requests(args.requests)
+    variants = [
+        ("stdlib", JSONResponse, False),
+        ("orjson", ORJSONResponse, False),
+        ("orjson+gzip", ORJSONResponse, True),
+    ]
+
+    print(f"{'endpoint':<18}{'variant':<14}{'cpu ms':>10}{'json KB':>10}{'wire KB':>10}")
+    for path in ("/requests/kanban", "/requests/"):
+        for name, response_class, gzip in variants:
+            r = asyncio.run(measure(build_app(response_class, gzip, rows), path, args.iterations))
+            print(
+                f"{path:<18}{name:<14}{r['cpu_ms']:>10.2f}"
+                f"{r['json_bytes'] / 1024:>10.1f}{r['wire_bytes'] / 1024:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,14 +12,20 @@ from contextlib import asynccontextmanager
 from app.db.session import engine
 from app.db.base import Base
 from app.routes import api_router
+from app.core.background import start_background_tasks, stop_background_tasks
+from app.core.middleware import install_middleware
+from app.db.replica import STICKY_HEADER
+from app.core.responses import ORJSONResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     print("🚀 GearGuard API starting up...")
+    await start_background_tasks()
     yield
     print("👋 GearGuard API shutting down...")
+    await stop_background_tasks()
     if engine is not None:
         try:
             await engine.dispose()
@@ -42,16 +48,19 @@ app = FastAPI(
     """,
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
+install_middleware(app)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[STICKY_HEADER],
 )
 
 app.include_router(api_router, prefix="/api")
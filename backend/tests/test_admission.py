@@ -0,0 +1,22 @@
+"""Route classes used by admission control."""
+import pytest
+
+from app.core.admission import AUTH, CHEAP, EXPORT, READ_HEAVY, WRITE, classify
+
+
+@pytest.mark.parametrize("method, path, route_class", [
+    ("POST", "/api/auth/login", AUTH),
+    ("POST", "/api/auth/refresh", AUTH),
+    ("POST", "/api/auth/register", AUTH),
+    ("GET", "/api/auth/me", CHEAP),
+    ("POST", "/api/requests/", WRITE),
+    ("PATCH", "/api/requests/3f0c/stage", WRITE),
+    ("POST", "/api/batch", READ_HEAVY),
+    ("GET", "/api/requests/", READ_HEAVY),
+    ("GET", "/api/requests/kanban", READ_HEAVY),
+    ("GET", "/api/requests/3f0c", CHEAP),
+    ("GET", "/api/jobs/3f0c/download", EXPORT),
+    ("POST", "/api/schedules/generate", EXPORT),
+])
+def test_classify(method, path, route_class):
+    assert classify(method, path) == route_class
@@ -0,0 +1,56 @@
+"""Batch GET-by-ids: id parsing and keyed responses."""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.core.batch import get_batch_ids, id_in, keyed
+from app.core.config import settings
+from app.db.models import MaintenanceRequest
+
+A, B, C = (uuid.uuid4() for _ in range(3))
+
+
+def test_ids_may_be_comma_separated_and_repeated():
+    assert get_batch_ids([f"{A},{B}", str(C)]) == [A, B, C]
+
+
+def test_duplicates_are_dropped_keeping_the_first_position():
+    assert get_batch_ids([f"{B}, {A}", f"{B},,{C}", str(A)]) == [B, A, C]
+
+
+@pytest.mark.parametrize("ids, detail", [
+    (["not-a-uuid"], "Invalid id: not-a-uuid"),
+    ([",", " "], "No ids given"),
+])
+def test_invalid_ids_are_rejected(ids, detail):
+    with pytest.raises(HTTPException) as exc_info:
+        get_batch_ids(ids)
+    assert exc_info.value.status_code == 422
+    assert exc_info.value.detail == detail
+
+
+def test_at_most_batch_max_ids(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_IDS", 2)
+
+    assert get_batch_ids([f"{A},{B}"]) == [A, B]
+    with pytest.raises(HTTPException) as exc_info:
+        get_batch_ids([f"{A},{B},{C}"])
+    assert exc_info.value.detail == "At most 2 ids per batch"
+
+
+def test_keyed_keeps_request_order_and_lists_missing_ids():
+    body = keyed([C, A, B], {A: "a", C: "c"})
+
+    assert list(body["items"]) == [C, A]
+    assert body["items"] == {C: "c", A: "a"}
+    assert body["missing"] == [B]
+
+
+def test_id_in_binds_one_array_parameter():
+    clause = id_in(MaintenanceRequest.id, [A, B, C])
+    compiled = clause.compile(dialect=postgresql.dialect())
+
+    assert str(compiled).endswith("= ANY (%(param_1)s::UUID[])")
+    assert compiled.params == {"param_1": [A, B, C]}
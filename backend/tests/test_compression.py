@@ -0,0 +1,138 @@
+"""Gzip compression of buffered and streaming responses."""
+import zlib
+
+import pytest
+from starlette.datastructures import Headers
+
+from app.core.compression import _GzipResponder, accepts_gzip
+
+MINIMUM_SIZE = 100
+
+
+def start(content_type="application/json", status=200, content_length=None):
+    headers = [(b"content-type", content_type.encode())]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+    return {"type": "http.response.start", "status": status, "headers": headers}
+
+
+def body(data: bytes, more_body=False):
+    return {"type": "http.response.body", "body": data, "more_body": more_body}
+
+
+async def respond(*messages, accepts=True):
+    """Messages sent downstream by a responder fed `messages`."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    responder = _GzipResponder(send, accepts, MINIMUM_SIZE, level=5)
+    for message in messages:
+        await responder.send(message)
+    return sent
+
+
+def headers_of(message) -> Headers:
+    return Headers(raw=message["headers"])
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("br, gzip;q=0.5", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("identity", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    scope = {"type": "http", "headers": [(b"accept-encoding", header.encode())]}
+    assert accepts_gzip(scope) is expected
+
+
+@pytest.mark.anyio
+async def test_small_response_is_sent_as_is_with_vary():
+    payload = b'{"ok": true}'
+    sent = await respond(start(content_length=len(payload)), body(payload))
+
+    headers = headers_of(sent[0])
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["content-length"] == str(len(payload))
+    assert sent[1]["body"] == payload
+
+
+@pytest.mark.anyio
+async def test_large_response_is_gzipped():
+    payload = b'{"items": [' + b'"x", ' * 200 + b'"y"]}'
+    sent = await respond(start(content_length=len(payload)), body(payload))
+
+    headers = headers_of(sent[0])
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["content-length"] == str(len(sent[1]["body"]))
+    assert zlib.decompress(sent[1]["body"], 31) == payload
+
+
+@pytest.mark.anyio
+async def test_client_without_gzip_still_gets_vary():
+    payload = b"x" * 500
+    sent = await respond(start("text/csv"), body(payload), accepts=False)
+
+    headers = headers_of(sent[0])
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert sent[1]["body"] == payload
+
+
+@pytest.mark.parametrize("message", [
+    start("image/png"),
+    start("text/event-stream"),
+    start(status=304),
+])
+@pytest.mark.anyio
+async def test_uncompressible_responses_pass_through(message):
+    sent = await respond(message, body(b"x" * 500))
+
+    headers = headers_of(sent[0])
+    assert "content-encoding" not in headers
+    assert "vary" not in headers
+    assert sent[1]["body"] == b"x" * 500
+
+
+@pytest.mark.anyio
+async def test_streaming_response_is_held_until_the_threshold_then_flushed_per_chunk():
+    chunks = [b"a" * 40, b"b" * 80, b"c" * 30, b"d" * 30]
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    responder = _GzipResponder(send, True, MINIMUM_SIZE, level=5)
+    await responder.send(start("text/csv"))
+    await responder.send(body(chunks[0], more_body=True))
+    assert sent == []  # Below the threshold: undecided
+
+    await responder.send(body(chunks[1], more_body=True))
+    headers = headers_of(sent[0])
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+
+    # Every chunk is flushed, so what was sent so far decodes to all input so far
+    decoder = zlib.decompressobj(31)
+    assert decoder.decompress(sent[1]["body"]) == chunks[0] + chunks[1]
+    await responder.send(body(chunks[2], more_body=True))
+    assert decoder.decompress(sent[2]["body"]) == chunks[2]
+    await responder.send(body(chunks[3]))
+    assert decoder.decompress(sent[3]["body"]) == chunks[3]
+    assert decoder.eof
+    assert sent[3]["more_body"] is False
+
+
+@pytest.mark.anyio
+async def test_short_streaming_response_is_sent_as_is():
+    sent = await respond(start("text/csv"), body(b"a" * 30, more_body=True), body(b"b" * 30))
+
+    assert "content-encoding" not in headers_of(sent[0])
+    assert sent[1]["body"] == b"a" * 30 + b"b" * 30
+    assert sent[1]["more_body"] is False
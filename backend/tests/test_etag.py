@@ -0,0 +1,78 @@
+"""Conditional GET evaluation (If-None-Match / If-Modified-Since)."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import literal
+from starlette.requests import Request
+
+from app.core.etag import Validator, compute_validator, is_not_modified
+
+ETAG = 'W/"3-0123abcd"'
+LAST_MODIFIED = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def request_with(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": raw})
+
+
+@pytest.mark.parametrize("header, expected", [
+    (ETAG, True),
+    ('"3-0123abcd"', True),  # Weak comparison
+    ('W/"other", ' + ETAG, True),
+    ('W/"other"', False),
+    ("*", True),
+])
+def test_if_none_match(header, expected):
+    validator = Validator(etag=ETAG, last_modified=LAST_MODIFIED)
+    assert is_not_modified(request_with(if_none_match=header), validator) is expected
+
+
+def test_star_does_not_match_a_missing_item():
+    validator = Validator(etag=ETAG, last_modified=LAST_MODIFIED, exists=False)
+    assert not is_not_modified(request_with(if_none_match="*"), validator)
+
+
+def test_if_modified_since_does_not_match_a_missing_item():
+    since = "Mon, 19 Oct 2026 13:00:00 GMT"
+    assert is_not_modified(request_with(if_modified_since=since), Validator(ETAG, LAST_MODIFIED))
+    assert not is_not_modified(request_with(if_modified_since=since), Validator(ETAG, LAST_MODIFIED, exists=False))
+
+
+class StampRow(tuple):
+    """A result row of stamp values, as returned for the validator query."""
+
+    @property
+    def _mapping(self):
+        return {"row_exists": True}
+
+
+class StampResult:
+    def __init__(self, values):
+        self.values = values
+
+    def one(self):
+        return StampRow(self.values)
+
+
+class StampSession:
+    """Answers the validator query with fixed stamp values."""
+
+    def __init__(self, *values):
+        self.values = values
+
+    async def execute(self, statement):
+        return StampResult(self.values)
+
+
+@pytest.mark.anyio
+async def test_collections_have_no_last_modified():
+    session = StampSession(LAST_MODIFIED, 3)
+    stamps = [(literal(LAST_MODIFIED), literal(3))]
+
+    collection = await compute_validator(session, request_with(), stamps)
+    assert collection.last_modified is None
+    assert not is_not_modified(request_with(if_modified_since="Mon, 19 Oct 2026 13:00:00 GMT"), collection)
+
+    item = await compute_validator(session, request_with(), stamps, exists=literal(True))
+    assert item.last_modified == LAST_MODIFIED
@@ -0,0 +1,99 @@
+"""Background jobs: retry backoff, queueing, CSV rendering and route access."""
+import csv
+import io
+import uuid
+
+import pytest
+
+from app.core import job_handlers  # noqa: F401  (registers job types)
+from app.core.config import settings
+from app.core.exports import render_csv
+from app.core.jobs import MAX_RETRY_DELAY_SECONDS, UnknownJobType, enqueue_job, job_types, retry_delay
+from app.core.tokens import create_access_token
+
+
+class CollectingSession:
+    """Stands in for the caller's session: enqueue_job only adds the row."""
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, row):
+        self.added.append(row)
+
+
+def test_retry_delay_doubles_per_attempt(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 10.0)
+
+    assert [retry_delay(attempts) for attempts in (1, 2, 3, 4)] == [10.0, 20.0, 40.0, 80.0]
+
+
+def test_retry_delay_is_capped():
+    assert retry_delay(50) == MAX_RETRY_DELAY_SECONDS
+
+
+def test_enqueue_job_adds_a_queued_row():
+    db = CollectingSession()
+    user_id = uuid.uuid4()
+    job = enqueue_job(db, "requests.export_csv", {"status": "new"}, priority=5, created_by=user_id)
+
+    assert db.added == [job]
+    assert (job.job_type, job.params, job.priority, job.created_by) == (
+        "requests.export_csv", {"status": "new"}, 5, user_id
+    )
+    assert job.max_attempts == settings.JOB_MAX_ATTEMPTS
+
+
+def test_enqueue_job_rejects_unknown_types():
+    assert "requests.export_csv" in job_types()
+    with pytest.raises(UnknownJobType):
+        enqueue_job(CollectingSession(), "no.such.job")
+
+
+def test_render_csv_quotes_and_blanks_none():
+    data = render_csv(["reference", "subject", "priority"], [
+        ["MR/2026/00001", 'Leak, "urgent"', 3],
+        ["MR/2026/00002", None, None],
+    ])
+
+    assert data.decode("utf-8").splitlines() == [
+        "reference,subject,priority",
+        'MR/2026/00001,"Leak, ""urgent""",3',
+        "MR/2026/00002,,",
+    ]
+    assert data.endswith(b"\r\n")
+
+
+def test_render_csv_pages_concatenate_into_one_file():
+    rows = [[f"MR/2026/{number:05d}", "Résumé ✓"] for number in range(5)]
+    data = render_csv(["reference", "subject"], rows[:2]) + render_csv(None, rows[2:])
+
+    assert list(csv.reader(io.StringIO(data.decode("utf-8")))) == [["reference", "subject"], *rows]
+
+
+def bearer(role: str) -> dict:
+    token = create_access_token(uuid.uuid4(), role=role)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_jobs_routes_require_authentication(client):
+    job_id = uuid.uuid4()
+    for method, path in [
+        ("GET", "/api/jobs/types"),
+        ("GET", "/api/jobs/"),
+        ("POST", "/api/jobs/"),
+        ("GET", f"/api/jobs/{job_id}"),
+        ("GET", f"/api/jobs/{job_id}/download"),
+        ("POST", f"/api/jobs/{job_id}/cancel"),
+    ]:
+        assert client.request(method, path).status_code == 403, f"{method} {path}"
+
+
+def test_only_managers_queue_or_cancel_jobs(client):
+    technician = bearer("technician")
+
+    assert client.get("/api/jobs/types", headers=technician).status_code == 200
+    response = client.post("/api/jobs/", json={"job_type": "requests.export_csv"}, headers=technician)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Manager access required"
+    assert client.post(f"/api/jobs/{uuid.uuid4()}/cancel", headers=technician).status_code == 403
@@ -0,0 +1,131 @@
+"""POST /api/batch internals: path handling, abort handling and sub-request dispatch."""
+import pytest
+from fastapi import FastAPI, Request
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.multiplex import (
+    ABORTED_RESPONSE, BatchAborted, SharedSession, _exception_layer, dispatch, normalize_path,
+)
+from app.core.query_budget import route_query_stats
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/requests/kanban", "/api/requests/kanban"),
+    ("requests/kanban", "/api/requests/kanban"),
+    ("/api/requests/kanban?team_id=1", "/api/requests/kanban?team_id=1"),
+    ("/api", "/api"),
+    ("/apiary", "/api/apiary"),
+])
+def test_normalize_path(path, expected):
+    assert normalize_path(path) == expected
+
+
+def database_error() -> DBAPIError:
+    return DBAPIError("SELECT 1", {}, Exception("deadlock detected"))
+
+
+@pytest.mark.anyio
+async def test_database_error_aborts_the_shared_session():
+    session = SharedSession()
+    error = database_error()
+
+    with pytest.raises(DBAPIError):
+        async with session._serialized():
+            raise error
+    assert session.aborted is error
+
+    # Later calls fail fast instead of sending statements to the aborted transaction
+    with pytest.raises(BatchAborted) as exc_info:
+        await session.execute(text("SELECT 1"))
+    assert exc_info.value.__cause__ is error
+    with pytest.raises(BatchAborted):
+        await session.scalar(text("SELECT 1"))
+
+    await session.rollback()  # Still allowed, so the session can be closed cleanly
+    await session.close()
+
+
+@pytest.mark.anyio
+async def test_other_errors_do_not_abort_the_session():
+    session = SharedSession()
+
+    with pytest.raises(ValueError):
+        async with session._serialized():
+            raise ValueError("bad input")
+    assert session.aborted is None
+    await session.close()
+
+
+def sub_request_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/echo")
+    async def echo(request: Request):
+        return {
+            "authorization": request.headers.get("authorization"),
+            "if_none_match": request.headers.get("if-none-match"),
+            "team": request.query_params.get("team"),
+        }
+
+    @app.get("/api/aborted")
+    async def aborted():
+        raise BatchAborted()
+
+    @app.get("/api/broken")
+    async def broken():
+        raise RuntimeError("bug")
+
+    return app
+
+
+def parent_request(app: FastAPI) -> Request:
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/api/batch",
+        "query_string": b"",
+        "headers": [
+            (b"authorization", b"Bearer abc"),
+            (b"if-none-match", b'W/"1"'),
+            (b"content-type", b"application/json"),
+        ],
+        "app": app,
+    })
+
+
+@pytest.mark.anyio
+async def test_dispatch_forwards_credentials_but_not_conditional_headers():
+    app = sub_request_app()
+    response = await dispatch(_exception_layer(app), parent_request(app), "/echo?team=7", {})
+
+    assert response["status"] == 200
+    assert response["body"] == {"authorization": "Bearer abc", "if_none_match": None, "team": "7"}
+
+
+@pytest.mark.anyio
+async def test_dispatch_answers_424_after_an_abort():
+    app = sub_request_app()
+    response = await dispatch(_exception_layer(app), parent_request(app), "/aborted", {})
+
+    assert response == ABORTED_RESPONSE
+    assert response["status"] == 424
+
+
+@pytest.mark.anyio
+async def test_dispatch_reports_unknown_paths_and_errors():
+    app = sub_request_app()
+    layer = _exception_layer(app)
+
+    assert (await dispatch(layer, parent_request(app), "/missing", {}))["status"] == 404
+    assert (await dispatch(layer, parent_request(app), "/broken", {}))["status"] == 500
+
+
+@pytest.mark.anyio
+async def test_sub_requests_are_counted_under_their_own_route():
+    app = sub_request_app()
+    before = route_query_stats.snapshot().get("GET /api/echo", {}).get("requests", 0)
+
+    await dispatch(_exception_layer(app), parent_request(app), "/echo", {})
+
+    assert route_query_stats.snapshot()["GET /api/echo"]["requests"] == before + 1
@@ -0,0 +1,123 @@
+"""Transactional outbox: event recording, retry backoff and dispatch outcomes."""
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import outbox_handlers  # noqa: F401  (registers handlers)
+from app.core.config import settings
+from app.core.outbox import MAX_RETRY_DELAY_SECONDS, OutboxConsumer, enqueue, outbox_handler, retry_delay
+
+TEST_EVENT = "test.outbox_event"
+FAILING_EVENT = "test.outbox_failing_event"
+
+delivered = []
+
+
+@outbox_handler(TEST_EVENT)
+async def record_delivery(db, payload):
+    delivered.append(payload)
+
+
+@outbox_handler(FAILING_EVENT)
+async def fail_delivery(db, payload):
+    raise RuntimeError("handler failed")
+
+
+class RecordingSession:
+    """Stands in for the consumer's session: records added rows and statements."""
+
+    def __init__(self):
+        self.added = []
+        self.statements = []
+
+    def add(self, row):
+        self.added.append(row)
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+def event(event_type: str, attempts: int = 0):
+    return SimpleNamespace(id=uuid.uuid4(), event_type=event_type, payload={"n": 1}, attempts=attempts)
+
+
+def update_values(db: RecordingSession) -> dict:
+    (statement,) = db.statements
+    return statement.compile().params
+
+
+def test_enqueue_stores_a_json_payload():
+    db = RecordingSession()
+    request_id = uuid.uuid4()
+    row = enqueue(db, TEST_EVENT, {"request_id": request_id, "at": datetime(2026, 10, 19, 12, 0)})
+
+    assert db.added == [row]
+    assert row.event_type == TEST_EVENT
+    assert row.payload == {"request_id": str(request_id), "at": "2026-10-19T12:00:00"}
+
+
+def test_retry_delay_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 2.0)
+
+    assert [retry_delay(attempts) for attempts in (1, 2, 3)] == [2.0, 4.0, 8.0]
+    assert retry_delay(30) == MAX_RETRY_DELAY_SECONDS
+
+
+@pytest.mark.anyio
+async def test_delivered_event_is_marked_done():
+    consumer, db = OutboxConsumer(), RecordingSession()
+    delivered.clear()
+
+    await consumer._dispatch(db, event(TEST_EVENT))
+
+    assert delivered == [{"n": 1}]
+    values = update_values(db)
+    assert (values["status"], values["attempts"]) == ("done", 1)
+    assert consumer.processed == 1
+
+
+@pytest.mark.anyio
+async def test_failed_event_is_retried_until_max_attempts(monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 3)
+    consumer = OutboxConsumer()
+
+    db = RecordingSession()
+    await consumer._dispatch(db, event(FAILING_EVENT, attempts=1))
+    values = update_values(db)
+    assert values["attempts"] == 2
+    assert "status" not in values  # Still pending, available again after the backoff
+    assert consumer.retried == 1
+
+    db = RecordingSession()
+    await consumer._dispatch(db, event(FAILING_EVENT, attempts=2))
+    values = update_values(db)
+    assert (values["status"], values["attempts"]) == ("failed", 3)
+    assert "handler failed" in values["last_error"]
+    assert consumer.failed == 1
+
+
+@pytest.mark.anyio
+async def test_event_without_handler_is_not_dropped():
+    consumer, db = OutboxConsumer(), RecordingSession()
+
+    await consumer._dispatch(db, event("test.no_handler"))
+
+    assert "no outbox handler registered" in update_values(db)["last_error"]
+    assert consumer.retried == 1
+
+
+@pytest.mark.anyio
+async def test_stage_change_handler_ignores_moves_other_than_scrap():
+    db = RecordingSession()
+
+    await outbox_handlers.scrap_equipment(db, {"to_status": "repaired", "equipment_id": str(uuid.uuid4())})
+    await outbox_handlers.scrap_equipment(db, {"to_status": "scrap", "equipment_id": None})
+
+    assert db.statements == []
@@ -0,0 +1,68 @@
+"""PasswordHasher bookkeeping: pending, completed, failed and cancelled calls."""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security import PasswordHasher, PasswordHasherBusy
+
+pytestmark = pytest.mark.anyio
+
+
+def fail():
+    raise ValueError("malformed hash")
+
+
+async def wait_until(condition, timeout: float = 2.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    yield hasher
+    hasher.shutdown()
+
+
+async def test_completed_and_failed_calls_are_counted_separately(hasher):
+    assert await hasher.run(str.upper, "secret") == "SECRET"
+    with pytest.raises(ValueError):
+        await hasher.run(fail)
+    await wait_until(lambda: hasher.pending == 0)
+    assert (hasher.completed, hasher.failed, hasher.cancelled) == (1, 1, 0)
+
+
+async def test_cancelled_call_stays_pending_until_its_thread_finishes(hasher):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(2)
+        return "hash"
+
+    task = asyncio.create_task(hasher.run(slow))
+    await wait_until(started.is_set)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert hasher.cancelled == 1
+    assert hasher.pending == 1  # bcrypt is still running in its thread
+
+    release.set()
+    await wait_until(lambda: hasher.pending == 0)
+    assert hasher.completed == 1
+
+
+async def test_calls_over_max_pending_are_rejected(hasher):
+    release = threading.Event()
+    tasks = [asyncio.create_task(hasher.run(release.wait, 2)) for _ in range(2)]
+    await wait_until(lambda: hasher.pending == 2)
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.run(str.upper, "secret")
+    release.set()
+    await asyncio.gather(*tasks)
+    await wait_until(lambda: hasher.pending == 0)
+    assert (hasher.rejected, hasher.completed) == (1, 2)
@@ -0,0 +1,43 @@
+"""Per-endpoint query budgets, read from the X-DB-Query-Count header."""
+import os
+
+import pytest
+
+from app.db.metrics import track_queries
+
+requires_database = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL"), reason="set TEST_DATABASE_URL to a migrated database"
+)
+
+
+def test_routes_without_database_access_run_no_queries(client, query_budget):
+    counts = query_budget(client, {
+        "GET /health": 0,
+        "GET /api/jobs/types": 0,
+    })
+    assert counts == {"GET /health": 0, "GET /api/jobs/types": 0}
+
+
+def test_budget_violations_are_reported(client, query_budget):
+    with pytest.raises(AssertionError, match="GET /api/jobs/types ran 0 queries, budget is -1"):
+        query_budget(client, {"GET /api/jobs/types": -1})
+
+
+@requires_database
+def test_list_routes_stay_within_budget(client, query_budget):
+    # Validator, count and page; relationships are loaded in bulk, never per row
+    query_budget(client, {
+        "GET /api/users/": 3,
+        "GET /api/users/technicians": 2,
+        "GET /api/teams/": 4,
+    })
+
+
+def test_nested_counters_also_count_into_the_enclosing_one():
+    with track_queries() as outer:
+        with track_queries() as inner:
+            inner.add(2.0)
+        outer.add(1.0)
+
+    assert (inner.count, inner.db_ms) == (1, 2.0)
+    assert (outer.count, outer.db_ms) == (2, 3.0)
@@ -0,0 +1,60 @@
+"""Login throttling against the in-memory backend and a local Redis stand-in (fakeredis)."""
+import fakeredis
+import pytest
+
+from app.core.rate_limit import InMemoryRateLimitBackend, LoginThrottle, RedisRateLimitBackend
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["memory", "redis"])
+def throttle(request):
+    if request.param == "memory":
+        backend = InMemoryRateLimitBackend()
+    else:
+        backend = RedisRateLimitBackend(fakeredis.FakeAsyncRedis())
+    return LoginThrottle(backend, email_limit=3, ip_limit=3, window_seconds=60)
+
+
+async def test_successful_logins_do_not_use_up_the_ip_limit(throttle):
+    for n in range(10):
+        assert await throttle.check(f"user{n}@example.com", "10.0.0.1") is None
+    assert throttle.rejected_ip == 0
+
+
+async def test_failed_logins_count_against_the_ip_limit(throttle):
+    for n in range(3):
+        assert await throttle.check(f"user{n}@example.com", "10.0.0.1") is None
+        await throttle.record_failure("10.0.0.1")
+
+    retry_after = await throttle.check("someone@example.com", "10.0.0.1")
+    assert retry_after is not None and 0 < retry_after <= 60
+    assert throttle.rejected_ip == 1
+    # Other clients are not affected
+    assert await throttle.check("someone@example.com", "10.0.0.2") is None
+
+
+async def test_every_attempt_counts_against_the_email_limit(throttle):
+    for n in range(3):
+        assert await throttle.check("User@Example.com ", f"10.0.0.{n}") is None
+    assert await throttle.check("user@example.com", "10.0.0.9") is not None
+    assert throttle.rejected_email == 1
+
+
+async def test_count_ip_counts_every_attempt(throttle):
+    for n in range(3):
+        assert await throttle.check(f"user{n}@example.com", "10.0.0.1", count_ip=True) is None
+    assert await throttle.check("user9@example.com", "10.0.0.1", count_ip=True) is not None
+
+
+async def test_backend_errors_fail_open():
+    class Broken:
+        async def hit(self, *args):
+            raise ConnectionError("down")
+
+        peek = hit
+
+    throttle = LoginThrottle(Broken(), email_limit=1, ip_limit=1, window_seconds=60)
+    assert await throttle.check("user@example.com", "10.0.0.1") is None
+    await throttle.record_failure("10.0.0.1")
+    assert throttle.backend_errors == 2
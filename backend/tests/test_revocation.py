@@ -0,0 +1,54 @@
+"""User-wide token revocation compares at the one-second precision of JWT iat."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.revocation import RevocationList, user_key
+from app.core.tokens import TokenClaims
+from app.db.models import RevokedToken
+
+REVOKED_AT = datetime(2026, 10, 19, 12, 0, 0, 400000)
+
+
+def claims_issued_at(user_id: uuid.UUID, issued_at: datetime) -> TokenClaims:
+    return TokenClaims(
+        subject=str(user_id),
+        token_type="access",
+        jti=uuid.uuid4().hex,
+        issued_at=issued_at.replace(tzinfo=timezone.utc),
+        expires_at=(issued_at + timedelta(minutes=15)).replace(tzinfo=timezone.utc),
+    )
+
+
+def revocation_list_for(user_id: uuid.UUID, not_before: datetime) -> RevocationList:
+    revocations = RevocationList()
+    revocations.apply(RevokedToken(
+        key=user_key(user_id),
+        user_id=user_id,
+        not_before=not_before,
+        expires_at=not_before + timedelta(days=7),
+        revoked_at=not_before,
+    ))
+    return revocations
+
+
+def test_tokens_issued_up_to_the_revocation_second_are_revoked():
+    user_id = uuid.uuid4()
+    revocations = revocation_list_for(user_id, REVOKED_AT.replace(microsecond=0))
+
+    # iat is truncated to the second, whether issued just before or just after
+    assert revocations.is_revoked(claims_issued_at(user_id, REVOKED_AT.replace(microsecond=0)))
+    assert revocations.is_revoked(claims_issued_at(user_id, REVOKED_AT - timedelta(minutes=5)))
+    assert not revocations.is_revoked(claims_issued_at(user_id, REVOKED_AT.replace(microsecond=0) + timedelta(seconds=1)))
+
+
+def test_entries_with_sub_second_not_before_compare_in_seconds():
+    user_id = uuid.uuid4()
+    revocations = revocation_list_for(user_id, REVOKED_AT)
+
+    assert revocations.is_revoked(claims_issued_at(user_id, REVOKED_AT.replace(microsecond=0)))
+    assert not revocations.is_revoked(claims_issued_at(user_id, REVOKED_AT.replace(microsecond=0) + timedelta(seconds=1)))
+
+
+def test_other_users_are_not_affected():
+    revocations = revocation_list_for(uuid.uuid4(), REVOKED_AT)
+    assert not revocations.is_revoked(claims_issued_at(uuid.uuid4(), REVOKED_AT - timedelta(minutes=5)))
@@ -0,0 +1,82 @@
+"""Hierarchical timer wheel: exact expiry across cascades and overflow."""
+import math
+import random
+
+from app.core.timer_wheel import HierarchicalTimerWheel
+
+
+def expiry_ticks(wheel: HierarchicalTimerWheel, until: int) -> dict:
+    """Advance one tick at a time; the tick at which each timer expired."""
+    fired = {}
+    for tick in range(1, until + 1):
+        for timer in wheel.advance(tick):
+            fired[timer.key] = tick
+    return fired
+
+
+def test_timer_never_fires_before_its_deadline():
+    wheel = HierarchicalTimerWheel(0)
+    wheel.schedule("a", 10.5)
+
+    assert wheel.advance(10) == []
+    assert [timer.key for timer in wheel.advance(11)] == ["a"]
+    assert len(wheel) == 0
+
+
+def test_timer_is_cascaded_down_the_levels_and_fires_on_time():
+    # 4 slots per level: level 0 spans 4 ticks, level 1 16, level 2 64
+    wheel = HierarchicalTimerWheel(0, wheel_size=4, levels=3)
+    wheel.schedule("far", 37)
+    assert wheel._locations["far"][0] == 2
+
+    assert wheel.advance(32) == []
+    assert wheel._locations["far"][0] == 1  # Cascaded when its level 2 slot came up
+    assert wheel.advance(36) == []
+    assert wheel._locations["far"][0] == 0
+    assert [timer.key for timer in wheel.advance(37)] == ["far"]
+
+
+def test_timer_beyond_the_top_level_waits_in_overflow():
+    wheel = HierarchicalTimerWheel(0, wheel_size=4, levels=2)  # Spans 16 ticks
+    wheel.schedule("overflow", 50)
+    wheel.schedule("near", 3)
+
+    assert expiry_ticks(wheel, 60) == {"near": 3, "overflow": 50}
+
+
+def test_every_timer_fires_at_the_tick_of_its_deadline():
+    rng = random.Random(7)
+    wheel = HierarchicalTimerWheel(0, wheel_size=4, levels=3)
+    deadlines = {key: rng.uniform(0.1, 150) for key in range(300)}
+    for key, deadline in deadlines.items():
+        wheel.schedule(key, deadline)
+
+    assert expiry_ticks(wheel, 160) == {key: math.ceil(deadline) for key, deadline in deadlines.items()}
+
+
+def test_one_advance_returns_timers_in_deadline_order():
+    wheel = HierarchicalTimerWheel(0, wheel_size=4, levels=3)
+    for key, deadline in (("c", 40.0), ("a", 2.5), ("b", 17.0)):
+        wheel.schedule(key, deadline)
+
+    assert [timer.key for timer in wheel.advance(100)] == ["a", "b", "c"]
+
+
+def test_past_deadlines_are_due_on_the_next_advance():
+    wheel = HierarchicalTimerWheel(100)
+    wheel.schedule("late", 90)
+
+    assert [timer.key for timer in wheel.advance(100)] == ["late"]
+
+
+def test_reschedule_and_cancel():
+    wheel = HierarchicalTimerWheel(0, tick_seconds=0.5)
+    wheel.schedule("a", 5, payload="first")
+    wheel.schedule("a", 2, payload="second")
+    wheel.schedule("b", 3)
+
+    assert len(wheel) == 2
+    assert wheel.get("a").payload == "second"
+    assert wheel.cancel("b")
+    assert not wheel.cancel("b")
+    assert [timer.key for timer in wheel.advance(10)] == ["a"]
@@ -0,0 +1,43 @@
+"""Access tokens must be typed and vouch for the user's active flag."""
+import uuid
+from datetime import timedelta
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.tokens import create_access_token, create_refresh_token, decode_token, _encode
+
+
+def test_access_token_round_trip():
+    user_id = uuid.uuid4()
+    team_id = uuid.uuid4()
+    claims = decode_token(create_access_token(user_id, role="technician", team_ids=[team_id]))
+
+    assert claims is not None
+    assert claims.user_id == user_id
+    assert claims.is_active
+    assert claims.team_ids == (team_id,)
+
+
+def test_untyped_token_is_not_an_access_token():
+    token = _encode({"sub": str(uuid.uuid4()), "active": True}, timedelta(minutes=5))
+
+    assert decode_token(token) is None
+
+
+def test_refresh_token_is_not_an_access_token():
+    assert decode_token(create_refresh_token(uuid.uuid4())) is None
+
+
+def test_missing_active_claim_means_inactive():
+    token = _encode({"sub": str(uuid.uuid4()), "type": "access"}, timedelta(minutes=5))
+
+    claims = decode_token(token)
+    assert claims is not None
+    assert not claims.is_active
+
+
+def test_token_signed_with_another_key_is_rejected():
+    token = jwt.encode({"sub": str(uuid.uuid4()), "type": "access"}, "other", algorithm=settings.ALGORITHM)
+
+    assert decode_token(token) is None
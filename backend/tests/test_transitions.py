@@ -0,0 +1,53 @@
+"""Stage transitions: the compare-and-set statement built from the workflow table."""
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.transitions import TransitionConflict, build_transition
+from app.core.workflow import get_allowed_sources
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def compile_transition(new_status: str):
+    statement = build_transition(uuid.uuid4(), new_status, uuid.uuid4(), "moved", NOW)
+    return statement.compile(dialect=postgresql.dialect())
+
+
+@pytest.mark.parametrize("new_status, sources", [
+    ("new", ["in_progress"]),
+    ("in_progress", ["new"]),
+    ("repaired", ["in_progress"]),
+    ("scrap", ["repaired"]),
+])
+def test_allowed_sources_invert_the_workflow(new_status, sources):
+    assert get_allowed_sources(new_status) == sources
+
+
+def test_transition_is_one_locking_statement_with_its_history_insert():
+    compiled = compile_transition("repaired")
+    sql = str(compiled)
+
+    assert sql.startswith('WITH "old" AS')
+    assert "FOR UPDATE" in sql
+    assert "UPDATE maintenance_requests SET" in sql
+    assert "INSERT INTO request_history" in sql
+    assert "completed_at=coalesce(maintenance_requests.completed_at" in sql
+    assert "started_at" not in sql.split("RETURNING")[0]
+    assert compiled.params["status_1"] == ["in_progress"]  # The statuses allowed to move from
+
+
+def test_starting_work_sets_started_at():
+    sql = str(compile_transition("in_progress"))
+
+    assert "started_at=coalesce(maintenance_requests.started_at" in sql
+    assert "completed_at=coalesce" not in sql
+
+
+def test_conflict_names_the_allowed_sources():
+    message = str(TransitionConflict("new", "repaired"))
+
+    assert message == "Cannot transition from 'new' to 'repaired'. Allowed from: ['in_progress']"
+    assert str(TransitionConflict("new", "unknown")).endswith("Allowed from: none")
@@ -7,7 +7,7 @@ import { Settings } from 'lucide-react'
 import Link from 'next/link'
 import { useState } from 'react'
 import { useRouter } from 'next/navigation'
-import { login } from '@/lib/api'
+import { login, storeSession } from '@/lib/api'
 
 export default function SignIn() {
     const router = useRouter()
@@ -23,14 +23,8 @@ export default function SignIn() {
 
         try {
             const response = await login(email, password)
-            // Store user info and token in localStorage
-            localStorage.setItem('user', JSON.stringify({
-                id: response.id,
-                name: response.name,
-                email: response.email,
-                role: response.role,
-            }))
-            localStorage.setItem('access_token', response.access_token)
+            // Store user info and tokens in localStorage
+            storeSession(response)
             // Redirect to dashboard
             router.push('/dashboard')
         } catch (err) {
@@ -7,7 +7,7 @@ import { Settings } from 'lucide-react'
 import Link from 'next/link'
 import { useState } from 'react'
 import { useRouter } from 'next/navigation'
-import { register } from '@/lib/api'
+import { register, storeSession } from '@/lib/api'
 
 export default function SignUp() {
     const router = useRouter()
@@ -38,14 +38,8 @@ export default function SignUp() {
 
         try {
             const response = await register(name, email, password)
-            // Store user info and token in localStorage
-            localStorage.setItem('user', JSON.stringify({
-                id: response.id,
-                name: response.name,
-                email: response.email,
-                role: response.role,
-            }))
-            localStorage.setItem('access_token', response.access_token)
+            // Store user info and tokens in localStorage
+            storeSession(response)
             // Redirect to dashboard
             router.push('/dashboard')
         } catch (err) {
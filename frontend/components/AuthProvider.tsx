@@ -2,6 +2,7 @@
 
 import { createContext, useContext, useEffect, useState, ReactNode } from "react"
 import { useRouter, usePathname } from "next/navigation"
+import { clearSession } from "@/lib/api"
 
 interface User {
     id: string
@@ -56,7 +57,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     }, [user, isLoading, pathname, router])
 
     const logout = () => {
-        localStorage.removeItem("user")
+        clearSession()
         setUser(null)
         router.push("/sign-in")
     }
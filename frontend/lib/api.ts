@@ -1,14 +1,19 @@
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
 // Types
-export interface AuthResponse {
+export interface AuthUser {
   id: string;
   name: string;
   email: string;
   role: string;
+}
+
+export interface AuthResponse {
+  user: AuthUser;
   access_token: string;
+  refresh_token: string;
   token_type: string;
-  message: string;
+  expires_in: number;
 }
 
 export interface ApiError {
@@ -69,12 +74,20 @@ export interface User {
   created_at: string;
 }
 
+// Sent by the API after a write; echoed so reads see that write
+const READ_PRIMARY_HEADER = 'X-Read-Primary-Until';
+let readPrimaryUntil: string | null = null;
+
 // Helper function to get auth headers
 function getAuthHeaders(): HeadersInit {
   const headers: HeadersInit = {
     'Content-Type': 'application/json',
   };
 
+  if (readPrimaryUntil && Number(readPrimaryUntil) * 1000 > Date.now()) {
+    headers[READ_PRIMARY_HEADER] = readPrimaryUntil;
+  }
+
   // Add Authorization header if token exists
   if (typeof window !== 'undefined') {
     const token = localStorage.getItem('access_token');
@@ -86,9 +99,58 @@ function getAuthHeaders(): HeadersInit {
   return headers;
 }
 
+// Store the user and both tokens after login, registration or refresh
+export function storeSession(response: AuthResponse): void {
+  localStorage.setItem('user', JSON.stringify({
+    id: response.user.id,
+    name: response.user.name,
+    email: response.user.email,
+    role: response.user.role,
+  }));
+  localStorage.setItem('access_token', response.access_token);
+  localStorage.setItem('refresh_token', response.refresh_token);
+}
+
+export function clearSession(): void {
+  localStorage.removeItem('user');
+  localStorage.removeItem('access_token');
+  localStorage.removeItem('refresh_token');
+}
+
+// One refresh at a time; concurrent 401s wait for the same one
+let refreshing: Promise<boolean> | null = null;
+
+// Access tokens are short-lived: exchange the refresh token for a new one
+async function refreshSession(): Promise<boolean> {
+  const refreshToken = localStorage.getItem('refresh_token');
+  if (!refreshToken) {
+    return false;
+  }
+  if (!refreshing) {
+    refreshing = fetch(`${API_BASE_URL}/auth/refresh`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    })
+      .then(async (response) => {
+        if (!response.ok) {
+          clearSession();
+          return false;
+        }
+        storeSession(await response.json());
+        return true;
+      })
+      .catch(() => false)
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+}
+
 // Helper function for API calls with toast notifications
 async function apiFetch<T>(url: string, options?: RequestInit, showToast: boolean = true): Promise<T> {
-  const response = await fetch(`${API_BASE_URL}${url}`, {
+  const send = () => fetch(`${API_BASE_URL}${url}`, {
     ...options,
     headers: {
       ...getAuthHeaders(),
@@ -96,6 +158,17 @@ async function apiFetch<T>(url: string, options?: RequestInit, showToast: boolea
     },
   });
 
+  let response = await send();
+  readPrimaryUntil = response.headers.get(READ_PRIMARY_HEADER) ?? readPrimaryUntil;
+
+  // Expired (or outdated) access token: refresh once and retry
+  if (response.status === 401 && typeof window !== 'undefined' && !url.startsWith('/auth/')) {
+    if (await refreshSession()) {
+      response = await send();
+      readPrimaryUntil = response.headers.get(READ_PRIMARY_HEADER) ?? readPrimaryUntil;
+    }
+  }
+
   if (!response.ok) {
     let errorMessage = 'API request failed';
     try {